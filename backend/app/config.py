@@ -12,3 +12,54 @@ class Config:
     DB_HOST = os.getenv("DB_HOST", "localhost")
     DB_PORT = os.getenv("DB_PORT", "5432")
     DB_NAME = os.getenv("DB_NAME", "chatbot_db")
+    # URL complète prioritaire sur les DB_* (ex : sqlite:///replay.db pour les bancs d'essai)
+    DATABASE_URL = os.getenv(
+        "DATABASE_URL",
+        f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    )
+    # Pool de connexions : connexions permanentes, débordement autorisé, attente max (s),
+    # recyclage (s, -1 = jamais) et test de la connexion avant usage
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # Migrations : `alembic upgrade head` au déploiement, avant de lancer les workers (l'API vérifie
+    # seulement la révision). true : appliquées au démarrage, un worker à la fois (verrou, voir app/db_migrations.py)
+    DB_MIGRATE_ON_STARTUP = os.getenv("DB_MIGRATE_ON_STARTUP", "false").lower() == "true"
+
+    # Travail bloquant hors de la boucle d'événements : threads pour les fichiers
+    # (preuves, CSV, rapports) et pour le calcul (correction, classifieur, GPT-2)
+    IO_EXECUTOR_WORKERS = int(os.getenv("IO_EXECUTOR_WORKERS", "8"))
+    CPU_EXECUTOR_WORKERS = int(os.getenv("CPU_EXECUTOR_WORKERS", "2"))
+
+    # Inférence GPT-2 : "lazy" (chargé au premier appel dans le processus API)
+    # ou "process" (chargé dans un processus worker dédié)
+    GPT2_WORKER_MODE = os.getenv("GPT2_WORKER_MODE", "lazy")
+    GPT2_PRELOAD = os.getenv("GPT2_PRELOAD", "false").lower() == "true"
+    GPT2_TIMEOUT = float(os.getenv("GPT2_TIMEOUT", "60"))
+    # Backend de calcul GPT-2 : "float32", "int8", "torchscript" ou "stub" (sans modèle, tests de charge)
+    GPT2_BACKEND = os.getenv("GPT2_BACKEND", "float32")
+    GPT2_STUB_LATENCY_MS = float(os.getenv("GPT2_STUB_LATENCY_MS", "50"))
+    GPT2_TORCHSCRIPT_PATH = os.getenv(
+        "GPT2_TORCHSCRIPT_PATH",
+        os.path.join(os.path.dirname(__file__), "models_cache", "gpt2_torchscript.pt")
+    )
+    # Micro-lots GPT-2 : fenêtre de regroupement (ms) et taille maximale d'un lot
+    GPT2_BATCH_WAIT_MS = float(os.getenv("GPT2_BATCH_WAIT_MS", "20"))
+    GPT2_BATCH_MAX_SIZE = int(os.getenv("GPT2_BATCH_MAX_SIZE", "8"))
+
+    # Correction orthographique : nombre de mots gardés dans le cache LRU des corrections
+    SPELL_CACHE_SIZE = int(os.getenv("SPELL_CACHE_SIZE", "5000"))
+    # Index de correction préconstruit partagé par mmap (python -m app.nlp.build_spell_index)
+    SPELL_INDEX_PATH = os.getenv(
+        "SPELL_INDEX_PATH",
+        os.path.join(os.path.dirname(__file__), "models_cache", "spell_index.bin")
+    )
+
+    # Classifieur TF-IDF de secours (quand aucun mot-clé d'intention ne correspond)
+    INTENT_CLASSIFIER_PATH = os.getenv(
+        "INTENT_CLASSIFIER_PATH",
+        os.path.join(os.path.dirname(__file__), "models_cache", "intent_classifier.joblib")
+    )
+    INTENT_CLASSIFIER_THRESHOLD = float(os.getenv("INTENT_CLASSIFIER_THRESHOLD", "0.5"))
@@ -0,0 +1,89 @@
+# backend/app/crud/async_queries.py
+
+"""
+Versions asynchrones (AsyncSession, voir app/database_async.py) des requêtes
+exécutées à chaque message ou à chaque rafraîchissement de l'interface :
+employé par matricule, dernier message du chat, notifications et création
+d'une demande de congé.
+
+Les objets renvoyés ne doivent pas déclencher de chargement paresseux
+(relations) : seules leurs colonnes sont lues par les appelants.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.chat_logs import ChatLog
+from app.models.demande_conge import DemandeConge
+from app.models.notification import Notification
+from app.models.user import User
+
+
+async def get_user_by_matricule(db: AsyncSession, matricule: str) -> Optional[User]:
+    result = await db.execute(select(User).where(User.matricule == matricule).limit(1))
+    return result.scalars().first()
+
+
+async def get_last_chat_log(db: AsyncSession, user_id: int) -> Optional[ChatLog]:
+    """Dernier message enregistré pour l'employé (état de la conversation)"""
+    result = await db.execute(
+        select(ChatLog).where(ChatLog.user_id == user_id).order_by(ChatLog.id.desc()).limit(1)
+    )
+    return result.scalars().first()
+
+
+async def get_user_notifications(db: AsyncSession, user_id: int, unread_only: bool = False) -> List[Notification]:
+    query = select(Notification).where(Notification.user_id == user_id)
+    if unread_only:
+        query = query.where(Notification.is_read == False)
+    result = await db.execute(query.order_by(Notification.created_at.desc()))
+    return list(result.scalars().all())
+
+
+async def get_unread_count(db: AsyncSession, user_id: int) -> int:
+    result = await db.execute(
+        select(func.count(Notification.id)).where(Notification.user_id == user_id, Notification.is_read == False)
+    )
+    return result.scalar_one()
+
+
+async def mark_notification_as_read(db: AsyncSession, notification_id: int, user_id: int) -> bool:
+    result = await db.execute(
+        update(Notification)
+        .where(Notification.id == notification_id, Notification.user_id == user_id)
+        .values(is_read=True)
+    )
+    await db.commit()
+    return result.rowcount > 0
+
+
+async def mark_all_notifications_as_read(db: AsyncSession, user_id: int) -> int:
+    result = await db.execute(
+        update(Notification)
+        .where(Notification.user_id == user_id, Notification.is_read == False)
+        .values(is_read=True)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def create_demande_conge(
+    db: AsyncSession, user_id: int, type_conge: str, date_debut: datetime, date_fin: datetime,
+    raison: Optional[str] = None, preuve: Optional[str] = None
+) -> DemandeConge:
+    demande = DemandeConge(
+        user_id=user_id,
+        type_conge=type_conge,
+        date_debut=date_debut,
+        date_fin=date_fin,
+        raison=raison,
+        preuve=preuve,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    )
+    db.add(demande)
+    await db.commit()
+    return demande
@@ -1,7 +1,14 @@
 from app.models.demande_conge import DemandeConge
-from sqlalchemy.orm import Session
-from datetime import datetime
-from typing import Optional
+from app.models.user import User
+from app.services.pagination import decode_cursor, encode_cursor
+from sqlalchemy import case, func, tuple_
+from sqlalchemy.orm import Session, contains_eager, joinedload
+from datetime import date, datetime, time, timedelta
+from typing import Iterator, NamedTuple, Optional
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+REPORT_BATCH_SIZE = 1000
 
 def create_demande_conge(db: Session, user_id: int, type_conge: str, date_debut: datetime, date_fin: datetime, raison: Optional[str] = None, preuve: Optional[str] = None):
     demande = DemandeConge(
@@ -18,3 +25,125 @@ def create_demande_conge(db: Session, user_id: int, type_conge: str, date_debut:
     db.commit()
     db.refresh(demande)
     return demande
+
+# Toutes les demandes, les plus récentes d'abord, avec leur demandeur chargé par la même requête (JOIN)
+def get_demandes_with_users(db: Session):
+    return db.query(DemandeConge).options(joinedload(DemandeConge.user)).order_by(DemandeConge.created_at.desc()).all()
+
+
+class DemandesPage(NamedTuple):
+    demandes: list
+    next_cursor: Optional[str]  # None sur la dernière page
+    total: Optional[int]        # nombre de demandes filtrées, si demandé
+
+
+# Page de demandes, les plus récentes d'abord, triée par (created_at, id) et reprise après cursor.
+# Filtres : statut, type, département du demandeur, période du congé qui chevauche [date_from, date_to].
+# Index demandes_conge (created_at, id) : le coût d'une page ne dépend pas de sa position.
+# created_at est NOT NULL (migration 0006) : la comparaison de tuple du curseur n'est jamais NULL.
+def list_demandes_page(
+    db: Session, limit: int = PAGE_SIZE, cursor: Optional[str] = None, status: Optional[str] = None,
+    type_conge: Optional[str] = None, department: Optional[str] = None, date_from: Optional[date] = None,
+    date_to: Optional[date] = None, include_total: bool = False
+) -> DemandesPage:
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = db.query(DemandeConge).outerjoin(DemandeConge.user)
+    if status:
+        query = query.filter(DemandeConge.status == status)
+    if type_conge:
+        query = query.filter(func.lower(DemandeConge.type_conge) == type_conge.lower())
+    if department:
+        query = query.filter(func.upper(User.department) == department.upper())
+    if date_from:
+        query = query.filter(DemandeConge.date_fin >= datetime.combine(date_from, time.min))
+    if date_to:
+        query = query.filter(DemandeConge.date_debut < datetime.combine(date_to + timedelta(days=1), time.min))
+
+    total = query.order_by(None).with_entities(func.count(DemandeConge.id)).scalar() if include_total else None
+
+    if cursor:
+        created_at, demande_id = decode_cursor(cursor, 2)
+        query = query.filter(tuple_(DemandeConge.created_at, DemandeConge.id) < tuple_(created_at, demande_id))
+    demandes = (
+        query.options(contains_eager(DemandeConge.user))
+        .order_by(DemandeConge.created_at.desc(), DemandeConge.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    next_cursor = None
+    if len(demandes) > limit:
+        demandes = demandes[:limit]
+        next_cursor = encode_cursor(demandes[-1].created_at, demandes[-1].id)
+    return DemandesPage(demandes, next_cursor, total)
+
+
+# Mois "AAAA-MM" et durée en jours calendaires (bornes incluses), calculés par la base
+def _month_bucket(dialect: str, column):
+    if dialect == "postgresql":
+        return func.to_char(column, "YYYY-MM")
+    return func.strftime("%Y-%m", column)
+
+
+def _duree_jours(dialect: str):
+    if dialect == "postgresql":
+        return func.date(DemandeConge.date_fin) - func.date(DemandeConge.date_debut) + 1
+    return func.julianday(func.date(DemandeConge.date_fin)) - func.julianday(func.date(DemandeConge.date_debut)) + 1
+
+
+# Statistiques du rapport de congés : uniquement des agrégats GROUP BY, aucune demande chargée en mémoire.
+# Nombre de requêtes constant (5) quel que soit le nombre de demandes.
+def get_demandes_report_stats(db: Session) -> dict:
+    dialect = db.get_bind().dialect.name
+    total, somme_durees, avec_justificatif = db.query(
+        func.count(DemandeConge.id),
+        func.coalesce(func.sum(_duree_jours(dialect)), 0),
+        func.count(case((DemandeConge.preuve != "", 1))),
+    ).one()
+
+    def grouped(key, *joins):
+        query = db.query(key, func.count(DemandeConge.id)).select_from(DemandeConge)
+        for target in joins:
+            query = query.outerjoin(target)
+        return dict(query.group_by(key).all())
+
+    type_conge = func.coalesce(func.nullif(DemandeConge.type_conge, ""), "Non spécifié")
+    mois = _month_bucket(dialect, DemandeConge.created_at)
+    return {
+        "total": total,
+        "somme_durees": float(somme_durees),
+        "avec_justificatif": avec_justificatif,
+        "par_type": grouped(type_conge),
+        "par_departement": grouped(func.coalesce(User.department, "Non défini"), DemandeConge.user),
+        "par_statut": grouped(DemandeConge.status),
+        "par_mois": {m: n for m, n in grouped(mois).items() if m is not None},
+    }
+
+
+# Détail des demandes pour le rapport, lu par paquets (curseur serveur sur Postgres) : mémoire bornée
+def iter_demandes_detaillees(db: Session, batch_size: int = REPORT_BATCH_SIZE) -> Iterator[dict]:
+    rows = (
+        db.query(
+            DemandeConge.id, DemandeConge.type_conge, DemandeConge.date_debut, DemandeConge.date_fin,
+            DemandeConge.raison, DemandeConge.status, DemandeConge.created_at, DemandeConge.preuve,
+            User.id.label("user_id"), User.first_name, User.last_name, User.matricule, User.department,
+        )
+        .outerjoin(DemandeConge.user)
+        .order_by(DemandeConge.created_at.desc(), DemandeConge.id.desc())
+        .yield_per(batch_size)
+    )
+    for row in rows:
+        connu = row.user_id is not None
+        yield {
+            "id": row.id,
+            "employe": f"{row.first_name} {row.last_name}" if connu else "Inconnu",
+            "matricule": row.matricule if connu else "N/A",
+            "department": (row.department or "Non défini") if connu else "Non défini",
+            "type_conge": row.type_conge or "Non spécifié",
+            "date_debut": row.date_debut.strftime('%d/%m/%Y') if row.date_debut else "N/A",
+            "date_fin": row.date_fin.strftime('%d/%m/%Y') if row.date_fin else "N/A",
+            "duree_jours": (row.date_fin.date() - row.date_debut.date()).days + 1 if row.date_debut and row.date_fin else 0,
+            "raison": row.raison or "Non spécifiée",
+            "statut": row.status,
+            "date_demande": row.created_at.strftime('%d/%m/%Y %H:%M') if row.created_at else "N/A",
+            "preuve_fournie": "Oui" if row.preuve else "Non",
+        }
@@ -0,0 +1,61 @@
+# backend/app/database_async.py
+
+"""
+Accès base de données asynchrone pour les endpoints async def.
+
+Même base que app.database (Config.DATABASE_URL), ouverte avec un pilote
+asynchrone : asyncpg pour Postgres, aiosqlite pour SQLite (tests et bancs
+d'essai). Une requête en attente de la base rend la main à la boucle
+d'événements au lieu de la bloquer : les autres utilisateurs continuent
+d'être servis pendant ce temps.
+
+Les requêtes chaudes ont leur version asynchrone dans app/crud/async_queries.py.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import Config
+from app.services.sql_metrics import install_query_counter
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """postgresql://... -> postgresql+asyncpg://..., sqlite:///... -> sqlite+aiosqlite:///..."""
+    scheme, separator, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if not separator or dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"Pas de pilote asynchrone pour {scheme} (attendu : {', '.join(ASYNC_DRIVERS)})")
+    return f"{ASYNC_DRIVERS[dialect]}://{rest}"
+
+
+def async_engine_options(url: str) -> dict:
+    """Mêmes réglages de pool que le moteur synchrone (DB_POOL_*)"""
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": Config.DB_POOL_SIZE,
+        "max_overflow": Config.DB_MAX_OVERFLOW,
+        "pool_timeout": Config.DB_POOL_TIMEOUT,
+        "pool_recycle": Config.DB_POOL_RECYCLE,
+        "pool_pre_ping": Config.DB_POOL_PRE_PING,
+    }
+
+
+ASYNC_DATABASE_URL = async_database_url(Config.DATABASE_URL)
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **async_engine_options(ASYNC_DATABASE_URL))
+install_query_counter(async_engine.sync_engine)
+
+# expire_on_commit=False : les objets restent lisibles après commit sans nouvelle requête
+AsyncSessionLocal = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
+
+# Dépendance FastAPI : session asynchrone fermée en fin de requête
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,213 @@
+# backend/app/db_backfill.py
+
+"""
+Conversion des dates stockées en texte vers de vraies colonnes DateTime.
+
+chat_logs.timestamp ('%d/%m/%Y %H:%M'), les dates de tasks et de users
+('%Y-%m-%d %H:%M:%S', ou tout autre format saisi à la main) étaient des
+chaînes : impossible de les comparer ou de les parcourir par index sans tout
+relire en Python. La conversion se fait en trois temps :
+
+1. migration 0003 : colonnes fantômes <colonne>_ts (DateTime, NULL), ajout
+   instantané sans réécriture de la table, et triggers qui remettent la
+   colonne fantôme à NULL dès que la colonne texte change : une ligne modifiée
+   après son backfill redevient « à convertir » au lieu de garder une date
+   périmée ;
+2. backfill() : remplissage par paquets d'ids croissants, un commit par
+   paquet (aucun verrou long). Reprenable : seules les lignes dont la colonne
+   fantôme est encore vide sont relues ;
+3. migration 0004 : écritures bloquées sur les trois tables, refus si des
+   lignes convertibles restent à remplir (pending_rows), puis suppression des
+   triggers et des colonnes texte et renommage des colonnes fantômes.
+
+Les modèles de l'application déclarent des colonnes DateTime : cette version
+de l'API ne fonctionne qu'à partir de la révision 0004 (elle refuse de
+démarrer sur une base en retard). Déploiement, la version précédente de l'API
+(dates en texte) restant en service jusqu'à l'étape 3 :
+
+    alembic upgrade 0003
+    python -m app.db_backfill [--chunk-size 5000]   # hors ligne, relançable
+    alembic upgrade head                             # puis démarrer la nouvelle API
+
+Si 0004 refuse (lignes écrites depuis le backfill), relancer le backfill puis
+la migration.
+"""
+
+import argparse
+import logging
+from datetime import datetime
+from typing import Optional
+
+import sqlalchemy as sa
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 5000
+SHADOW_SUFFIX = "_ts"
+
+# Colonnes converties, par table
+TYPED_TIMESTAMPS = {
+    "chat_logs": ("timestamp",),
+    "tasks": ("requested_at", "completed_at", "created_at", "updated_at"),
+    "users": ("created_at", "updated_at"),
+}
+
+# Formats rencontrés dans les données existantes (en plus de l'ISO 8601)
+TIMESTAMP_FORMATS = ("%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S", "%d/%m/%Y", "%Y-%m-%d %H:%M")
+
+
+def parse_timestamp(value) -> Optional[datetime]:
+    """Date d'une valeur texte (ISO 8601 ou format français), None si illisible"""
+    if value is None or isinstance(value, datetime):
+        return value
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _shadow_table(table_name: str, columns) -> sa.TableClause:
+    return sa.table(
+        table_name,
+        sa.column("id", sa.Integer),
+        *(sa.column(name, sa.String) for name in columns),
+        *(sa.column(name + SHADOW_SUFFIX, sa.DateTime) for name in columns),
+    )
+
+
+def _pending_chunks(conn, table, columns, chunk_size: int):
+    """Lignes dont une colonne texte non vide n'a pas encore de colonne fantôme, par paquets d'ids croissants"""
+    pending = sa.or_(*(
+        sa.and_(table.c[name + SHADOW_SUFFIX].is_(None), table.c[name].isnot(None)) for name in columns
+    ))
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(table.c.id, *(table.c[name] for name in columns),
+                      *(table.c[name + SHADOW_SUFFIX] for name in columns))
+            .where(table.c.id > last_id, pending)
+            .order_by(table.c.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+
+def backfill_table(conn, table_name: str, columns, chunk_size: int = CHUNK_SIZE, commit_chunks: bool = False) -> dict:
+    """Remplir les colonnes fantômes d'une table ; commit_chunks : valider chaque paquet"""
+    table = _shadow_table(table_name, columns)
+    update = table.update().where(table.c.id == sa.bindparam("row_id")).values(
+        {name + SHADOW_SUFFIX: sa.bindparam("new_" + name) for name in columns}
+    )
+    stats = {"rows": 0, "unparsed": 0}
+    for rows in _pending_chunks(conn, table, columns, chunk_size):
+        params = []
+        for row in rows:
+            values = {"row_id": row.id}
+            for name in columns:
+                raw = row._mapping[name]
+                values["new_" + name] = parsed = parse_timestamp(raw)
+                if parsed is None and raw is not None and str(raw).strip():
+                    stats["unparsed"] += 1
+            params.append(values)
+        conn.execute(update, params)
+        if commit_chunks:
+            conn.commit()
+        stats["rows"] += len(rows)
+        logger.info(f"Backfill {table_name} : {stats['rows']} lignes (id <= {rows[-1].id})")
+    return stats
+
+
+def backfill(conn, chunk_size: int = CHUNK_SIZE, commit_chunks: bool = False) -> dict:
+    """Remplir toutes les colonnes fantômes ; retourne lignes traitées et valeurs illisibles par table"""
+    summary = {}
+    for table_name, columns in TYPED_TIMESTAMPS.items():
+        summary[table_name] = stats = backfill_table(conn, table_name, columns, chunk_size, commit_chunks)
+        if stats["unparsed"]:
+            logger.warning(f"Backfill {table_name} : {stats['unparsed']} valeur(s) de date illisible(s), laissée(s) à NULL")
+    return summary
+
+
+def pending_rows(conn, chunk_size: int = CHUNK_SIZE) -> dict:
+    """Lignes encore à convertir par table : colonne fantôme vide alors que le texte est une date lisible
+
+    Les valeurs illisibles (laissées à NULL par le backfill) ne comptent pas.
+    """
+    counts = {}
+    for table_name, columns in TYPED_TIMESTAMPS.items():
+        table = _shadow_table(table_name, columns)
+        counts[table_name] = sum(
+            1
+            for rows in _pending_chunks(conn, table, columns, chunk_size)
+            for row in rows
+            if any(row._mapping[name + SHADOW_SUFFIX] is None and parse_timestamp(row._mapping[name]) is not None
+                   for name in columns)
+        )
+    return counts
+
+
+def _trigger_name(table_name: str, name: str = None) -> str:
+    return f"{table_name}_{name}{SHADOW_SUFFIX}_sync" if name else f"{table_name}{SHADOW_SUFFIX}_sync"
+
+
+def create_sync_triggers(conn):
+    """Triggers de la révision 0003 : colonne fantôme remise à NULL quand la colonne texte change"""
+    for table_name, columns in TYPED_TIMESTAMPS.items():
+        if conn.dialect.name == "postgresql":
+            resets = "\n".join(
+                f'    IF NEW."{name}" IS DISTINCT FROM OLD."{name}" THEN NEW."{name}{SHADOW_SUFFIX}" := NULL; END IF;'
+                for name in columns
+            )
+            conn.execute(sa.text(
+                f"CREATE FUNCTION {_trigger_name(table_name)}() RETURNS trigger AS $$\nBEGIN\n{resets}\n"
+                f"    RETURN NEW;\nEND\n$$ LANGUAGE plpgsql"
+            ))
+            conn.execute(sa.text(
+                f"CREATE TRIGGER {_trigger_name(table_name)} BEFORE UPDATE ON {table_name} "
+                f"FOR EACH ROW EXECUTE FUNCTION {_trigger_name(table_name)}()"
+            ))
+        else:
+            for name in columns:
+                conn.execute(sa.text(
+                    f'CREATE TRIGGER {_trigger_name(table_name, name)} AFTER UPDATE OF "{name}" ON {table_name} '
+                    f'WHEN NEW."{name}" IS NOT OLD."{name}" '
+                    f'BEGIN UPDATE {table_name} SET "{name}{SHADOW_SUFFIX}" = NULL WHERE id = NEW.id; END'
+                ))
+
+
+def drop_sync_triggers(conn):
+    for table_name, columns in TYPED_TIMESTAMPS.items():
+        if conn.dialect.name == "postgresql":
+            conn.execute(sa.text(f"DROP TRIGGER IF EXISTS {_trigger_name(table_name)} ON {table_name}"))
+            conn.execute(sa.text(f"DROP FUNCTION IF EXISTS {_trigger_name(table_name)}()"))
+        else:
+            for name in columns:
+                conn.execute(sa.text(f"DROP TRIGGER IF EXISTS {_trigger_name(table_name, name)}"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remplir les colonnes de dates typées (révision 0003)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    from app.database import engine
+
+    with engine.connect() as conn:
+        for table_name, stats in backfill(conn, args.chunk_size, commit_chunks=True).items():
+            print(f"{table_name:<12} {stats['rows']:>10} lignes converties, {stats['unparsed']} illisibles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# backend/app/db_migrations.py
+
+"""
+Migrations du schéma (Alembic, scripts dans backend/migrations/versions).
+
+Le schéma n'est plus créé par create_all à l'import de app.database : il est
+amené à la dernière révision par une étape du déploiement, lancée une seule
+fois avant de (re)démarrer les workers de l'API :
+
+    cd backend && alembic upgrade head
+
+Une base créée par l'ancien create_all est reprise telle quelle : la révision
+initiale ne crée que les tables absentes.
+
+Les modèles correspondent à la dernière révision (dates en DateTime depuis
+0004, par exemple) : l'API refuse de servir une base qui n'y est pas
+(ensure_database_at_head). Avec DB_MIGRATE_ON_STARTUP=true (poste de
+développement), chaque worker applique les migrations au démarrage sous un
+verrou (pg_advisory_lock, ou verrou de fichier pour SQLite) : le premier
+migre, les suivants attendent puis trouvent la base déjà à jour.
+"""
+
+import contextlib
+import os
+
+from app.config import Config
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+ALEMBIC_INI = os.path.join(BACKEND_DIR, "alembic.ini")
+
+
+def alembic_config(url: str = None):
+    """Configuration Alembic pointant sur url (défaut : Config.DATABASE_URL), quel que soit le répertoire courant"""
+    from alembic.config import Config as AlembicConfig
+
+    config = AlembicConfig(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    # configparser : les % du mot de passe doivent être doublés
+    config.set_main_option("sqlalchemy.url", (url or Config.DATABASE_URL).replace("%", "%%"))
+    # Ne pas remplacer la configuration des logs de l'application
+    config.attributes["configure_logger"] = False
+    return config
+
+
+# Clé du verrou consultatif PostgreSQL réservé aux migrations
+MIGRATION_LOCK_KEY = 7_240_318_001
+
+
+@contextlib.contextmanager
+def migration_lock(url: str = None):
+    """Verrou entre processus le temps d'une migration : pg_advisory_lock sur PostgreSQL,
+    flock sur un fichier voisin de la base SQLite (aucun pour une base en mémoire)"""
+    from sqlalchemy import create_engine, pool, text
+    from sqlalchemy.engine import make_url
+
+    url = make_url(url or Config.DATABASE_URL)
+    if url.get_backend_name() == "postgresql":
+        engine = create_engine(url, poolclass=pool.NullPool)
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+                conn.commit()
+                try:
+                    yield
+                finally:
+                    conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+                    conn.commit()
+        finally:
+            engine.dispose()
+    elif url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:"):
+        import fcntl
+
+        with open(f"{url.database}.migrate.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    else:
+        yield
+
+
+def upgrade_database(url: str = None, revision: str = "head"):
+    """Appliquer les migrations jusqu'à revision, un seul processus à la fois"""
+    from alembic import command
+
+    with migration_lock(url):
+        command.upgrade(alembic_config(url), revision)
+
+
+def head_revision():
+    """Dernière révision des scripts de migration"""
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def ensure_database_at_head(engine):
+    """Lever une erreur si la base de engine n'est pas à la dernière révision"""
+    current, head = current_revision(engine), head_revision()
+    if current != head:
+        raise RuntimeError(
+            f"Base de données à la révision {current}, l'application attend {head} : "
+            "lancez `alembic upgrade head` depuis backend/ (voir app/db_backfill.py pour 0003 -> 0004)"
+        )
+
+
+def current_revision(engine):
+    """Révision appliquée à la base de engine (None si aucune)"""
+    from alembic.runtime.migration import MigrationContext
+
+    with engine.connect() as conn:
+        return MigrationContext.configure(conn).get_current_revision()
@@ -1,32 +1,39 @@
-import torch
-from transformers import GPT2LMHeadModel, GPT2Tokenizer
 from fastapi import Depends, FastAPI, HTTPException, UploadFile, File, Form
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
 import sys
 import logging
-from spellchecker import SpellChecker  # Pour la correction orthographique
+import threading
 from difflib import get_close_matches  # Pour la similarité des mots
 
 
 
-from app.database import get_db
+from app.database import engine, get_db, SessionLocal
+from app.database_async import async_engine, get_async_db
+from app.db_migrations import ensure_database_at_head, upgrade_database
+from app.crud import async_queries
 from app.models.user import User
 from app.models.instruction import Instruction
 from app.models.chat_logs import ChatLog
 from app.models.task import Task  # Import du modèle Task
 from app.models.notification import Notification  # Import du modèle Notification
-from app.crud.demande_conge import create_demande_conge
+from app.crud.demande_conge import get_demandes_report_stats, iter_demandes_detaillees, list_demandes_page
 from app.routes.demande_conge_admin import router as demande_conge_admin_router
-from app.services.notification_service import (
-    get_user_notifications, 
-    mark_notification_as_read, 
-    mark_all_notifications_as_read,
-    get_unread_count
-)
+from app.routes.intents import router as intents_router
+from app.services.inference_worker import get_inference_worker, shutdown_inference_worker
+from app.services.executors import executor_stats, run_cpu, run_io, shutdown_executors
+from app.services.gpt2_batcher import get_gpt2_scheduler
+from app.services.spell_vocabulary import load_user_names, register_user_listeners
+from app.services.workload import get_users_surcharges, get_workload_analysis, register_workload_listeners
+from app.services.pool_metrics import pool_stats
+from app.services.sql_metrics import SQL_QUERY_STATS, install_query_counter, sql_query_middleware
+from app.config import Config
+from app.nlp import NormalizedMessage, correct_spelling, extract_first_and_last_name
+from app.nlp.spelling import spell_cache_stats
 
 # Configuration du logging pour éviter les problèmes d'encodage
 logging.basicConfig(
@@ -52,84 +59,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# GPT-2 et son tokenizer
-tokenizer = GPT2Tokenizer.from_pretrained("gpt2")
-model = GPT2LMHeadModel.from_pretrained("gpt2")
-tokenizer.pad_token = tokenizer.eos_token
-
-# Initialiser le correcteur ortho
-spell = SpellChecker(language='fr')  # Utiliser le français
-
-# Mapping des erreurs courantes
-COMMON_MISTAKES = {
-    "email": "email",
-    "émail":"email",
-    "emil": "email",
-    "adresse mail": "email",
-    "prénom": "first name",
-    "nom": "last name",
-    "date de mise à jour": "updated at",
-    "ameil": "email",
-    "eml": "email",
-    "meil": "email",
-    "date mise a jour": "updated at",
-    "date mise à jour": "updated at",
-    "rle": "role",
-    "nm": "last name",
-    "prnom": "first name",
-    "prnm": "first name",
-    "mail": "email",
-    "logs": "logs",
-    "info user": "info user",
-"Hello":"Hello",
-"hello":"Hello",
-    "informations de l'user": "informations de l'user",
-  "bjr":"bonjour",
-    "user": "user",
-  "cc":"coucou",
-  "coucou":"coucou",
-    "info": "info",
-"cv":"ça va",   
-    "department": "department",
-    "rtt":"rtt",
-    "maj":"maj",
-    "cong":"cong",
-    "oman":"omar",
-    "bassine":"yassine",
-    "omar":"omar",
-    "rh":"rh",
-    "RH":"RH",
-    
-}
-# Dictionnaire de noms propres ....
-PROPER_NOUNS = {
-    "John", "Doe", "Jane", "Smith", "Emily", "Davis",
-}
+# Nombre de requêtes SQL par requête HTTP (en-tête X-SQL-Queries, totaux par route dans /metrics)
+install_query_counter(engine)
+app.middleware("http")(sql_query_middleware)
 
-import re
-
-def correct_spelling(message: str):
-    corrected_words = []
-    for word in message.split():
-        # Vérifier si le mot est une erreur courante
-        if word.lower() in COMMON_MISTAKES:
-            corrected_words.append(COMMON_MISTAKES[word.lower()])
-            continue
-        # Vérifier si le mot est un nom propre (commence par une majuscule et est suivi de lettres minuscules)
-        if re.match(r'^[A-Z][a-z]*$', word):
-            corrected_words.append(word)
-            continue
-        # Vérifier si le mot est dans la liste des noms propres (insensible à la casse)
-        if word.lower() in {name.lower() for name in PROPER_NOUNS}:
-            corrected_words.append(word)
-            continue
-        # Corriger chaque mot
-        corrected_word = spell.correction(word)
-        if corrected_word is not None:
-            corrected_words.append(corrected_word)
-        else:
-            corrected_words.append(word)  # Garder le mot original si aucune correction n'est trouvée
-    return " ".join(corrected_words)
+# Agrégats de charge de travail tenus à jour à chaque écriture d'un employé (voir app/services/workload.py)
+register_workload_listeners()
+
+# Schéma de la base vérifié (ou, avec DB_MIGRATE_ON_STARTUP, amené à la dernière migration) avant les
+# autres initialisations : les modèles ne correspondent qu'à la dernière révision
+@app.on_event("startup")
+def migrate_database():
+    if Config.DB_MIGRATE_ON_STARTUP:
+        upgrade_database()
+    else:
+        ensure_database_at_head(engine)
+
+# GPT-2 : chargé à la demande par le worker d'inférence (voir app/services/inference_worker.py)
+@app.on_event("startup")
+def preload_gpt2():
+    if Config.GPT2_PRELOAD:
+        # En mode "process" le chargement se fait dans le worker, sans bloquer le démarrage
+        threading.Thread(target=get_inference_worker().start, name="gpt2-preload", daemon=True).start()
+
+@app.on_event("shutdown")
+def stop_gpt2_worker():
+    shutdown_inference_worker()
+
+# Pools de threads io / cpu (voir app/services/executors.py)
+@app.on_event("shutdown")
+def stop_executors():
+    shutdown_executors()
+
+# Vocabulaire du correcteur : noms des employés chargés au démarrage, puis suivis à chaque création/modification
+@app.on_event("startup")
+def load_spell_vocabulary():
+    register_user_listeners()
+    db = SessionLocal()
+    try:
+        added = load_user_names(db)
+        logger.info(f"Vocabulaire de correction : {added} nom(s) d'employés chargés")
+    except Exception as e:
+        logger.warning(f"Impossible de charger les noms des employés pour la correction : {e}")
+    finally:
+        db.close()
 
 # Fonction pour récupérer un utilisateur par son matricule
 def get_user_by_matricule(db: Session, matricule: str):
@@ -139,19 +112,40 @@ def get_user_by_matricule(db: Session, matricule: str):
 def get_user_by_name(db: Session, first_name: str, last_name: str):
     return db.query(User).filter(User.first_name.ilike(f"%{first_name}%"), User.last_name.ilike(f"%{last_name}%")).first()
 
-# Fonction pour récupérer les logs de chat d'un utilisateur
-def get_user_chat_logs(db: Session, user_id: int):
-    logs = db.query(ChatLog).filter(ChatLog.user_id == user_id).all()
+# Fonction pour récupérer les logs de chat d'un utilisateur, éventuellement sur une période
+# (index chat_logs (user_id, timestamp))
+def get_user_chat_logs(db: Session, user_id: int, since: datetime = None, until: datetime = None):
+    query = db.query(ChatLog).filter(ChatLog.user_id == user_id)
+    if since is not None:
+        query = query.filter(ChatLog.timestamp >= since)
+    if until is not None:
+        query = query.filter(ChatLog.timestamp < until)
+    logs = query.order_by(ChatLog.timestamp.asc()).all()
     # Retourner uniquement les messages
     return [log.message for log in logs]
 
 # Fonction helper pour créer un ChatLog avec timestamp automatique
+# Questions du bot qui attendent une réponse libre (confirmation oui/non, détails de tâche, type et dates
+# de congé, justificatif) : tant que l'une d'elles est le dernier message, le classifieur n'est pas consulté
+PENDING_ANSWER_PROMPTS = (
+    "Est-ce que vous voulez que je le fasse pour vous ?",
+    "Fournissez-moi les détails de la tâche pour :",
+    "Quel est le type de congé",
+    "Quelle est la date de début du congé",
+    "Quelle est la date de fin du congé",
+    "Merci. Veuillez uploader un document justificatif pour votre demande de congé.",
+)
+
+def awaiting_answer(step, last_log) -> bool:
+    """Une réponse est attendue : flow congé en cours ou question en attente dans le dernier message"""
+    return step is not None or bool(last_log and any(prompt in last_log.message for prompt in PENDING_ANSWER_PROMPTS))
+
 def create_chat_log(user_id: int, message: str, sender: str = "bot"):
     return ChatLog(
         user_id=user_id, 
         message=message, 
         sender=sender,
-        timestamp=datetime.now().strftime('%d/%m/%Y %H:%M')
+        timestamp=datetime.now()
     )
 
 # Fonction pour récupérer la description d'une instruction par des mots-clés
@@ -165,230 +159,14 @@ def get_instruction_by_keywords(db: Session, keywords: list):
 def has_permission(user: User, required_department: str):
     return user.department == required_department
 
-# Fonction pour extraire le prénom et le nom de l'utilisateur cible
-def extract_first_and_last_name(message: str):
-    # Liste des mots à ignorer
-    ignore_words = {"info", "user", "informations", "de", "l'utilisateur", "l'user", "les", "données", "details"}
-    
-    # Convertir le message en minuscules pour une comparaison insensible à la casse
-    message_lower = message.lower()
-    
-    # Filtrer les mots à ignorer
-    words = [word for word in message.split() if word.lower() not in ignore_words]
-    
-    # Si on a au moins deux mots restants, les considérer comme prénom et nom
-    if len(words) >= 2:
-        return words[-2], words[-1]  # Prénom et nom sont les deux derniers mots
-    else:
-        return None, None
-
-# Fonction pour détecter l'intention
-def detect_intent(message: str):
-    # Normalisation simple : minuscule, suppression accents, espaces multiples
-    import unicodedata, re
-    def normalize(text):
-        text = text.lower()
-        text = ''.join(c for c in unicodedata.normalize('NFD', text) if unicodedata.category(c) != 'Mn')
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
-    message = normalize(message)
-
-    # Intention : Accompagnement RH pour l'évolution professionnelle
-    evolution_rh_keywords = [
-        "comment le service rh peut il accompagner les employes dans leur evolution professionnelle",
-        "comment le service rh accompagne les employes dans leur evolution professionnelle",
-        "accompagnement rh evolution professionnelle",
-        "comment rh aide a evoluer",
-        "comment rh aide a la promotion",
-        "aide rh pour changer de poste",
-        "aide rh pour formation"
-    ]
-    for kw in evolution_rh_keywords:
-        if kw in message:
-            return "evolution_rh"
-    # Intention : Responsable du service RH
-    responsable_rh_keywords = [
-        "qui est le responsable du service rh",
-        "responsable rh",
-        "nom du responsable rh",
-        "chef du service rh"
-    ]
-    for kw in responsable_rh_keywords:
-        if kw in message:
-            return "responsable_rh"
-    # Intention : Horaires du service RH
-    horaires_rh_keywords = [
-        "horaires du service rh",
-        "quels sont les horaires du service rh",
-        "heures d'ouverture rh",
-        "quand puis-je contacter le service rh",
-        "disponibilite rh"
-    ]
-    for kw in horaires_rh_keywords:
-        if kw in message:
-            return "horaires_rh"
-    # Intention : Comment contacter le service RH ?
-    contacter_rh_keywords = [
-        "comment contacter le service rh",
-        "comment joindre le service rh",
-        "contacter rh",
-        "joindre rh"
-    ]
-    for kw in contacter_rh_keywords:
-        if kw in message:
-            return "contacter_rh_basic"
-    # Intention : Rôle du service RH
-    role_rh_keywords = [
-        "a quoi sert le service des ressources humaines",
-        "quel est le role du service rh",
-        "role du service rh",
-        "utilite du service rh",
-        "pourquoi le service rh",
-        "fonction du service rh"
-    ]
-    for kw in role_rh_keywords:
-        if kw in message:
-            return "role_rh"
-    # Intention : Aide RH au quotidien (plus robuste)
-    aide_rh_keywords = [
-        "comment le service rh peut il aider les employes",
-        "comment le service rh peut-il aider les employes",
-        "comment le service rh peut il aider les employés",
-        "comment le service rh peut-il aider les employés",
-        "aide rh quotidien",
-        "aide du service rh",
-        "comment rh aide employes",
-        "comment rh aide employés",
-        "comment les rh aident les employés?"
-    ]
-    for kw in aide_rh_keywords:
-        if kw in message:
-            return "aide_rh_quotidien"
-
-    # Normalisation simple : minuscule, suppression accents, espaces multiples
-    import unicodedata, re
-    def normalize(text):
-        text = text.lower()
-        text = ''.join(c for c in unicodedata.normalize('NFD', text) if unicodedata.category(c) != 'Mn')
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
-    message = normalize(message)
-
-    # Détection des salutations
-    if any(word in message for word in ["bonjour", "salut", "coucou", "Hello", "Hi", "bjr", "cc"]):
-        return "greeting"
-
-    if any(word in message for word in ["merci", "thanks", "thank you", "mrc"]):
-        return "politeness"
-    # Détection des questions sur le rôle du bot
-    if any(word in message for word in ["ton rôle", "ton role", "qui es-tu", "qui est tu", "tu fais quoi", "t qui", "tfq", "ta mission"]):
-        return "role_query"
-
-    # Détection des questions sur l'état du bot
-    if any(word in message for word in ["comment ça va", "ça va", "comment vas-tu", "cava", "cv", "comment vas tu","comment allez vous","comment allez-vous"]):
-        return "status_query"
-
-
-    # Intention : Comment contacter un RH
-    if any(kw in message for kw in [
-        "comment contacter un rh", "comment je peux contacter un rh", "contacter rh", "joindre rh", "prendre contact rh", "contact rh", "parler à un rh", "parler rh", "appeler rh", "email rh", "mail rh", "téléphoner rh", "numéro rh", "numero rh", "adresse rh"
-    ]):
-        return "contact_rh"
-
-    # Intention : Fournir les infos RH à contacter (plus robuste)
-    infos_rh_keywords = [
-        "info rh", "infos rh", "information rh", "informations rh", "coordonnees rh", "contact rh", "contacts rh",
-        "fournissez les info des rh", "fournir infos rh", "qui contacter rh", "responsable rh", "service rh", "personne rh",
-        "email rh", "mail rh", "adresse rh", "numero rh", "numéro rh", "telephone rh", "téléphone rh", "tel rh"
-    ]
-    for kw in infos_rh_keywords:
-        if kw in message:
-            return "infos_rh"
-
-    # Détection des demandes d'historique
-    if "logs" in message or "historique de chat" in message:
-        return "chat_history"
-
-    # Détection de la liste des congés par le RH (plus souple) - DOIT ÊTRE AVANT demande_conge
-    if any(kw in message for kw in [
-        "liste des cong", "liste de congés", "liste congés", "liste congé",
-        "demandes de congé", "demandes congés", "demandes congé",
-        "historique des congés", "historique congés",
-        "suivi des congés", "suivi congés"
-    ]):
-        return "liste_conges_rh"
-    # Détection du suivi personnel des congés (utilisateur normal)
-    if any(kw in message for kw in [
-        "suivi de mes congés", "suivi de mes conges", "mes congés", "mes demandes de congé",
-        "historique de mes congés", "statut de mes congés", "suivi mes congés",
-        "mes demandes", "statut de ma demande", "ma dernière demande"
-    ]):
-        return "suivi_mes_conges"
-    
-    # Détection des demandes de congé (plus général, doit venir après)
-    if any(kw in message for kw in ["congé", "demande de congé", "demande congé", "vacances", "absence"]):
-        return "demande_conge"
+# Fonction pour générer des réponses avec GPT-2 (regroupées en micro-lots)
+async def handle_message_with_gpt2(message: str):
+    return await get_gpt2_scheduler().generate(message)
 
-    # Détection de l'intention d'explication du pourcentage
-    if any(kw in message for kw in ["pourquoi ce pourcentage", "pourquoi ce taux", "détail du calcul", "explication du pourcentage", "pourcentage d'acceptation", "comment ce pourcentage"]):
-        return "explain_percentage"
-    
-    # Ajout intention procédure congé (retourne le nom de l'intention)
-    if any(kw in message for kw in [
-        "procedure pour les cong", "procedure pour poser un cong", "comment poser un cong", 
-        "delai cong", "delai pour poser un cong", "delai de traitement cong", 
-        "documents cong", "justificatif cong", "procedure conge", "procedure congé",
-        "comment faire une demande", "étapes pour congé", "marche à suivre",
-        "que faut-il faire", "comment procéder", "démarches congé"
-    ]):
-        return "procedure_conge"
-
-    # Nouvelles intentions RH pour l'analyse de charge
-    if any(kw in message for kw in [
-        "prévision charge", "prévisions charge", "charge de travail", "prévision travail",
-        "analyse charge", "prévision équipe", "charge équipe", "workload",
-        "missions en cours", "analyse missions", "prévision missions"
-    ]):
-        return "workload_forecast"
-    
-    if any(kw in message for kw in [
-        "surcharge équipe", "alerte surcharge", "équipe surchargée", "trop de travail",
-        "explication surcharge", "pourquoi surcharge", "détail surcharge"
-    ]):
-        return "overload_alert"
-
-    # Nouvelles intentions pour la génération de rapports
-    if any(kw in message for kw in [
-        "rapport analyse congé", "rapport demandes congés", "rapport détaillé congé",
-        "générez un rapport analyse", "générer rapport congé", "rapport congés détaillé",
-        "analyse détaillée congés", "rapport sur les congés"
-    ]):
-        return "generate_leave_report"
-    
-    if any(kw in message for kw in [
-        "rapport charge travail", "rapport prévision charge", "rapport détaillé charge",
-        "générez rapport charge", "générer rapport workload", "rapport charge détaillé",
-        "analyse détaillée charge", "rapport sur la charge"
-    ]):
-        return "generate_workload_report"
-    
-    # Détection des demandes de téléchargement de rapport
-    if "télécharger" in message or "télécharge" in message or "download" in message:
-        return "download_report"
-
-    # Si aucune intention n'est détectée, retourner None
-    return None
-
-# Fonction pour générer des réponses avec GPT-2
-def handle_message_with_gpt2(message: str):
-    inputs = tokenizer.encode(message, return_tensors="pt", truncation=True, padding=True)
-    attention_mask = torch.ones(inputs.shape, device=inputs.device)
-
-    outputs = model.generate(inputs, attention_mask=attention_mask, max_length=150, num_return_sequences=1, no_repeat_ngram_size=2, pad_token_id=tokenizer.eos_token_id)
-
-    response = tokenizer.decode(outputs[0], skip_special_tokens=True)
-
-    return response.strip()
+# Écrire un fichier envoyé par l'utilisateur (exécuté dans le pool io)
+def write_upload(file_path: str, content: bytes):
+    with open(file_path, "wb") as f:
+        f.write(content)
 
 # Fonction pour créer une tâche dans la base de données
 def create_task(db: Session, user_id: int, task_type: str, task_description: str):
@@ -397,9 +175,9 @@ def create_task(db: Session, user_id: int, task_type: str, task_description: str
         task_type=task_type,
         status="en cours",
         task_description=task_description,
-        requested_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        created_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        updated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        requested_at=datetime.now(),
+        created_at=datetime.now(),
+        updated_at=datetime.now()
     )
     db.add(new_task)
     db.commit()
@@ -438,8 +216,7 @@ async def submit_task(
         file_ext = os.path.splitext(proof.filename)[1]
         filename = f"preuve_{user.id}_{int(datetime.now().timestamp())}{file_ext}"
         file_path = os.path.join(uploads_dir, filename)
-        with open(file_path, "wb") as f:
-            f.write(await proof.read())
+        await run_io(write_upload, file_path, await proof.read())
         proof_path = file_path
 
     # Créer la tâche avec les détails fournis
@@ -468,80 +245,59 @@ async def submit_task(
 
     return JSONResponse(content={"response": "Votre tâche a été enregistrée avec succès. Comment puis-je vous aider maintenant ?", "task_id": task.id})
 
+# Réponses fixes des intentions RH de contact et d'information
+RH_INFO_RESPONSES = {
+    "evolution_rh": (
+        "Le service RH aide les employés à évoluer dans leur carrière en proposant des formations, en conseillant sur les possibilités de promotion et en aidant à identifier les compétences à développer. Il soutient aussi les employés qui souhaitent changer de poste ou améliorer leurs qualifications."
+    ),
+    "responsable_rh": (
+        "Le responsable du service RH est Mme Khadija Benani. Vous pouvez la contacter pour toute question spécifique liée aux ressources humaines."
+    ),
+    "horaires_rh": (
+        "Le service RH est disponible du lundi au vendredi, de 9h à 12h et de 14h à 17h. N'hésitez pas à les contacter pendant ces horaires pour toute demande."
+    ),
+    "contacter_rh_basic": (
+        "Pour contacter le service RH, vous pouvez envoyer un email à KhadijaBenani@entreprise.com, appeler le +01 23 45 67 89, ou vous rendre au bureau situé au 2ème étage, porte 204."
+    ),
+    "role_rh": (
+        "Le service des ressources humaines est essentiel au bon fonctionnement d’une entreprise. Il s’occupe de la gestion des employés, du recrutement, de la formation, du suivi des carrières et du bien-être au travail. Les RH veillent à l’application des règles, accompagnent les collaborateurs dans leurs démarches et favorisent un climat de confiance et d’épanouissement professionnel."
+    ),
+    "aide_rh_quotidien": (
+        "Le service des ressources humaines joue un rôle essentiel dans la vie quotidienne des employés. Il accompagne chacun dans ses démarches administratives, répond aux questions sur la paie, les congés ou la formation, et veille au bien-être au travail. Le service RH est aussi là pour écouter, conseiller et soutenir les collaborateurs face aux difficultés ou pour les aider à évoluer dans leur carrière. N'hésitez pas à le solliciter pour toute demande ou besoin d'information."
+    ),
+    "contact_rh": (
+        "📞 Pour contacter le service RH :\n"
+        "   • Email : KhadijaBenani@entreprise.com\n"
+        "   • Téléphone : + 01 23 45 67 89\n"
+        "   • Bureau : 2ème étage, porte 204\n"
+        "N'hésitez pas à les contacter pour toute question liée aux ressources humaines."
+    ),
+    "infos_rh": (
+        "ℹ️ Voici les informations de contact du service RH :\n"
+        "   • Responsable RH : Mme Khadija Benani\n"
+        "   • Email : KhadijaBenani@entreprise.com\n"
+        "   • Téléphone : + 01 23 45 67 89\n"
+        "   • Horaires : 9h-12h / 14h-17h, du lundi au vendredi\n"
+        "   • Bureau : 2ème étage, porte 204\n"
+        "Pour toute demande, privilégiez l'email ou le téléphone."
+    ),
+}
+
 # Temporary memory to store conversation state for each user
 temp_memory = {}
 
 @app.post("/chat/")
-async def chat(request: MessageRequest, db: Session = Depends(get_db)):
-    # Corriger les fautes d'orthographe dans le message (et le rendre accessible avant toute détection d'intention)
-    message = request.message.lower() if request.message else ""
-    corrected_message = correct_spelling(message)
-    logger.info(f"Message original : {request.message}")
-    logger.info(f"Message corrigé : {corrected_message}")
-    message = corrected_message
-
-    # Intentions RH : contact et infos
-    intent = detect_intent(message)
-    if intent == "evolution_rh":
-        response = (
-            "Le service RH aide les employés à évoluer dans leur carrière en proposant des formations, en conseillant sur les possibilités de promotion et en aidant à identifier les compétences à développer. Il soutient aussi les employés qui souhaitent changer de poste ou améliorer leurs qualifications."
-        )
-        return JSONResponse(content={"response": response})
-    if intent == "responsable_rh":
-        response = (
-            "Le responsable du service RH est Mme Khadija Benani. Vous pouvez la contacter pour toute question spécifique liée aux ressources humaines."
-        )
-        return JSONResponse(content={"response": response})
-    if intent == "horaires_rh":
-        response = (
-            "Le service RH est disponible du lundi au vendredi, de 9h à 12h et de 14h à 17h. N'hésitez pas à les contacter pendant ces horaires pour toute demande."
-        )
-        return JSONResponse(content={"response": response})
-    if intent == "contacter_rh_basic":
-        response = (
-            "Pour contacter le service RH, vous pouvez envoyer un email à KhadijaBenani@entreprise.com, appeler le +01 23 45 67 89, ou vous rendre au bureau situé au 2ème étage, porte 204."
-        )
-        return JSONResponse(content={"response": response})
-    # Corriger les fautes d'orthographe dans le message (et le rendre accessible avant toute détection d'intention)
-    message = request.message.lower() if request.message else ""
-    corrected_message = correct_spelling(message)
+async def chat(request: MessageRequest, db: Session = Depends(get_db), adb: AsyncSession = Depends(get_async_db)):
+    # Normaliser le message une seule fois (correction, accents, tokens, intention) pour toutes les branches
+    nm = await run_cpu(NormalizedMessage, request.message, correct_spelling)
     logger.info(f"Message original : {request.message}")
-    logger.info(f"Message corrigé : {corrected_message}")
-    message = corrected_message
-
-    # Intentions RH : contact et infos
-    intent = detect_intent(message)
-    if intent == "role_rh":
-        response = (
-            "Le service des ressources humaines est essentiel au bon fonctionnement d’une entreprise. Il s’occupe de la gestion des employés, du recrutement, de la formation, du suivi des carrières et du bien-être au travail. Les RH veillent à l’application des règles, accompagnent les collaborateurs dans leurs démarches et favorisent un climat de confiance et d’épanouissement professionnel."
-        )
-        return JSONResponse(content={"response": response})
-    if intent == "aide_rh_quotidien":
-        response = (
-            "Le service des ressources humaines joue un rôle essentiel dans la vie quotidienne des employés. Il accompagne chacun dans ses démarches administratives, répond aux questions sur la paie, les congés ou la formation, et veille au bien-être au travail. Le service RH est aussi là pour écouter, conseiller et soutenir les collaborateurs face aux difficultés ou pour les aider à évoluer dans leur carrière. N'hésitez pas à le solliciter pour toute demande ou besoin d'information."
-        )
-        return JSONResponse(content={"response": response})
-    if intent == "contact_rh":
-        response = (
-            "📞 Pour contacter le service RH :\n"
-            "   • Email : KhadijaBenani@entreprise.com\n"
-            "   • Téléphone : + 01 23 45 67 89\n"
-            "   • Bureau : 2ème étage, porte 204\n"
-            "N'hésitez pas à les contacter pour toute question liée aux ressources humaines."
-        )
-        return JSONResponse(content={"response": response})
-    if intent == "infos_rh":
-        response = (
-            "ℹ️ Voici les informations de contact du service RH :\n"
-            "   • Responsable RH : Mme Khadija Benani\n"
-            "   • Email : KhadijaBenani@entreprise.com\n"
-            "   • Téléphone : + 01 23 45 67 89\n"
-            "   • Horaires : 9h-12h / 14h-17h, du lundi au vendredi\n"
-            "   • Bureau : 2ème étage, porte 204\n"
-            "Pour toute demande, privilégiez l'email ou le téléphone."
-        )
-        return JSONResponse(content={"response": response})
-    user = get_user_by_matricule(db, request.matricule)
+    logger.info(f"Message corrigé : {nm.corrected}")
+    message = nm.corrected
+
+    # Intentions RH : contact et infos (mots-clés ; le classifieur n'est consulté qu'après le flow congé)
+    if nm.intent in RH_INFO_RESPONSES:
+        return JSONResponse(content={"response": RH_INFO_RESPONSES[nm.intent]})
+    user = await async_queries.get_user_by_matricule(adb, request.matricule)
     if not user:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé.")
 
@@ -553,25 +309,13 @@ async def chat(request: MessageRequest, db: Session = Depends(get_db)):
             "last_name": user.last_name
         })
 
-    # Corriger les fautes d'orthographe dans le message
-    corrected_message = correct_spelling(request.message.lower())
-    logger.info(f"Message original : {request.message}")
-    logger.info(f"Message corrigé : {corrected_message}")
-
-    message = corrected_message
-
-    # Normalisation pour détection souple des intentions procédure/délai congé
-    import unicodedata
-    def normalize(text):
-        text = ''.join(c for c in unicodedata.normalize('NFD', text) if unicodedata.category(c) != 'Mn')
-        return text.lower()
-    normalized_message = normalize(message)
+    # Détection souple des intentions procédure/délai congé (sur le message normalisé)
     keywords_proc = [
         "procedure conge", "procedure pour poser un conge", "comment poser un conge",
         "delai conge", "delai pour poser un conge", "delai de traitement conge",
         "documents conge", "justificatif conge", "procedure cong", "procedure conges"
     ]
-    if any(kw in normalized_message for kw in keywords_proc):
+    if any(kw in nm.normalized for kw in keywords_proc):
         from app.models.procedure_conge import ProcedureConge
         procedures = db.query(ProcedureConge).all()
         if not procedures:
@@ -629,7 +373,7 @@ async def chat(request: MessageRequest, db: Session = Depends(get_db)):
         response += "💬 𝗕𝗲𝘀𝗼𝗶𝗻 𝗱'𝗮𝘀𝘀𝗶𝘀𝘁𝗮𝗻𝗰𝗲 ? L'équipe RH est à votre disposition !"
         
         return JSONResponse(content={"response": response})    # Récupérer le dernier log de l'utilisateur pour connaître l'état de la conversation
-    last_log = db.query(ChatLog).filter(ChatLog.user_id == user.id).order_by(ChatLog.id.desc()).first()
+    last_log = await async_queries.get_last_chat_log(adb, user.id)
 
     # Ensure temporary memory is initialized for the user
     if user.id not in temp_memory or not isinstance(temp_memory[user.id], dict):
@@ -639,8 +383,16 @@ async def chat(request: MessageRequest, db: Session = Depends(get_db)):
     if "data" not in temp_memory[user.id]:
         temp_memory[user.id]["data"] = {}
     # Log the current state of the temporary memory for debugging
-    logger.debug(f"Temporary memory for user {user.id}: {temp_memory[user.id]}")    # Gestion de l'intention procedure_conge AVANT tout flow mais après init temp_memory
-    if detect_intent(message) == "procedure_conge" and temp_memory[user.id]["step"] is None:
+    logger.debug(f"Temporary memory for user {user.id}: {temp_memory[user.id]}")
+
+    # Intention : mots-clés, complétés par le classifieur seulement quand aucune réponse n'est attendue
+    # (une réponse libre - oui/non, type, dates, raison - n'est jamais prise pour une intention)
+    intent = nm.intent if awaiting_answer(temp_memory[user.id]["step"], last_log) else nm.best_intent
+    if intent in RH_INFO_RESPONSES:
+        return JSONResponse(content={"response": RH_INFO_RESPONSES[intent]})
+
+    # Gestion de l'intention procedure_conge AVANT tout flow mais après init temp_memory
+    if intent == "procedure_conge" and temp_memory[user.id]["step"] is None:
         from app.models.procedure_conge import ProcedureConge
         procedures = db.query(ProcedureConge).all()
         if not procedures:
@@ -710,7 +462,7 @@ async def chat(request: MessageRequest, db: Session = Depends(get_db)):
         return JSONResponse(content={"response": response})
 
     # Démarrage du flow demande congé si intention détectée et pas déjà en cours
-    if detect_intent(message) == "demande_conge" and temp_memory[user.id]["step"] is None:
+    if intent == "demande_conge" and temp_memory[user.id]["step"] is None:
         temp_memory[user.id]["step"] = "collect_type"
         temp_memory[user.id]["data"] = {"user_id": user.id}
         return JSONResponse(content={"response": "Quel est le type de congé souhaité ? (ex : annuel, maladie, exceptionnel)"})
@@ -834,20 +586,16 @@ async def chat(request: MessageRequest, db: Session = Depends(get_db)):
         # L'upload du fichier est géré par l'endpoint /upload-proof/, donc ici on ne fait rien
         return JSONResponse(content={"response": "Veuillez utiliser le formulaire d'upload pour envoyer votre fichier justificatif."})
 
-    # Détection de l'intention
-    intent = detect_intent(message)
-
     # --- Bloc RH : liste structurée de toutes les demandes de congé ---
     if intent == "liste_conges_rh":
         if not has_permission(user, "HR") and not has_permission(user, "RH"):
             return JSONResponse(content={"response": "Désolé, vous n'avez pas l'accès à la liste des congés."})
-        from app.models.demande_conge import DemandeConge
-        from app.models.user import User as UserModel
-        demandes = db.query(DemandeConge).order_by(DemandeConge.created_at.desc()).all()
+        # Première page seulement : la suite est chargée par GET /admin/demandes-conge?cursor=next_cursor
+        page = list_demandes_page(db, include_total=True)
         demandes_struct = []
-        for d in demandes:
-            # Récupérer prénom et nom de l'utilisateur
-            utilisateur = db.query(UserModel).filter(UserModel.id == d.user_id).first()
+        for d in page.demandes:
+            # Prénom et nom de l'utilisateur (chargé avec la demande)
+            utilisateur = d.user
             first_name = utilisateur.first_name if utilisateur else ""
             last_name = utilisateur.last_name if utilisateur else ""
             demandes_struct.append({
@@ -863,7 +611,11 @@ async def chat(request: MessageRequest, db: Session = Depends(get_db)):
                 "preuve": d.preuve,
                 "created_at": d.created_at.strftime('%Y-%m-%d %H:%M') if d.created_at else ""
             })
-        return JSONResponse(content={"demandes_conges_structurees": demandes_struct})
+        return JSONResponse(content={
+            "demandes_conges_structurees": demandes_struct,
+            "next_cursor": page.next_cursor,
+            "total": page.total
+        })
 
     # Réponses prédéfinies en fonction de l'intention
     if intent == "greeting":
@@ -887,13 +639,7 @@ async def chat(request: MessageRequest, db: Session = Depends(get_db)):
             
             for log in chat_logs:
                 # Formater la date
-                if hasattr(log, 'timestamp') and log.timestamp:
-                    if isinstance(log.timestamp, str):
-                        date = log.timestamp[:16] if len(log.timestamp) > 16 else log.timestamp
-                    else:
-                        date = log.timestamp.strftime('%d/%m/%Y %H:%M')
-                else:
-                    date = "Non définie"
+                date = log.timestamp.strftime('%d/%m/%Y %H:%M') if log.timestamp else "Non définie"
                 
                 # Formater l'auteur avec icônes
                 if hasattr(log, 'sender') and log.sender:
@@ -1052,7 +798,7 @@ async def chat(request: MessageRequest, db: Session = Depends(get_db)):
             response += f"        👥 {data['total']} employés | 🔄 {data['en_cours']} en mission\n"
             
             if data["missions"]:
-                top_missions = list(set(data["missions"]))[:3]
+                top_missions = data["missions"][:3]
                 response += f"        📋 Missions fréquentes : {', '.join(top_missions)}\n"
             response += "\n"
         
@@ -1138,11 +884,8 @@ async def chat(request: MessageRequest, db: Session = Depends(get_db)):
         if not has_permission(user, "HR") and not has_permission(user, "RH"):
             return JSONResponse(content={"response": "⛔ Accès réservé aux ressources humaines."})
         
-        # Générer le rapport
-        rapport_data = generer_rapport_conges(db)
-        
-        # Sauvegarder le rapport
-        filename, file_path = sauvegarder_rapport(rapport_data, "conges", user.id)
+        # Générer et sauvegarder le rapport (session dédiée dans le pool io)
+        rapport_data, filename, file_path = await run_io(produire_rapport_conges, user.id)
         
         if not filename:
             return JSONResponse(content={"response": "❌ Erreur lors de la génération du rapport. Veuillez réessayer."})
@@ -1197,7 +940,7 @@ async def chat(request: MessageRequest, db: Session = Depends(get_db)):
         rapport_data = generer_rapport_charge_travail(db)
         
         # Sauvegarder le rapport
-        filename, file_path = sauvegarder_rapport(rapport_data, "charge", user.id)
+        filename, file_path = await run_io(sauvegarder_rapport, rapport_data, "charge", user.id)
         
         if not filename:
             return JSONResponse(content={"response": "❌ Erreur lors de la génération du rapport. Veuillez réessayer."})
@@ -1301,7 +1044,8 @@ async def chat(request: MessageRequest, db: Session = Depends(get_db)):
     elif "mon department" in message or "mon departement" in message:
         return JSONResponse(content={"response": f"Votre department est : {user.department}"})
     elif "date de mise à jour" in message or "updated at" in message:
-        return JSONResponse(content={"response": f"Votre dernier update est : {user.updated_at}"})
+        updated_at = user.updated_at.strftime('%d/%m/%Y %H:%M') if user.updated_at else "Non renseignée"
+        return JSONResponse(content={"response": f"Votre dernier update est : {updated_at}"})
     elif "solde de congés" in message or "solde congé" in message or "solde de conges" in message or "solde conges" in message or "solde_conges" in message or "combien de congés" in message or "combien de jours de congé" in message or "mon solde de congé" in message or "mes congés restants" in message:
         return JSONResponse(content={"response": f"Votre solde de congés payés est : {user.solde_conges if user.solde_conges is not None else 'Non renseigné'} jours."})
     elif "solde rtt" in message or "solde de rtt" in message or "combien de rtt" in message or "mes rtt" in message or "mon solde rtt" in message or "solde_rtt" in message:
@@ -1339,15 +1083,15 @@ async def chat(request: MessageRequest, db: Session = Depends(get_db)):
             f"{'Email':<20} {target_user.email:<40}",
             f"{'Rôle':<20} {target_user.role:<40}",
             f"{'Département':<20} {target_user.department:<40}",
-            f"{'Date création':<20} {str(target_user.created_at):<40}",
-            f"{'Dernière maj':<20} {str(target_user.updated_at):<40}"
+            f"{'Date création':<20} {target_user.created_at.strftime('%d/%m/%Y %H:%M') if target_user.created_at else 'Non renseignée':<40}",
+            f"{'Dernière maj':<20} {target_user.updated_at.strftime('%d/%m/%Y %H:%M') if target_user.updated_at else 'Non renseignée':<40}"
         ]
         tableau = f"\n{header}\n{separator}\n" + "\n".join(rows)
         legende = "\n\nLégende :\n- Champ : information\n- Valeur : donnée correspondante de l'utilisateur"
         return JSONResponse(content={"response": f"Informations de l'utilisateur {target_user.first_name} {target_user.last_name} :" + tableau + legende})
 
     # Extraire les mots-clés du message
-    keywords = message.split()
+    keywords = nm.tokens
     logger.debug(f"Mots-clés extraits : {keywords}")
 
     # Vérifier si les mots-clés correspondent à un titre d'instruction
@@ -1406,9 +1150,10 @@ async def chat(request: MessageRequest, db: Session = Depends(get_db)):
 async def upload_proof(
     matricule: str = Form(...),
     proof: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    adb: AsyncSession = Depends(get_async_db)
 ):
-    user = get_user_by_matricule(db, matricule)
+    user = await async_queries.get_user_by_matricule(adb, matricule)
     if not user:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé.")
     # Vérifier qu'il y a une demande de congé en attente dans temp_memory
@@ -1427,23 +1172,17 @@ async def upload_proof(
     file_ext = os.path.splitext(proof.filename)[1] if proof.filename else ''
     filename = f"preuve_{user.id}_{int(datetime.now().timestamp())}{file_ext}"
     file_path = os.path.join(uploads_dir, filename)
-    with open(file_path, "wb") as f:
-        content = await proof.read()
-        f.write(content)
+    await run_io(write_upload, file_path, await proof.read())
     # Enregistrer la demande de congé avec la preuve
-    from app.models.demande_conge import DemandeConge
-    demande = DemandeConge(
+    demande = await async_queries.create_demande_conge(
+        adb,
         user_id=user.id,
         type_conge=data["type_conge"],
         date_debut=datetime.strptime(data["date_debut"], "%Y-%m-%d"),
         date_fin=datetime.strptime(data["date_fin"], "%Y-%m-%d"),
         raison=data["raison"],
-        preuve=file_path,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
+        preuve=file_path
     )
-    db.add(demande)
-    db.commit()
     
     # 🔥 NOTIFICATION AUTOMATIQUE AUX RH
     # Notifier tous les utilisateurs RH d'une nouvelle demande de congé
@@ -1473,9 +1212,9 @@ async def upload_proof(
     
     # 🔥 VÉRIFICATION AUTOMATIQUE DE SURCHARGE
     # Analyser la charge de travail et notifier en cas de surcharge
-    analyse = analyser_charge_travail(db)
-    if analyse["users_surcharges"] and users_rh:
-        creer_notification_surcharge(db, users_rh, analyse["users_surcharges"])
+    users_surcharges = get_users_surcharges(db) if users_rh else []
+    if users_surcharges:
+        creer_notification_surcharge(db, users_rh, users_surcharges)
     # Mettre à jour le CSV utilisateur
     from app.models.demande_fichier import DemandeFichier
     user_file_entry = db.query(DemandeFichier).filter(DemandeFichier.user_id == user.id).first()
@@ -1492,7 +1231,8 @@ async def upload_proof(
         csv_file_path = user_file_entry.fichier_csv if user_file_entry and user_file_entry.fichier_csv else generated_path
     fieldnames = ["Type de Congé", "Date de Début", "Date de Fin", "Raison", "Preuve"]
     import csv
-    try:
+
+    def append_user_csv():
         file_exists = os.path.isfile(csv_file_path)
         with open(csv_file_path, mode="a", newline="", encoding="utf-8") as file:
             writer = csv.DictWriter(file, fieldnames=fieldnames)
@@ -1505,6 +1245,9 @@ async def upload_proof(
                 "Raison": data["raison"].capitalize() if data["raison"] else "Non spécifiée",
                 "Preuve": file_path
             })
+
+    try:
+        await run_io(append_user_csv)
     except Exception as e:
         logger.error(f"Erreur lors de l'écriture dans le fichier CSV : {e}")    # Nettoyer la mémoire temporaire seulement après succès complet
     if user.id in temp_memory:
@@ -1555,13 +1298,13 @@ async def upload_proof(
 
 # Endpoints pour les notifications
 @app.get("/notifications/{matricule}")
-async def get_notifications(matricule: str, unread_only: bool = False, db: Session = Depends(get_db)):
+async def get_notifications(matricule: str, unread_only: bool = False, adb: AsyncSession = Depends(get_async_db)):
     """Récupérer les notifications d'un utilisateur"""
-    user = get_user_by_matricule(db, matricule)
+    user = await async_queries.get_user_by_matricule(adb, matricule)
     if not user:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé.")
     
-    notifications = get_user_notifications(db, user.id, unread_only)
+    notifications = await async_queries.get_user_notifications(adb, user.id, unread_only)
     notifications_data = []
     for notif in notifications:
         notifications_data.append({
@@ -1577,36 +1320,36 @@ async def get_notifications(matricule: str, unread_only: bool = False, db: Sessi
     return JSONResponse(content={"notifications": notifications_data})
 
 @app.get("/notifications/{matricule}/count")
-async def get_notifications_count(matricule: str, db: Session = Depends(get_db)):
+async def get_notifications_count(matricule: str, adb: AsyncSession = Depends(get_async_db)):
     """Récupérer le nombre de notifications non lues"""
-    user = get_user_by_matricule(db, matricule)
+    user = await async_queries.get_user_by_matricule(adb, matricule)
     if not user:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé.")
     
-    count = get_unread_count(db, user.id)
+    count = await async_queries.get_unread_count(adb, user.id)
     return JSONResponse(content={"unread_count": count})
 
 @app.post("/notifications/{matricule}/{notification_id}/read")
-async def mark_notification_read(matricule: str, notification_id: int, db: Session = Depends(get_db)):
+async def mark_notification_read(matricule: str, notification_id: int, adb: AsyncSession = Depends(get_async_db)):
     """Marquer une notification comme lue"""
-    user = get_user_by_matricule(db, matricule)
+    user = await async_queries.get_user_by_matricule(adb, matricule)
     if not user:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé.")
     
-    success = mark_notification_as_read(db, notification_id, user.id)
+    success = await async_queries.mark_notification_as_read(adb, notification_id, user.id)
     if success:
         return JSONResponse(content={"success": True, "message": "Notification marquée comme lue."})
     else:
         raise HTTPException(status_code=404, detail="Notification non trouvée.")
 
 @app.post("/notifications/{matricule}/read-all")
-async def mark_all_notifications_read(matricule: str, db: Session = Depends(get_db)):
+async def mark_all_notifications_read(matricule: str, adb: AsyncSession = Depends(get_async_db)):
     """Marquer toutes les notifications comme lues"""
-    user = get_user_by_matricule(db, matricule)
+    user = await async_queries.get_user_by_matricule(adb, matricule)
     if not user:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé.")
     
-    count = mark_all_notifications_as_read(db, user.id)
+    count = await async_queries.mark_all_notifications_as_read(adb, user.id)
     return JSONResponse(content={"success": True, "message": f"{count} notifications marquées comme lues."})
 
 # Fonction pour générer des conseils personnalisés selon les missions
@@ -1625,58 +1368,10 @@ def generer_conseils_personnalises(current_missions, manager=None):
     return ' '.join(conseils)
 
 # Fonction pour analyser la charge de travail de l'équipe
+# Lue dans les agrégats par département, sans parcourir les employés ; recalcul complet de contrôle :
+# python -m app.services.workload --verify
 def analyser_charge_travail(db: Session):
-    users = db.query(User).all()
-    
-    # Statistiques globales
-    total_users = len(users)
-    users_actifs = len([u for u in users if u.status and u.status.lower() == "actif"])
-    users_missions_en_cours = len([u for u in users if u.missions_status and u.missions_status.lower() == "en cours"])
-    
-    # Analyse par département
-    departments = {}
-    users_surcharges = []
-    
-    for user in users:
-        dept = user.department or "Non défini"
-        if dept not in departments:
-            departments[dept] = {
-                "total": 0,
-                "actifs": 0,
-                "en_cours": 0,
-                "missions": []
-            }
-        
-        departments[dept]["total"] += 1
-        if user.status and user.status.lower() == "actif":
-            departments[dept]["actifs"] += 1
-        if user.missions_status and user.missions_status.lower() == "en cours":
-            departments[dept]["en_cours"] += 1
-            
-        # Analyser les missions individuelles
-        if user.current_missions:
-            missions = [m.strip() for m in user.current_missions.split(',') if m.strip()]
-            departments[dept]["missions"].extend(missions)
-            
-            # Détecter la surcharge (plus de 3 missions en cours)
-            if len(missions) > 3 and user.missions_status and user.missions_status.lower() == "en cours":
-                users_surcharges.append({
-                    "nom": f"{user.first_name} {user.last_name}",
-                    "department": dept,
-                    "nb_missions": len(missions),
-                    "missions": missions
-                })
-    
-    return {
-        "stats_globales": {
-            "total_users": total_users,
-            "users_actifs": users_actifs,
-            "users_missions_en_cours": users_missions_en_cours,
-            "taux_activite": round((users_actifs / total_users * 100) if total_users > 0 else 0, 1)
-        },
-        "departments": departments,
-        "users_surcharges": users_surcharges
-    }
+    return get_workload_analysis(db)
 
 # Fonction pour créer une notification de surcharge
 def creer_notification_surcharge(db: Session, users_rh: list, users_surcharges: list):
@@ -1707,94 +1402,53 @@ def creer_notification_surcharge(db: Session, users_rh: list, users_surcharges:
     db.commit()
 
 # Fonction pour générer un rapport détaillé sur les demandes de congés
+# Statistiques calculées par la base (GROUP BY) ; le détail des demandes est écrit en flux
+# dans le fichier du rapport (iter_demandes_detaillees), jamais chargé en entier en mémoire
 def generer_rapport_conges(db: Session):
-    from app.models.demande_conge import DemandeConge
-    from app.models.user import User as UserModel
-    
-    # Récupérer toutes les demandes avec les informations utilisateur
-    demandes = db.query(DemandeConge).order_by(DemandeConge.created_at.desc()).all()
+    stats = get_demandes_report_stats(db)
+    total = stats["total"]
     
     rapport = {
         "metadata": {
             "titre": "RAPPORT D'ANALYSE DÉTAILLÉ - DEMANDES DE CONGÉS",
             "date_generation": datetime.now().strftime("%d/%m/%Y à %H:%M"),
             "periode_analyse": "Données complètes",
-            "total_demandes": len(demandes)
+            "total_demandes": total
         },
         "statistiques_globales": {},
         "analyse_par_type": {},
         "analyse_par_departement": {},
         "analyse_temporelle": {},
-        "demandes_detaillees": [],
         "recommandations": []
     }
     
-    if not demandes:
+    if not total:
         return rapport
     
-    # Statistiques globales
-    types_conges = {}
-    departements = {}
-    statuts = {}
-    mois_demandes = {}
-    
-    for demande in demandes:
-        # Récupérer l'utilisateur
-        utilisateur = db.query(UserModel).filter(UserModel.id == demande.user_id).first()
-        
-        # Analyse par type
-        type_conge = demande.type_conge or "Non spécifié"
-        types_conges[type_conge] = types_conges.get(type_conge, 0) + 1
-        
-        # Analyse par département
-        dept = utilisateur.department if utilisateur else "Non défini"
-        departements[dept] = departements.get(dept, 0) + 1
-        
-        # Analyse par statut
-        statut = getattr(demande, 'status', getattr(demande, 'statut', 'en attente'))
-        statuts[statut] = statuts.get(statut, 0) + 1
-        
-        # Analyse temporelle
-        if demande.created_at:
-            mois = demande.created_at.strftime("%Y-%m")
-            mois_demandes[mois] = mois_demandes.get(mois, 0) + 1
-        
-        # Détails de la demande
-        rapport["demandes_detaillees"].append({
-            "id": demande.id,
-            "employe": f"{utilisateur.first_name} {utilisateur.last_name}" if utilisateur else "Inconnu",
-            "matricule": utilisateur.matricule if utilisateur else "N/A",
-            "department": dept,
-            "type_conge": type_conge,
-            "date_debut": demande.date_debut.strftime('%d/%m/%Y') if demande.date_debut else "N/A",
-            "date_fin": demande.date_fin.strftime('%d/%m/%Y') if demande.date_fin else "N/A",
-            "duree_jours": (demande.date_fin - demande.date_debut).days + 1 if demande.date_debut and demande.date_fin else 0,
-            "raison": demande.raison or "Non spécifiée",
-            "statut": statut,
-            "date_demande": demande.created_at.strftime('%d/%m/%Y %H:%M') if demande.created_at else "N/A",
-            "preuve_fournie": "Oui" if demande.preuve else "Non"
-        })
+    types_conges = stats["par_type"]
+    departements = stats["par_departement"]
+    statuts = stats["par_statut"]
     
     # Remplir les statistiques
     rapport["statistiques_globales"] = {
-        "total_demandes": len(demandes),
-        "taux_validation": round((statuts.get('approuvé', 0) / len(demandes) * 100), 1) if demandes else 0,
-        "duree_moyenne": round(sum(d["duree_jours"] for d in rapport["demandes_detaillees"]) / len(demandes), 1) if demandes else 0,
-        "avec_justificatif": sum(1 for d in rapport["demandes_detaillees"] if d["preuve_fournie"] == "Oui"),
+        "total_demandes": total,
+        "taux_validation": round((statuts.get('approuvé', 0) / total * 100), 1),
+        "duree_moyenne": round(stats["somme_durees"] / total, 1),
+        "avec_justificatif": stats["avec_justificatif"],
         "departement_plus_actif": max(departements.items(), key=lambda x: x[1])[0] if departements else "N/A"
     }
     
     rapport["analyse_par_type"] = types_conges
     rapport["analyse_par_departement"] = departements
-    rapport["analyse_temporelle"] = dict(sorted(mois_demandes.items()))
+    rapport["analyse_temporelle"] = dict(sorted(stats["par_mois"].items()))
     
     # Recommandations basées sur l'analyse
     recommandations = []
     
-    if statuts.get('en attente', 0) > len(demandes) * 0.3:
+    if statuts.get('en attente', 0) > total * 0.3:
         recommandations.append("Traitement des demandes en attente à prioriser (>30% en attente)")
     
-    if types_conges.get('maladie', 0) > len(demandes) * 0.4:
+    if types_conges.get('maladie', 0) > total * 0.4:
         recommandations.append("Taux élevé de congés maladie détecté - Enquête de bien-être recommandée")
     
     if rapport["statistiques_globales"]["duree_moyenne"] > 7:
@@ -1802,7 +1456,7 @@ def generer_rapport_conges(db: Session):
     
     if len(departements) > 0:
         dept_max = max(departements.values())
-        if dept_max > len(demandes) * 0.5:
+        if dept_max > total * 0.5:
             recommandations.append("Concentration des demandes dans un département - Redistribution à considérer")
     
     rapport["recommandations"] = recommandations
@@ -1846,7 +1500,7 @@ def generer_rapport_charge_travail(db: Session):
         
         niveau_risque = "CRITIQUE" if taux_charge >= 90 else "ÉLEVÉ" if taux_charge >= 75 else "MODÉRÉ" if taux_charge >= 50 else "FAIBLE"
         
-        missions_uniques = list(set(data["missions"]))
+        missions_uniques = data["missions"]  # distinctes, les plus fréquentes d'abord
         
         rapport["analyse_departementale"][dept] = {
             "total_employes": data["total"],
@@ -1927,8 +1581,23 @@ def generer_rapport_charge_travail(db: Session):
     
     return rapport
 
+# Rapport de congés complet, exécuté dans le pool "io" : la session est ouverte dans ce thread (jamais
+# celle de la requête) et les statistiques comme le détail sont lus dans la même transaction, en
+# REPEATABLE READ sur PostgreSQL pour qu'ils décrivent le même instantané
+def produire_rapport_conges(user_id: int):
+    db = SessionLocal()
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        rapport_data = generer_rapport_conges(db)
+        filename, file_path = sauvegarder_rapport(rapport_data, "conges", user_id, iter_demandes_detaillees(db))
+        return rapport_data, filename, file_path
+    finally:
+        db.close()
+
 # Fonction pour formater et sauvegarder un rapport en fichier texte
-def sauvegarder_rapport(rapport_data: dict, type_rapport: str, user_id: int):
+# details : lignes détaillées (dicts) écrites une à une à la suite du résumé, sans les garder en mémoire
+def sauvegarder_rapport(rapport_data: dict, type_rapport: str, user_id: int, details=None):
     import os
     
     # Créer le dossier des rapports s'il n'existe pas
@@ -2029,7 +1698,7 @@ Département : {dept}
         for i, rec in enumerate(rapport_data['recommandations_strategiques'], 1):
             contenu += f"{i}. {rec}\n"
     
-    contenu += f"""
+    pied = f"""
 
 {'='*80}
 Rapport généré automatiquement par le Système de Gestion RH
@@ -2041,6 +1710,16 @@ Contact : Support RH pour toute question
     try:
         with open(file_path, 'w', encoding='utf-8') as f:
             f.write(contenu)
+            if details is not None:
+                f.write(f"""
+📋 DEMANDES DÉTAILLÉES
+{'─'*50}
+""")
+                for d in details:
+                    f.write(f"• #{d['id']} {d['employe']} ({d['matricule']}, {d['department']}) : {d['type_conge']} "
+                            f"du {d['date_debut']} au {d['date_fin']} ({d['duree_jours']} j), {d['statut']}, "
+                            f"demandée le {d['date_demande']}, justificatif : {d['preuve_fournie']}\n")
+            f.write(pied)
         return filename, file_path
     except Exception as e:
         logger.error(f"Erreur lors de la sauvegarde du rapport : {e}")
@@ -2048,6 +1727,20 @@ Contact : Support RH pour toute question
 
 # Monter le routeur admin RH pour les endpoints /admin/demandes-conge
 app.include_router(demande_conge_admin_router)
+app.include_router(intents_router)
+
+# Métriques internes (réglage des performances)
+@app.get("/metrics")
+async def get_metrics():
+    """Exposer les métriques internes du backend"""
+    return JSONResponse(content={
+        "gpt2_batching": get_gpt2_scheduler().stats(),
+        "spell_cache": spell_cache_stats(),
+        "sql_queries": SQL_QUERY_STATS.snapshot(),
+        "db_pool": pool_stats(engine.pool),
+        "db_pool_async": pool_stats(async_engine.pool),
+        "executors": executor_stats(),
+    })
 
 # Endpoint pour télécharger les rapports générés
 @app.get("/download-report/{filename}")
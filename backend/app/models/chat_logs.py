@@ -1,14 +1,20 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class ChatLog(Base):
     __tablename__ = 'chat_logs'
+    # Dernier message d'un employé : WHERE user_id = ? ORDER BY id DESC LIMIT 1
+    # Historique d'un employé sur une période : WHERE user_id = ? AND timestamp BETWEEN ...
+    __table_args__ = (
+        Index('ix_chat_logs_user_id_id', 'user_id', 'id'),
+        Index('ix_chat_logs_user_id_timestamp', 'user_id', 'timestamp'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey('users.id'))
     message = Column(String)
     sender = Column(String)
-    timestamp = Column(String)
+    timestamp = Column(DateTime)
 
     user = relationship("User", back_populates="chat_logs")
@@ -1,17 +1,27 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
+from sqlalchemy.orm import relationship
 from app.database import Base
 from datetime import datetime
 
 class DemandeConge(Base):
     __tablename__ = "demandes_conge"
+    __table_args__ = (
+        # Demandes d'un employé, les plus récentes d'abord
+        Index("ix_demandes_conge_user_id_created_at", "user_id", "created_at"),
+        # Pagination par clé (created_at, id) de la liste RH
+        Index("ix_demandes_conge_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", name="fk_demandes_conge_user_id_users"), nullable=False)
     type_conge = Column(String(50), nullable=False)
     date_debut = Column(DateTime, nullable=False)
     date_fin = Column(DateTime, nullable=False)
     raison = Column(Text, nullable=True)
     status = Column(String(50), default="en attente")
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)  # clé de pagination : jamais NULL
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     preuve = Column(String(255), nullable=True)  # Chemin du fichier justificatif
+
+    # Demandeur (charger avec joinedload dans les listes pour éviter une requête par demande)
+    user = relationship("User", back_populates="demandes_conge")
@@ -1,10 +1,12 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 from datetime import datetime
 
 class Notification(Base):
     __tablename__ = "notifications"
+    # Notifications (non lues) d'un employé, les plus récentes d'abord, et compteur
+    __table_args__ = (Index("ix_notifications_user_id_is_read_created_at", "user_id", "is_read", "created_at"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
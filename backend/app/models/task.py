@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
 from app.database import Base
 
 class Task(Base):
@@ -9,7 +9,7 @@ class Task(Base):
     task_type = Column(String)
     status = Column(String)
     task_description = Column(String)
-    requested_at = Column(String)
-    completed_at = Column(String)
-    created_at = Column(String)
-    updated_at = Column(String)
+    requested_at = Column(DateTime)
+    completed_at = Column(DateTime)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DECIMAL, Date
+from sqlalchemy import Column, Integer, String, DECIMAL, Date, DateTime
 from app.database import Base
 from sqlalchemy.orm import relationship
 
@@ -11,9 +11,9 @@ class User(Base):
     last_name = Column(String)
     email = Column(String, unique=True)
     role = Column(String)
-    department = Column(String)
-    created_at = Column(String)
-    updated_at = Column(String)
+    department = Column(String, index=True)  # destinataires RH des notifications
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
 
     # ✅ Champs ajoutés
     status = Column(String)  # statut de l'employé
@@ -30,3 +30,4 @@ class User(Base):
     # 🔁 Relations
     chat_logs = relationship('ChatLog', back_populates='user', cascade='all, delete-orphan')
     notifications = relationship('Notification', back_populates='user', cascade='all, delete-orphan')
+    demandes_conge = relationship('DemandeConge', back_populates='user')
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey
+from app.database import Base
+
+
+# Agrégats de charge de travail tenus à jour à chaque écriture d'un employé (voir app/services/workload.py)
+
+class UserWorkload(Base):
+    """Contribution d'un employé aux agrégats de son département"""
+    __tablename__ = "user_workloads"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE", name="fk_user_workloads_user_id_users"),
+                     primary_key=True)
+    department = Column(String, nullable=False)             # "Non défini" si vide
+    actif = Column(Boolean, nullable=False, default=False)  # status == "actif"
+    en_cours = Column(Boolean, nullable=False, default=False)  # missions_status == "en cours"
+    nb_missions = Column(Integer, nullable=False, default=0)
+    missions = Column(Text, nullable=False, default="")     # current_missions normalisées, séparées par des virgules
+    surcharge = Column(Boolean, nullable=False, default=False, index=True)  # plus de 3 missions en cours
+
+
+class DepartmentWorkload(Base):
+    """Compteurs par département (somme des UserWorkload)"""
+    __tablename__ = "department_workloads"
+
+    department = Column(String, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    actifs = Column(Integer, nullable=False, default=0)
+    en_cours = Column(Integer, nullable=False, default=0)
+    nb_missions = Column(Integer, nullable=False, default=0)
+    surcharges = Column(Integer, nullable=False, default=0)
+
+
+class DepartmentMission(Base):
+    """Nombre d'occurrences de chaque mission dans un département"""
+    __tablename__ = "department_missions"
+
+    department = Column(String, primary_key=True)
+    mission = Column(String, primary_key=True)
+    nb = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,28 @@
+# backend/app/nlp/__init__.py
+
+"""
+Traitement du langage du chatbot : détection d'intention, correction
+orthographique, extraction de noms et message normalisé.
+
+Ce paquet est volontairement léger : il n'importe ni modèle (torch,
+transformers), ni FastAPI, ni base de données, afin que les scripts
+d'évaluation, les traitements par lots et les workers puissent l'utiliser
+sans démarrer l'application. Le lexique pyspellchecker n'est chargé qu'à la
+première correction qui en a besoin.
+"""
+
+from app.nlp.intents import INTENT_KEYWORDS, IntentMatcher, detect_intent, normalize
+from app.nlp.message import NormalizedMessage
+from app.nlp.names import extract_first_and_last_name
+from app.nlp.spelling import COMMON_MISTAKES, correct_spelling
+
+__all__ = [
+    "COMMON_MISTAKES",
+    "INTENT_KEYWORDS",
+    "IntentMatcher",
+    "NormalizedMessage",
+    "correct_spelling",
+    "detect_intent",
+    "extract_first_and_last_name",
+    "normalize",
+]
@@ -0,0 +1,109 @@
+# backend/app/nlp/batch.py
+
+"""
+Classification d'intention par lots (analyses hors ligne, export de chat_logs).
+
+Même chaîne que NormalizedMessage (correction, normalisation, mots-clés puis
+classifieur TF-IDF de secours), mais appliquée à tout le lot d'un coup :
+chaque mot distinct n'est corrigé qu'une fois, chaque texte normalisé distinct
+n'est analysé qu'une fois, et tous les messages sans mot-clé passent par un
+seul appel vectorizer.transform.
+
+Usage en ligne de commande (depuis backend/) :
+    python -m app.nlp.batch --log backend/chatbot.log [--output intents.jsonl]
+    python -m app.nlp.batch --csv chat_logs.csv [--column message]
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+
+from app.config import Config
+from app.nlp.chat_log import iter_logged_messages, rotated_log_files
+from app.nlp.classifier import NO_INTENT, get_intent_classifier
+from app.nlp.intents import INTENT_MATCHER, normalize
+from app.nlp.spelling import correct_spelling_batch
+
+
+def classify_batch(messages, correct: bool = True, threshold: float = None) -> list:
+    """Une entrée par message : message, corrected, intent, source, confidence"""
+    threshold = Config.INTENT_CLASSIFIER_THRESHOLD if threshold is None else threshold
+    lowered = [(message or "").lower() for message in messages]
+    corrected = correct_spelling_batch(lowered) if correct else lowered
+    normalized = [normalize(text) for text in corrected]
+
+    distinct = list(dict.fromkeys(normalized))
+    keyword_intents = {text: INTENT_MATCHER.match_normalized(text) for text in distinct}
+
+    predictions = {}
+    misses = [text for text in distinct if keyword_intents[text] is None and text]
+    classifier = get_intent_classifier() if misses else None
+    if classifier is not None:
+        predictions = dict(zip(misses, classifier.predict_batch_with_confidence(misses)))
+
+    results = []
+    for message, corrected_text, text in zip(messages, corrected, normalized):
+        intent, source, confidence = keyword_intents[text], None, None
+        if intent is not None:
+            source = "keywords"
+        elif text in predictions:
+            predicted, confidence = predictions[text]
+            if confidence >= threshold and predicted != NO_INTENT:
+                intent, source = predicted, "classifier"
+        results.append({"message": message, "corrected": corrected_text, "intent": intent, "source": source, "confidence": confidence})
+    return results
+
+
+def iter_classified(messages, batch_size: int = 1000, correct: bool = True):
+    """Résultats par paquets de batch_size, suivis d'une ligne de synthèse (débit)"""
+    started = time.perf_counter()
+    total = 0
+    for start in range(0, len(messages), batch_size):
+        chunk = messages[start:start + batch_size]
+        yield from classify_batch(chunk, correct=correct)
+        total += len(chunk)
+    elapsed = time.perf_counter() - started
+    yield {"summary": {
+        "messages": total,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "messages_per_s": round(total / elapsed, 1) if elapsed else None,
+    }}
+
+
+def read_log_messages(path: str) -> list:
+    """Messages "Message original" d'un fichier chatbot.log et de ses rotations"""
+    return [message.original for message in iter_logged_messages(rotated_log_files(path))]
+
+
+def read_csv_messages(path: str, column: str = "message") -> list:
+    """Colonne message d'un export CSV (ex : table chat_logs)"""
+    with open(path, encoding="utf-8", newline="") as f:
+        return [row[column] or "" for row in csv.DictReader(f)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Classer l'intention d'un ensemble de messages (JSON lines)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--log", help="fichier chatbot.log")
+    source.add_argument("--csv", help="export CSV (ex : chat_logs)")
+    parser.add_argument("--column", default="message", help="colonne du message dans le CSV")
+    parser.add_argument("--output", help="fichier JSON lines (sortie standard par défaut)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--no-correction", action="store_true", help="ne pas corriger l'orthographe")
+    args = parser.parse_args()
+
+    messages = read_log_messages(args.log) if args.log else read_csv_messages(args.csv, args.column)
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for line in iter_classified(messages, args.batch_size, correct=not args.no_correction):
+            if "summary" in line:
+                summary = line["summary"]
+                print(f"✅ {summary['messages']} messages classés en {summary['elapsed_ms']} ms "
+                      f"({summary['messages_per_s']} messages/s)", file=sys.stderr)
+            else:
+                output.write(json.dumps(line, ensure_ascii=False) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
@@ -0,0 +1,43 @@
+# backend/app/nlp/build_spell_index.py
+
+"""
+Construction de l'index de correction partagé (voir app/nlp/spell_index.py).
+
+À relancer après toute modification des mots-clés d'intention, de
+COMMON_MISTAKES ou d'une mise à jour de pyspellchecker ; les workers
+reviennent au vocabulaire en mémoire tant que l'index n'est pas à jour.
+
+Usage (depuis backend/) :
+    python -m app.nlp.build_spell_index [--output chemin.bin] [--no-lexicon]
+"""
+
+import argparse
+
+from app.config import Config
+from app.nlp.spell_index import write_spell_index
+from app.nlp.spelling import DOMAIN_MAX_DISTANCE, domain_vocabulary
+
+
+def french_lexicon():
+    """Mots du dictionnaire français de pyspellchecker"""
+    from spellchecker import SpellChecker
+
+    return list(SpellChecker(language='fr').word_frequency.keys())
+
+
+def build_spell_index(output: str = None, with_lexicon: bool = True) -> dict:
+    output = output or Config.SPELL_INDEX_PATH
+    lexicon = french_lexicon() if with_lexicon else ()
+    return write_spell_index(output, domain_vocabulary(), lexicon, DOMAIN_MAX_DISTANCE)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construire l'index de correction partagé par mmap")
+    parser.add_argument("--output", default=Config.SPELL_INDEX_PATH)
+    parser.add_argument("--no-lexicon", action="store_true", help="vocabulaire métier seul (lexique lu via pyspellchecker)")
+    args = parser.parse_args()
+
+    summary = build_spell_index(args.output, with_lexicon=not args.no_lexicon)
+    print(f"✅ Index de correction écrit : {summary['path']}")
+    print(f"   {summary['words']} mots dont {summary['domain_words']} mots métier, "
+          f"{summary['delete_keys']} variantes, {summary['bytes'] / 1024:.0f} Ko")
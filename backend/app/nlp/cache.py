@@ -0,0 +1,68 @@
+# backend/app/nlp/cache.py
+
+"""
+Cache LRU borné et thread-safe, avec compteurs de hits/misses/évictions.
+"""
+
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    def __init__(self, capacity: int):
+        self.capacity = max(0, int(capacity))
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Valeur en cache (marquée comme récente), ou default si absente"""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if self.capacity == 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.capacity:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Valeur en cache ou calculée par compute(key), hors verrou, puis mise en cache"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute(key)
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "capacity": self.capacity,
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
@@ -0,0 +1,110 @@
+# backend/app/nlp/chat_log.py
+
+"""
+Lecture en flux des journaux du chat (backend/chatbot.log et ses rotations).
+
+Chaque appel à /chat/ écrit deux lignes, "Message original : ..." puis
+"Message corrigé : ...". Ce module les regroupe en paires sans charger le
+fichier en mémoire, pour en faire un corpus de rejeu (benchmarks/
+benchmark_chat_replay.py) ou d'analyse (python -m app.nlp.batch --log).
+
+Sont pris en charge :
+- les rotations de RotatingFileHandler (chatbot.log.1, .2, ...) et de
+  TimedRotatingFileHandler (chatbot.log.2025-07-02), compressées ou non (.gz),
+  lues de la plus ancienne à la plus récente ;
+- les messages sur plusieurs lignes (lignes sans horodatage rattachées au
+  message en cours) ;
+- un original sans ligne corrigée (processus interrompu) : corrected = None ;
+- les doubles envois : une paire identique à la précédente dans la fenêtre
+  dedupe_window (secondes) est ignorée si dedupe_window est fourni.
+"""
+
+import glob
+import gzip
+import os
+import re
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+ORIGINAL_MARKER = "Message original : "
+CORRECTED_MARKER = "Message corrigé : "
+
+_RECORD = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - \S+ - \w+ - (.*)$")
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S,%f"
+
+
+class LoggedMessage(NamedTuple):
+    timestamp: datetime
+    original: str
+    corrected: Optional[str]
+
+
+def rotated_log_files(path: str) -> list:
+    """Le journal et ses rotations existantes, du plus ancien au plus récent"""
+    numbered, dated = [], []
+    for rotated in glob.glob(glob.escape(path) + ".*"):
+        suffix = rotated[len(path) + 1:]
+        if suffix.endswith(".gz"):
+            suffix = suffix[:-3]
+        if suffix.isdigit():
+            numbered.append((int(suffix), rotated))
+        elif suffix and not suffix.endswith(".tmp"):
+            dated.append((suffix, rotated))
+    files = [p for _, p in sorted(numbered, reverse=True)] + [p for _, p in sorted(dated)]
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def open_log(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def iter_log_records(paths):
+    """(horodatage, texte) de chaque enregistrement, lignes de continuation incluses"""
+    for path in paths:
+        timestamp, text = None, None
+        with open_log(path) as f:
+            for line in f:
+                line = line.rstrip("\r\n")
+                match = _RECORD.match(line)
+                if match:
+                    if text is not None:
+                        yield timestamp, text
+                    timestamp = datetime.strptime(match.group(1), _TIMESTAMP_FORMAT)
+                    text = match.group(2)
+                elif text is not None:
+                    text += "\n" + line
+        if text is not None:
+            yield timestamp, text
+
+
+def iter_logged_messages(paths, dedupe_window: float = None):
+    """Paires (horodatage, original, corrigé) dans l'ordre du journal"""
+    pending = None
+    previous = None
+
+    def emit(message):
+        nonlocal previous
+        duplicate = (
+            dedupe_window is not None and previous is not None
+            and (message.original, message.corrected) == (previous.original, previous.corrected)
+            and (message.timestamp - previous.timestamp).total_seconds() <= dedupe_window
+        )
+        previous = message
+        return None if duplicate else message
+
+    for timestamp, text in iter_log_records(paths):
+        if text.startswith(ORIGINAL_MARKER):
+            if pending is not None and emit(pending):
+                yield pending
+            pending = LoggedMessage(timestamp, text[len(ORIGINAL_MARKER):], None)
+        elif text.startswith(CORRECTED_MARKER) and pending is not None:
+            message = pending._replace(corrected=text[len(CORRECTED_MARKER):])
+            pending = None
+            if emit(message):
+                yield message
+    if pending is not None and emit(pending):
+        yield pending
@@ -0,0 +1,65 @@
+# backend/app/nlp/classifier.py
+
+"""
+Classifieur d'intention TF-IDF de secours (nlp_model.NLPModel).
+
+Il n'intervient que lorsque aucun mot-clé d'intention ne correspond au message
+et sa réponse n'est retenue qu'au-dessus de INTENT_CLASSIFIER_THRESHOLD. Les
+exemples négatifs du corpus sont appris comme une classe à part (NO_INTENT) :
+la prédire vaut absence d'intention, quelle que soit la confiance. Le
+modèle est entraîné hors ligne (python -m app.nlp.train_intent_classifier),
+sauvegardé avec joblib et rechargé par projection mémoire à la première
+utilisation : sklearn n'est jamais importé si le modèle est absent ou si les
+mots-clés suffisent.
+"""
+
+import logging
+import os
+import threading
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+NO_INTENT = "none"
+
+_classifier = None
+_classifier_loaded = False
+_classifier_lock = threading.Lock()
+
+
+def get_intent_classifier():
+    """Modèle chargé une seule fois, ou None s'il n'a pas été entraîné"""
+    global _classifier, _classifier_loaded
+    if not _classifier_loaded:
+        with _classifier_lock:
+            if not _classifier_loaded:
+                path = Config.INTENT_CLASSIFIER_PATH
+                if os.path.exists(path):
+                    try:
+                        from nlp_model import NLPModel
+
+                        _classifier = NLPModel.load(path)
+                    except Exception as e:
+                        logger.warning(f"Classifieur d'intention inutilisable ({path}) : {e}")
+                else:
+                    logger.info(f"Pas de classifieur d'intention ({path}) : mots-clés uniquement")
+                _classifier_loaded = True
+    return _classifier
+
+
+def reset_intent_classifier():
+    """Oublier le modèle chargé (ex : après un nouvel entraînement)"""
+    global _classifier, _classifier_loaded
+    with _classifier_lock:
+        _classifier, _classifier_loaded = None, False
+
+
+def classify_intent(normalized_text: str, threshold: float = None):
+    """(intention, confiance) prédite sur un texte normalisé ; intention None sous le seuil ou pour NO_INTENT"""
+    classifier = get_intent_classifier()
+    if classifier is None or not normalized_text:
+        return None, None
+    threshold = Config.INTENT_CLASSIFIER_THRESHOLD if threshold is None else threshold
+    intent, confidence = classifier.predict_with_confidence(normalized_text)
+    return (intent if confidence >= threshold and intent != NO_INTENT else None), confidence
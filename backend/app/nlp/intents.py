@@ -0,0 +1,224 @@
+# backend/app/nlp/intents.py
+
+"""
+Détection d'intention par mots-clés.
+
+Les tables de mots-clés sont compilées une seule fois, à l'import, en un
+automate d'Aho-Corasick : un seul parcours du message suffit pour trouver
+l'intention de plus haute priorité parmi toutes celles dont un mot-clé
+apparaît dans le message.
+
+L'ordre de INTENT_KEYWORDS est l'ordre de priorité historique de detect_intent
+(ex : liste_conges_rh avant demande_conge) et ne doit pas être modifié sans
+raison. Les mots-clés sont comparés au message normalisé (minuscules, sans
+accents, espaces réduits) : un mot-clé accentué ou en majuscules ne peut donc
+jamais correspondre, exactement comme avant.
+"""
+
+import re
+import unicodedata
+from collections import deque
+
+# (intention, mots-clés) par ordre de priorité décroissante
+INTENT_KEYWORDS = [
+    # Intention : Accompagnement RH pour l'évolution professionnelle
+    ("evolution_rh", [
+        "comment le service rh peut il accompagner les employes dans leur evolution professionnelle",
+        "comment le service rh accompagne les employes dans leur evolution professionnelle",
+        "accompagnement rh evolution professionnelle",
+        "comment rh aide a evoluer",
+        "comment rh aide a la promotion",
+        "aide rh pour changer de poste",
+        "aide rh pour formation"
+    ]),
+    # Intention : Responsable du service RH
+    ("responsable_rh", [
+        "qui est le responsable du service rh",
+        "responsable rh",
+        "nom du responsable rh",
+        "chef du service rh"
+    ]),
+    # Intention : Horaires du service RH
+    ("horaires_rh", [
+        "horaires du service rh",
+        "quels sont les horaires du service rh",
+        "heures d'ouverture rh",
+        "quand puis-je contacter le service rh",
+        "disponibilite rh"
+    ]),
+    # Intention : Comment contacter le service RH ?
+    ("contacter_rh_basic", [
+        "comment contacter le service rh",
+        "comment joindre le service rh",
+        "contacter rh",
+        "joindre rh"
+    ]),
+    # Intention : Rôle du service RH
+    ("role_rh", [
+        "a quoi sert le service des ressources humaines",
+        "quel est le role du service rh",
+        "role du service rh",
+        "utilite du service rh",
+        "pourquoi le service rh",
+        "fonction du service rh"
+    ]),
+    # Intention : Aide RH au quotidien
+    ("aide_rh_quotidien", [
+        "comment le service rh peut il aider les employes",
+        "comment le service rh peut-il aider les employes",
+        "comment le service rh peut il aider les employés",
+        "comment le service rh peut-il aider les employés",
+        "aide rh quotidien",
+        "aide du service rh",
+        "comment rh aide employes",
+        "comment rh aide employés",
+        "comment les rh aident les employés?"
+    ]),
+    # Détection des salutations
+    ("greeting", ["bonjour", "salut", "coucou", "Hello", "Hi", "bjr", "cc"]),
+    ("politeness", ["merci", "thanks", "thank you", "mrc"]),
+    # Détection des questions sur le rôle du bot
+    ("role_query", ["ton rôle", "ton role", "qui es-tu", "qui est tu", "tu fais quoi", "t qui", "tfq", "ta mission"]),
+    # Détection des questions sur l'état du bot
+    ("status_query", ["comment ça va", "ça va", "comment vas-tu", "cava", "cv", "comment vas tu", "comment allez vous", "comment allez-vous"]),
+    # Intention : Comment contacter un RH
+    ("contact_rh", [
+        "comment contacter un rh", "comment je peux contacter un rh", "contacter rh", "joindre rh", "prendre contact rh", "contact rh", "parler à un rh", "parler rh", "appeler rh", "email rh", "mail rh", "téléphoner rh", "numéro rh", "numero rh", "adresse rh"
+    ]),
+    # Intention : Fournir les infos RH à contacter
+    ("infos_rh", [
+        "info rh", "infos rh", "information rh", "informations rh", "coordonnees rh", "contact rh", "contacts rh",
+        "fournissez les info des rh", "fournir infos rh", "qui contacter rh", "responsable rh", "service rh", "personne rh",
+        "email rh", "mail rh", "adresse rh", "numero rh", "numéro rh", "telephone rh", "téléphone rh", "tel rh"
+    ]),
+    # Détection des demandes d'historique
+    ("chat_history", ["logs", "historique de chat"]),
+    # Détection de la liste des congés par le RH - DOIT ÊTRE AVANT demande_conge
+    ("liste_conges_rh", [
+        "liste des cong", "liste de congés", "liste congés", "liste congé",
+        "demandes de congé", "demandes congés", "demandes congé",
+        "historique des congés", "historique congés",
+        "suivi des congés", "suivi congés"
+    ]),
+    # Détection du suivi personnel des congés (utilisateur normal)
+    ("suivi_mes_conges", [
+        "suivi de mes congés", "suivi de mes conges", "mes congés", "mes demandes de congé",
+        "historique de mes congés", "statut de mes congés", "suivi mes congés",
+        "mes demandes", "statut de ma demande", "ma dernière demande"
+    ]),
+    # Détection des demandes de congé (plus général, doit venir après)
+    ("demande_conge", ["congé", "demande de congé", "demande congé", "vacances", "absence"]),
+    # Détection de l'intention d'explication du pourcentage
+    ("explain_percentage", ["pourquoi ce pourcentage", "pourquoi ce taux", "détail du calcul", "explication du pourcentage", "pourcentage d'acceptation", "comment ce pourcentage"]),
+    # Procédure congé
+    ("procedure_conge", [
+        "procedure pour les cong", "procedure pour poser un cong", "comment poser un cong",
+        "delai cong", "delai pour poser un cong", "delai de traitement cong",
+        "documents cong", "justificatif cong", "procedure conge", "procedure congé",
+        "comment faire une demande", "étapes pour congé", "marche à suivre",
+        "que faut-il faire", "comment procéder", "démarches congé"
+    ]),
+    # Intentions RH pour l'analyse de charge
+    ("workload_forecast", [
+        "prévision charge", "prévisions charge", "charge de travail", "prévision travail",
+        "analyse charge", "prévision équipe", "charge équipe", "workload",
+        "missions en cours", "analyse missions", "prévision missions"
+    ]),
+    ("overload_alert", [
+        "surcharge équipe", "alerte surcharge", "équipe surchargée", "trop de travail",
+        "explication surcharge", "pourquoi surcharge", "détail surcharge"
+    ]),
+    # Intentions pour la génération de rapports
+    ("generate_leave_report", [
+        "rapport analyse congé", "rapport demandes congés", "rapport détaillé congé",
+        "générez un rapport analyse", "générer rapport congé", "rapport congés détaillé",
+        "analyse détaillée congés", "rapport sur les congés"
+    ]),
+    ("generate_workload_report", [
+        "rapport charge travail", "rapport prévision charge", "rapport détaillé charge",
+        "générez rapport charge", "générer rapport workload", "rapport charge détaillé",
+        "analyse détaillée charge", "rapport sur la charge"
+    ]),
+    # Détection des demandes de téléchargement de rapport
+    ("download_report", ["télécharger", "télécharge", "download"]),
+]
+
+
+def normalize(text: str) -> str:
+    """Normalisation simple : minuscule, suppression accents, espaces multiples"""
+    text = text.lower()
+    text = ''.join(c for c in unicodedata.normalize('NFD', text) if unicodedata.category(c) != 'Mn')
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+class IntentMatcher:
+    """Automate d'Aho-Corasick sur l'ensemble des mots-clés d'intention"""
+
+    def __init__(self, intent_keywords):
+        self.intents = [intent for intent, _ in intent_keywords]
+        self._goto = [{}]
+        self._fail = [0]
+        # Meilleure priorité (indice d'intention) reconnue en arrivant sur chaque nœud
+        self._output = [None]
+
+        for priority, (_, keywords) in enumerate(intent_keywords):
+            for keyword in keywords:
+                node = 0
+                for char in keyword:
+                    next_node = self._goto[node].get(char)
+                    if next_node is None:
+                        next_node = len(self._goto)
+                        self._goto[node][char] = next_node
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._output.append(None)
+                    node = next_node
+                self._output[node] = _best(self._output[node], priority)
+
+        # Liens d'échec en largeur : un nœud hérite des sorties de son suffixe le plus long
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = _best(self._output[child], self._output[self._fail[child]])
+
+    def match_normalized(self, text: str):
+        """Intention de plus haute priorité présente dans un texte déjà normalisé"""
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        best = None
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            priority = output[node]
+            if priority is not None and (best is None or priority < best):
+                best = priority
+                if best == 0:
+                    break
+        return self.intents[best] if best is not None else None
+
+    def match(self, message: str):
+        return self.match_normalized(normalize(message))
+
+
+def _best(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
+
+
+INTENT_MATCHER = IntentMatcher(INTENT_KEYWORDS)
+
+
+# Fonction pour détecter l'intention
+def detect_intent(message: str):
+    return INTENT_MATCHER.match(message)
@@ -0,0 +1,56 @@
+# backend/app/nlp/message.py
+
+"""
+Message utilisateur normalisé une seule fois par requête /chat/.
+
+Toutes les branches du chat lisent les formes dont elles ont besoin sur le
+même objet au lieu de relancer correction orthographique, normalisation et
+détection d'intention à chaque test.
+"""
+
+from app.nlp.classifier import classify_intent
+from app.nlp.intents import INTENT_MATCHER, normalize
+
+
+class NormalizedMessage:
+    """Formes successives d'un message, calculées une fois à la construction
+
+    - raw        : texte reçu tel quel
+    - lowered    : texte en minuscules (entrée du correcteur)
+    - corrected  : texte corrigé (lu par les branches du chat)
+    - normalized : texte corrigé sans accents ni espaces multiples
+    - tokens     : mots du texte corrigé
+    - intent     : intention détectée par les mots-clés sur le texte normalisé (ou None)
+    - predicted_intent  : intention du classifieur au-dessus du seuil (ou None)
+    - intent_source     : "keywords", "classifier" ou None
+    - intent_confidence : probabilité du classifieur quand il a été consulté
+
+    Le classifieur TF-IDF n'est consulté que si aucun mot-clé ne correspond. Sa
+    prédiction reste à part : c'est à l'appelant de décider si elle s'applique
+    (pas pendant un flow où le message est une réponse libre, voir best_intent).
+    """
+
+    __slots__ = ("raw", "lowered", "corrected", "normalized", "tokens", "intent", "predicted_intent", "intent_source",
+                 "intent_confidence")
+
+    def __init__(self, raw: str, correct_spelling):
+        self.raw = raw or ""
+        self.lowered = self.raw.lower()
+        self.corrected = correct_spelling(self.lowered)
+        self.normalized = normalize(self.corrected)
+        self.tokens = self.corrected.split()
+        self.intent = INTENT_MATCHER.match_normalized(self.normalized)
+        self.intent_source = "keywords" if self.intent else None
+        self.predicted_intent = self.intent_confidence = None
+        if self.intent is None:
+            self.predicted_intent, self.intent_confidence = classify_intent(self.normalized)
+            if self.predicted_intent is not None:
+                self.intent_source = "classifier"
+
+    @property
+    def best_intent(self):
+        """Intention des mots-clés, sinon celle du classifieur"""
+        return self.intent or self.predicted_intent
+
+    def __repr__(self):
+        return f"NormalizedMessage(corrected={self.corrected!r}, intent={self.intent!r})"
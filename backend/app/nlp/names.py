@@ -0,0 +1,19 @@
+# backend/app/nlp/names.py
+
+"""
+Extraction du prénom et du nom d'un employé dans un message.
+"""
+
+# Mots à ignorer avant de lire le prénom et le nom
+IGNORE_WORDS = {"info", "user", "informations", "de", "l'utilisateur", "l'user", "les", "données", "details"}
+
+
+def extract_first_and_last_name(message: str):
+    # Filtrer les mots à ignorer (comparaison insensible à la casse)
+    words = [word for word in message.split() if word.lower() not in IGNORE_WORDS]
+
+    # Si on a au moins deux mots restants, les considérer comme prénom et nom
+    if len(words) >= 2:
+        return words[-2], words[-1]  # Prénom et nom sont les deux derniers mots
+    else:
+        return None, None
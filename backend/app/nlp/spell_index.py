@@ -0,0 +1,218 @@
+# backend/app/nlp/spell_index.py
+
+"""
+Index de correction sur disque, en lecture seule, partagé par mmap.
+
+Le fichier regroupe le lexique français (appartenance uniquement) et le
+vocabulaire métier avec ses variantes "symmetric delete". Tous les workers
+uvicorn projettent le même fichier en mémoire : les pages sont partagées par
+le cache du système au lieu d'un dictionnaire Python par processus, et rien
+n'est construit au démarrage.
+
+Format (little-endian, version FORMAT_VERSION) :
+    en-tête   : magic, version, max_distance, nb mots, nb mots métier,
+                nb variantes, empreinte du vocabulaire métier (sha1),
+                puis l'offset de chaque section
+    mots      : offsets u32 (n+1) + octets UTF-8 triés, fréquences u32,
+                type u8 (1 = lexique, 2 = métier)
+    variantes : offsets u32 (n+1) + octets UTF-8 triés, puis pour chaque
+                variante la liste (offsets u32 + indices u32) des mots métier
+                dont elle dérive (chaque mot métier est sa propre variante)
+
+Les recherches se font par dichotomie directement dans la projection.
+Reconstruction : python -m app.nlp.build_spell_index
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from collections import Counter
+
+from app.nlp.symspell import _deletes, edit_distance, max_distance_for
+
+MAGIC = b"RHSPIDX\0"
+FORMAT_VERSION = 1
+
+LEXICON = 1
+DOMAIN = 2
+
+_HEADER = struct.Struct("<8sIIIII20s8Q")
+_U32 = struct.Struct("<I")
+_U32_PAIR = struct.Struct("<II")
+
+
+class SpellIndexError(ValueError):
+    """Fichier d'index absent, corrompu, d'une autre version ou d'un autre vocabulaire"""
+
+
+def vocabulary_fingerprint(domain_words, max_distance: int) -> bytes:
+    digest = hashlib.sha1(f"{max_distance}\n".encode("utf-8"))
+    for word in sorted(set(domain_words)):
+        digest.update(word.encode("utf-8") + b"\n")
+    return digest.digest()
+
+
+def write_spell_index(path: str, domain_words, lexicon_words=(), max_distance: int = 2) -> dict:
+    """Écrire l'index (remplacement atomique du fichier) ; retourne un résumé"""
+    domain_counts = Counter(word.lower() for word in domain_words if word)
+    lexicon = {word.lower() for word in lexicon_words if word}
+
+    words = sorted(set(domain_counts) | lexicon, key=lambda w: w.encode("utf-8"))
+    position = {word: i for i, word in enumerate(words)}
+
+    # Chaque mot métier est aussi sa propre variante : une seule recherche par variante à la lecture
+    postings = {}
+    for word in domain_counts:
+        for variant in _deletes(word, max_distance) | {word}:
+            postings.setdefault(variant, []).append(position[word])
+    keys = sorted(postings, key=lambda k: k.encode("utf-8"))
+
+    sections = [
+        *_string_table(words),
+        struct.pack(f"<{len(words)}I", *(min(domain_counts.get(w, 1), 0xFFFFFFFF) for w in words)),
+        bytes((DOMAIN if w in domain_counts else 0) | (LEXICON if w in lexicon else 0) for w in words),
+        *_string_table(keys),
+        *_posting_table([sorted(postings[key]) for key in keys]),
+    ]
+
+    offsets, cursor = [], _HEADER.size
+    for section in sections:
+        offsets.append(cursor)
+        cursor += len(section)
+
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, max_distance, len(words), len(domain_counts), len(keys),
+        vocabulary_fingerprint(domain_counts, max_distance), *offsets,
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for section in sections:
+            f.write(section)
+    os.replace(tmp_path, path)
+    return {"path": path, "words": len(words), "domain_words": len(domain_counts), "delete_keys": len(keys), "bytes": cursor}
+
+
+def _string_table(strings):
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets, cursor = [0], 0
+    for item in encoded:
+        cursor += len(item)
+        offsets.append(cursor)
+    return struct.pack(f"<{len(offsets)}I", *offsets), b"".join(encoded)
+
+
+def _posting_table(lists):
+    offsets, cursor = [0], 0
+    for items in lists:
+        cursor += len(items)
+        offsets.append(cursor)
+    flat = [i for items in lists for i in items]
+    return struct.pack(f"<{len(offsets)}I", *offsets), struct.pack(f"<{len(flat)}I", *flat)
+
+
+class MmapSpellIndex:
+    """Lecture zéro-copie de l'index ; même interface que SymSpellIndex + lexique"""
+
+    def __init__(self, path: str, expected_fingerprint: bytes = None):
+        self.path = path
+        try:
+            with open(path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SpellIndexError(f"Index de correction illisible : {path} ({e})") from e
+
+        if len(self._mm) < _HEADER.size:
+            raise SpellIndexError(f"Index de correction tronqué : {path}")
+        (magic, version, self.max_distance, self._n_words, self._n_domain, self._n_keys,
+         self.fingerprint, *offsets) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise SpellIndexError(f"Fichier qui n'est pas un index de correction : {path}")
+        if version != FORMAT_VERSION:
+            raise SpellIndexError(f"Version d'index {version} non supportée (attendue : {FORMAT_VERSION}), reconstruisez-le")
+        if expected_fingerprint is not None and self.fingerprint != expected_fingerprint:
+            raise SpellIndexError("Index de correction construit pour un autre vocabulaire métier, reconstruisez-le")
+        (self._word_offsets, self._word_data, self._word_freq, self._word_kind,
+         self._key_offsets, self._key_data, self._posting_offsets, self._postings) = offsets
+        kinds_end = self._word_kind + self._n_words
+        self.has_lexicon = any(self._mm.find(bytes([kind]), self._word_kind, kinds_end) >= 0 for kind in (LEXICON, LEXICON | DOMAIN))
+
+    def close(self):
+        self._mm.close()
+
+    def __len__(self):
+        return self._n_domain
+
+    def _string(self, offsets_at, data_at, i) -> bytes:
+        start, end = _U32_PAIR.unpack_from(self._mm, offsets_at + 4 * i)
+        return self._mm[data_at + start:data_at + end]
+
+    def _find(self, offsets_at, data_at, count, key: bytes) -> int:
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if self._string(offsets_at, data_at, middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < count and self._string(offsets_at, data_at, low) == key:
+            return low
+        return -1
+
+    def _word_index(self, word: str) -> int:
+        return self._find(self._word_offsets, self._word_data, self._n_words, word.encode("utf-8"))
+
+    def _kind(self, i) -> int:
+        return self._mm[self._word_kind + i]
+
+    def _freq(self, i) -> int:
+        return _U32.unpack_from(self._mm, self._word_freq + 4 * i)[0]
+
+    def __contains__(self, word):
+        i = self._word_index(word.lower())
+        return i >= 0 and bool(self._kind(i) & DOMAIN)
+
+    def is_lexicon_word(self, word: str) -> bool:
+        i = self._word_index(word.lower())
+        return i >= 0 and bool(self._kind(i) & LEXICON)
+
+    def _domain_candidates(self, variant: str):
+        key = self._find(self._key_offsets, self._key_data, self._n_keys, variant.encode("utf-8"))
+        if key < 0:
+            return ()
+        start, end = _U32_PAIR.unpack_from(self._mm, self._posting_offsets + 4 * key)
+        return struct.unpack_from(f"<{end - start}I", self._mm, self._postings + 4 * start)
+
+    def best_match(self, word: str, max_distance: int = None):
+        """(distance, -fréquence, mot) du meilleur mot métier, ou None"""
+        word = word.lower()
+        i = self._word_index(word)
+        if i >= 0 and self._kind(i) & DOMAIN:
+            return (0, -self._freq(i), word)
+        if max_distance is None:
+            max_distance = max_distance_for(word)
+        max_distance = min(max_distance, self.max_distance)
+        if max_distance == 0:
+            return None
+
+        candidates = set()
+        for variant in _deletes(word, max_distance) | {word}:
+            candidates.update(self._domain_candidates(variant))
+
+        best = None
+        for j in candidates:
+            candidate = self._string(self._word_offsets, self._word_data, j).decode("utf-8")
+            distance = edit_distance(word, candidate, max_distance)
+            if distance > max_distance:
+                continue
+            key = (distance, -self._freq(j), candidate)
+            if best is None or key < best:
+                best = key
+        return best
+
+    def lookup(self, word: str, max_distance: int = None):
+        match = self.best_match(word, max_distance)
+        return match[2] if match else None
@@ -0,0 +1,212 @@
+# backend/app/nlp/spelling.py
+
+"""
+Correction orthographique des messages utilisateur.
+
+Les mots sont corrigés vers le vocabulaire métier du chatbot (mots-clés
+d'intention, erreurs courantes, prénoms et noms des employés) grâce à un index
+"symmetric delete" (app/nlp/symspell.py). Un mot déjà connu, du vocabulaire
+métier ou du lexique français de pyspellchecker, est gardé tel quel sans
+aucune recherche. Un mot inconnu n'est remplacé que par un mot métier proche
+(distance tolérée selon sa longueur), jamais par un mot français quelconque.
+
+Le vocabulaire métier et le lexique sont lus dans un index préconstruit projeté
+en mémoire (SPELL_INDEX_PATH, voir app/nlp/spell_index.py) et partagé par
+tous les workers ; sans fichier à jour, le vocabulaire est construit en
+mémoire et le lexique vient de pyspellchecker. Les noms d'employés restent une
+surcouche en mémoire.
+
+Les corrections sont mémorisées par mot dans un cache LRU borné
+(SPELL_CACHE_SIZE), vidé quand le vocabulaire change.
+"""
+
+import logging
+import re
+import threading
+
+from app.config import Config
+from app.nlp.cache import LRUCache
+from app.nlp.intents import INTENT_KEYWORDS
+from app.nlp.spell_index import MmapSpellIndex, SpellIndexError, vocabulary_fingerprint
+from app.nlp.symspell import SymSpellIndex
+
+logger = logging.getLogger(__name__)
+
+DOMAIN_MAX_DISTANCE = 2
+
+# Mapping des erreurs courantes
+COMMON_MISTAKES = {
+    "email": "email",
+    "émail":"email",
+    "emil": "email",
+    "adresse mail": "email",
+    "prénom": "first name",
+    "nom": "last name",
+    "date de mise à jour": "updated at",
+    "ameil": "email",
+    "eml": "email",
+    "meil": "email",
+    "date mise a jour": "updated at",
+    "date mise à jour": "updated at",
+    "rle": "role",
+    "nm": "last name",
+    "prnom": "first name",
+    "prnm": "first name",
+    "mail": "email",
+    "logs": "logs",
+    "info user": "info user",
+"Hello":"Hello",
+"hello":"Hello",
+    "informations de l'user": "informations de l'user",
+  "bjr":"bonjour",
+    "user": "user",
+  "cc":"coucou",
+  "coucou":"coucou",
+    "info": "info",
+"cv":"ça va",   
+    "department": "department",
+    "rtt":"rtt",
+    "maj":"maj",
+    "cong":"cong",
+    "oman":"omar",
+    "bassine":"yassine",
+    "omar":"omar",
+    "rh":"rh",
+    "RH":"RH",
+    
+}
+
+# Ponctuation gardée telle quelle autour d'un mot ("congé ?" / "congé?")
+_WORD_PATTERN = re.compile(r"^([\"'(«]*)(.*?)([?!.,;:)»\"']*)$")
+
+
+def _vocabulary_words(texts):
+    for text in texts:
+        for word in text.lower().split():
+            word = _WORD_PATTERN.match(word).group(2)
+            if word:
+                yield word
+
+
+def domain_vocabulary():
+    """Mots des mots-clés d'intention et des corrections d'erreurs courantes"""
+    texts = [keyword for _, keywords in INTENT_KEYWORDS for keyword in keywords]
+    texts += list(COMMON_MISTAKES.values())
+    return list(_vocabulary_words(texts))
+
+
+def build_domain_index(names=()) -> SymSpellIndex:
+    index = SymSpellIndex(DOMAIN_MAX_DISTANCE)
+    index.add_words(domain_vocabulary())
+    index.add_words(_vocabulary_words(name for name in names if name))
+    return index
+
+
+def load_domain_index():
+    """Index métier partagé (mmap) s'il existe et correspond au vocabulaire, sinon construit en mémoire"""
+    fingerprint = vocabulary_fingerprint(domain_vocabulary(), DOMAIN_MAX_DISTANCE)
+    try:
+        return MmapSpellIndex(Config.SPELL_INDEX_PATH, fingerprint)
+    except SpellIndexError as e:
+        logger.info(f"{e} : vocabulaire de correction construit en mémoire")
+        return build_domain_index()
+
+
+DOMAIN_INDEX = load_domain_index()
+# Prénoms/noms des employés : surcouche en mémoire, propre à chaque processus
+NAMES_INDEX = SymSpellIndex(DOMAIN_MAX_DISTANCE)
+
+# Cache mot -> correction (None si le mot doit rester tel quel)
+SPELL_CACHE = LRUCache(Config.SPELL_CACHE_SIZE)
+
+_vocabulary_lock = threading.Lock()
+
+
+def add_proper_nouns(names) -> int:
+    """Ajouter des prénoms/noms d'employés au vocabulaire (incrémental)"""
+    with _vocabulary_lock:
+        added = NAMES_INDEX.add_words(_vocabulary_words(name for name in names if name))
+    if added:
+        SPELL_CACHE.clear()
+    return added
+
+
+def rebuild_domain_index(names=()):
+    """Recharger l'index métier (ex : après python -m app.nlp.build_spell_index) et remplacer les noms"""
+    global DOMAIN_INDEX, NAMES_INDEX
+    with _vocabulary_lock:
+        DOMAIN_INDEX = load_domain_index()
+        NAMES_INDEX = SymSpellIndex(DOMAIN_MAX_DISTANCE)
+        NAMES_INDEX.add_words(_vocabulary_words(name for name in names if name))
+    SPELL_CACHE.clear()
+    return DOMAIN_INDEX
+
+
+_spell = None
+_spell_lock = threading.Lock()
+
+
+def get_spell_checker():
+    """Correcteur français (lexique), chargé une seule fois"""
+    global _spell
+    if _spell is None:
+        with _spell_lock:
+            if _spell is None:
+                from spellchecker import SpellChecker
+
+                _spell = SpellChecker(language='fr')  # Utiliser le français
+    return _spell
+
+
+def is_french_word(word: str) -> bool:
+    """Appartenance au lexique français : index partagé s'il l'embarque, sinon pyspellchecker"""
+    index = DOMAIN_INDEX
+    if getattr(index, "has_lexicon", False):
+        return index.is_lexicon_word(word)
+    return word in get_spell_checker()
+
+
+def _correct_word(word: str):
+    """Correction d'un mot sans ponctuation, ou None s'il doit rester tel quel"""
+    if word in DOMAIN_INDEX or word in NAMES_INDEX or is_french_word(word):
+        return None
+    matches = [match for match in (DOMAIN_INDEX.best_match(word), NAMES_INDEX.best_match(word)) if match]
+    return min(matches)[2] if matches else None
+
+
+def correct_token(word: str) -> str:
+    """Forme corrigée d'un mot du message (ponctuation comprise)"""
+    # Vérifier si le mot est une erreur courante
+    if word.lower() in COMMON_MISTAKES:
+        return COMMON_MISTAKES[word.lower()]
+    # Vérifier si le mot est un nom propre (commence par une majuscule et est suivi de lettres minuscules)
+    if re.match(r'^[A-Z][a-z]*$', word):
+        return word
+    # Corriger le mot sans sa ponctuation (via le cache LRU)
+    prefix, core, suffix = _WORD_PATTERN.match(word).groups()
+    corrected_word = SPELL_CACHE.get_or_compute(core, _correct_word) if core else None
+    if corrected_word is not None:
+        return prefix + corrected_word + suffix
+    return word  # Garder le mot original si aucune correction n'est trouvée
+
+
+def correct_spelling(message: str):
+    return " ".join(correct_token(word) for word in message.split())
+
+
+def correct_spelling_batch(messages) -> list:
+    """Corriger une liste de messages en ne traitant chaque mot distinct qu'une fois"""
+    split_messages = [message.split() for message in messages]
+    corrections = {}
+    for words in split_messages:
+        for word in words:
+            if word not in corrections:
+                corrections[word] = correct_token(word)
+    return [" ".join(corrections[word] for word in words) for words in split_messages]
+
+
+def spell_cache_stats() -> dict:
+    stats = SPELL_CACHE.stats()
+    stats["domain_vocabulary"] = len(DOMAIN_INDEX) + len(NAMES_INDEX)
+    stats["domain_index"] = "mmap" if isinstance(DOMAIN_INDEX, MmapSpellIndex) else "memory"
+    return stats
@@ -0,0 +1,125 @@
+# backend/app/nlp/symspell.py
+
+"""
+Index de correction "symmetric delete" (à la SymSpell) sur un vocabulaire métier.
+
+Chaque mot du vocabulaire est indexé sous toutes ses variantes obtenues en
+supprimant jusqu'à max_distance caractères. À la recherche, on génère les
+suppressions du mot saisi et on ne calcule la distance d'édition que pour les
+mots qui partagent une variante : pas de génération de candidats par
+insertion/substitution sur tout l'alphabet comme pyspellchecker.
+"""
+
+import threading
+
+
+def max_distance_for(word: str) -> int:
+    """Distance tolérée selon la longueur : rien sous 4 lettres, 1 jusqu'à 5, 2 au-delà"""
+    if len(word) <= 3:
+        return 0
+    if len(word) <= 5:
+        return 1
+    return 2
+
+
+def _deletes(word: str, max_distance: int) -> set:
+    """Toutes les variantes du mot avec 1 à max_distance caractères supprimés"""
+    results = set()
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for variant in frontier:
+            if len(variant) <= 1:
+                continue
+            for i in range(len(variant)):
+                deleted = variant[:i] + variant[i + 1:]
+                if deleted not in results:
+                    results.add(deleted)
+                    next_frontier.add(deleted)
+        frontier = next_frontier
+    return results
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Distance de Damerau-Levenshtein (transpositions adjacentes), max_distance + 1 au-delà"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = current[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous_previous is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+            row_min = min(row_min, current[j])
+        if row_min > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class SymSpellIndex:
+    def __init__(self, max_distance: int = 2):
+        self.max_distance = max_distance
+        self._words = {}    # mot -> fréquence
+        self._deletes = {}  # variante -> frozenset des mots d'origine
+        self._lock = threading.Lock()
+
+    def __contains__(self, word):
+        return word.lower() in self._words
+
+    def __len__(self):
+        return len(self._words)
+
+    def add_word(self, word: str, count: int = 1) -> bool:
+        """Ajouter un mot (ou augmenter sa fréquence) ; True si le mot est nouveau"""
+        word = word.lower()
+        if not word:
+            return False
+        with self._lock:
+            if word in self._words:
+                self._words[word] += count
+                return False
+            self._words[word] = count
+            # Ensembles remplacés (jamais modifiés en place) : les lectures concurrentes restent sûres
+            for variant in _deletes(word, self.max_distance):
+                self._deletes[variant] = self._deletes.get(variant, frozenset()) | {word}
+            return True
+
+    def add_words(self, words) -> int:
+        return sum(self.add_word(word) for word in words)
+
+    def best_match(self, word: str, max_distance: int = None):
+        """(distance, -fréquence, mot) du mot du vocabulaire le plus proche, ou None"""
+        word = word.lower()
+        if word in self._words:
+            return (0, -self._words[word], word)
+        if max_distance is None:
+            max_distance = max_distance_for(word)
+        max_distance = min(max_distance, self.max_distance)
+        if max_distance == 0:
+            return None
+
+        candidates = set()
+        for variant in _deletes(word, max_distance) | {word}:
+            candidates.update(self._deletes.get(variant, ()))
+            if variant in self._words:
+                candidates.add(variant)
+
+        best = None
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, max_distance)
+            if distance > max_distance:
+                continue
+            key = (distance, -self._words[candidate], candidate)
+            if best is None or key < best:
+                best = key
+        return best
+
+    def lookup(self, word: str, max_distance: int = None):
+        """Mot du vocabulaire le plus proche (distance puis fréquence), ou None"""
+        match = self.best_match(word, max_distance)
+        return match[2] if match else None
@@ -1,6 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+from app.crud.demande_conge import MAX_PAGE_SIZE, PAGE_SIZE, list_demandes_page
 from app.database import get_db
 from app.models.demande_conge import DemandeConge
 from app.models.user import User
@@ -10,7 +14,19 @@ import os
 router = APIRouter()
 
 @router.get("/admin/demandes-conge")
-async def get_all_demandes_conge(request: Request, db: Session = Depends(get_db)):
+async def get_all_demandes_conge(
+    request: Request,
+    db: Session = Depends(get_db),
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    type_conge: Optional[str] = None,
+    department: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    include_total: bool = False
+):
+    """Demandes de congé, les plus récentes d'abord, par pages (next_cursor -> ?cursor=...)"""
     # Authentification basique par header (à adapter selon votre auth réelle)
     matricule = request.headers.get("X-User-Matricule")
     if not matricule:
@@ -18,10 +34,16 @@ async def get_all_demandes_conge(request: Request, db: Session = Depends(get_db)
     user = db.query(User).filter(User.matricule == matricule).first()
     if not user or user.department.upper() != "RH":
         raise HTTPException(status_code=403, detail="Accès réservé au département RH.")
-    demandes = db.query(DemandeConge).all()
+    try:
+        page = list_demandes_page(
+            db, limit=limit, cursor=cursor, status=status, type_conge=type_conge, department=department,
+            date_from=date_from, date_to=date_to, include_total=include_total
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     result = []
-    for d in demandes:
-        demandeur = db.query(User).filter(User.id == d.user_id).first()
+    for d in page.demandes:
+        demandeur = d.user
         result.append({
             "id": d.id,
             "user": {
@@ -37,7 +59,10 @@ async def get_all_demandes_conge(request: Request, db: Session = Depends(get_db)
             "created_at": d.created_at.strftime('%Y-%m-%d %H:%M'),
             "preuve": d.preuve
         })
-    return JSONResponse(content={"demandes": result})
+    content = {"demandes": result, "next_cursor": page.next_cursor}
+    if include_total:
+        content["total"] = page.total
+    return JSONResponse(content=content)
 
 @router.post("/admin/demandes-conge/{demande_id}/status")
 async def update_demande_status(demande_id: int, request: Request, db: Session = Depends(get_db)):
@@ -0,0 +1,27 @@
+import json
+from typing import List
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.nlp.batch import iter_classified
+
+router = APIRouter()
+
+
+class IntentBatchRequest(BaseModel):
+    messages: List[str]
+    correct: bool = True
+    batch_size: int = 1000
+
+
+@router.post("/intents/batch")
+def classify_intents_batch(request: IntentBatchRequest):
+    """Classer un lot de messages ; réponse en JSON lines, terminée par une ligne de synthèse"""
+    lines = iter_classified(request.messages, max(1, request.batch_size), correct=request.correct)
+    # Générateur synchrone : Starlette l'itère dans son pool de threads, hors de la boucle d'événements
+    return StreamingResponse(
+        (json.dumps(line, ensure_ascii=False) + "\n" for line in lines),
+        media_type="application/x-ndjson",
+    )
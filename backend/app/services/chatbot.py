@@ -1,3 +1,4 @@
+from datetime import datetime
 from sqlalchemy.orm import Session
 from models.chat_logs import ChatLog
 from models.instruction import Instruction
@@ -25,7 +26,7 @@ def handle_message(db: Session, user_matricule: str, message: str):
         return "Utilisateur non trouvé."
 
     # Log de l'interaction avec l'utilisateur
-    chat_log = ChatLog(user_id=user.id, message=message, sender="user", timestamp="2025-03-12 14:43:58")
+    chat_log = ChatLog(user_id=user.id, message=message, sender="user", timestamp=datetime.now())
     db.add(chat_log)
     db.commit()
 
@@ -0,0 +1,135 @@
+# backend/app/services/executors.py
+
+"""
+Exécution du travail bloquant hors de la boucle d'événements.
+
+Les endpoints async def ne doivent ni écrire de fichier ni calculer
+directement : pendant ce temps aucune autre requête n'est servie. Deux pools
+de threads bornés séparent les deux natures de travail :
+
+- "io"  : écritures de fichiers (preuves envoyées, CSV, rapports) ;
+- "cpu" : correction orthographique, détection d'intention, génération GPT-2.
+
+Un gros envoi de fichier n'occupe donc jamais les threads de calcul, et une
+génération GPT-2 ne retarde pas les écritures. Le pool "cpu" reste petit :
+torch et les extensions natives libèrent le GIL, le Python pur non.
+
+Chaque pool compte les tâches en attente et en cours et mesure l'attente avant
+exécution (queue_wait) et la durée d'exécution (run) pour /metrics. La tâche
+s'exécute dans une copie du contexte de l'appelant (contextvars) : le compteur
+de requêtes SQL de la requête HTTP en cours voit aussi ses requêtes.
+
+    await run_io(sauvegarder_rapport, data, "conges", user.id)
+    nm = await run_cpu(NormalizedMessage, message, correct_spelling)
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import Config
+from app.services.metrics import LatencyWindow
+
+
+class InstrumentedExecutor:
+    """Pool de threads borné avec profondeur de file et latences"""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-executor")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.errors = 0
+        self.queue_wait = LatencyWindow()
+        self.run_duration = LatencyWindow()
+
+    def _call(self, fn, submitted_at):
+        started = time.perf_counter()
+        self.queue_wait.add((started - submitted_at) * 1000)
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return fn()
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            self.run_duration.add((time.perf_counter() - started) * 1000)
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    async def run(self, fn, *args, **kwargs):
+        """Exécuter fn(*args, **kwargs) dans le pool et attendre son résultat"""
+        with self._lock:
+            self.queued += 1
+        task = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        call = functools.partial(self._call, task, time.perf_counter())
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, call)
+        except RuntimeError:
+            # Pool déjà arrêté : la tâche n'a pas été soumise
+            with self._lock:
+                self.queued -= 1
+            raise
+        return await future
+
+    def stats(self) -> dict:
+        with self._lock:
+            queued, running, completed, errors = self.queued, self.running, self.completed, self.errors
+        return {
+            "max_workers": self.max_workers,
+            "queue_depth": queued,
+            "running": running,
+            "completed": completed,
+            "errors": errors,
+            "queue_wait": self.queue_wait.snapshot(),
+            "run": self.run_duration.snapshot(),
+        }
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+_executors = {}
+_executors_lock = threading.Lock()
+_SIZES = {"io": lambda: Config.IO_EXECUTOR_WORKERS, "cpu": lambda: Config.CPU_EXECUTOR_WORKERS}
+
+
+def get_executor(name: str) -> InstrumentedExecutor:
+    """Pool "io" ou "cpu", créé au premier usage"""
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = _executors[name] = InstrumentedExecutor(name, _SIZES[name]())
+    return executor
+
+
+async def run_io(fn, *args, **kwargs):
+    return await get_executor("io").run(fn, *args, **kwargs)
+
+
+async def run_cpu(fn, *args, **kwargs):
+    return await get_executor("cpu").run(fn, *args, **kwargs)
+
+
+def executor_stats() -> dict:
+    return {name: get_executor(name).stats() for name in _SIZES}
+
+
+def shutdown_executors():
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=True)
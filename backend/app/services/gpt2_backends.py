@@ -0,0 +1,297 @@
+# backend/app/services/gpt2_backends.py
+
+"""
+Backends d'inférence CPU pour GPT-2 (variable GPT2_BACKEND) :
+
+- "float32"     : modèle eager d'origine ;
+- "int8"        : modèle quantifié dynamiquement en int8 (couches linéaires) ;
+- "torchscript" : graphe TorchScript à cache clés/valeurs exporté hors ligne
+                  depuis les poids en cache local (voir la commande d'export
+                  ci-dessous) ;
+- "stub"        : réponse fixe après GPT2_STUB_LATENCY_MS, sans torch ni
+                  poids (tests de charge, CI).
+
+Tous les backends exposent generate_batch(messages) -> list[str] avec les mêmes
+paramètres de génération (glouton, max_length=150, no_repeat_ngram_size=2).
+
+Export du graphe TorchScript (depuis backend/, sans accès réseau) :
+    python -m app.services.gpt2_backends export [--output chemin.pt]
+"""
+
+import argparse
+import logging
+import os
+import time
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+MAX_LENGTH = 150
+NO_REPEAT_NGRAM_SIZE = 2
+
+
+def _load_tokenizer(local_files_only: bool = False):
+    from transformers import GPT2Tokenizer
+
+    tokenizer = GPT2Tokenizer.from_pretrained("gpt2", local_files_only=local_files_only)
+    tokenizer.pad_token = tokenizer.eos_token
+    return tokenizer
+
+
+class EagerGPT2Backend:
+    """Modèle transformers exécuté tel quel (float32 ou quantifié)"""
+
+    def __init__(self, name, torch, tokenizer, model):
+        self.name = name
+        self.torch = torch
+        self.tokenizer = tokenizer
+        self.model = model
+
+    def generate_batch(self, messages: list) -> list:
+        torch, tokenizer, model = self.torch, self.tokenizer, self.model
+        if len(messages) == 1:
+            inputs = tokenizer.encode(messages[0], return_tensors="pt", truncation=True, padding=True)
+            attention_mask = torch.ones(inputs.shape, device=inputs.device)
+        else:
+            # GPT-2 est un décodeur : le padding doit être à gauche pour que la génération
+            # reprenne juste après le dernier vrai token de chaque prompt
+            tokenizer.padding_side = "left"
+            batch = tokenizer(messages, return_tensors="pt", truncation=True, padding=True)
+            inputs, attention_mask = batch["input_ids"], batch["attention_mask"]
+
+        with torch.no_grad():
+            outputs = model.generate(inputs, attention_mask=attention_mask, max_length=MAX_LENGTH, num_return_sequences=1, no_repeat_ngram_size=NO_REPEAT_NGRAM_SIZE, pad_token_id=tokenizer.eos_token_id)
+
+        return [tokenizer.decode(output, skip_special_tokens=True).strip() for output in outputs]
+
+
+class TorchScriptGPT2Backend:
+    """Graphe TorchScript à cache clés/valeurs piloté par une boucle de décodage gloutonne
+
+    Le cache (past) est alloué une fois pour MAX_LENGTH tokens et rempli en place
+    par le graphe : le prompt est traité une seule fois, puis chaque étape ne
+    calcule que le nouveau token (coût linéaire en longueur au lieu de quadratique).
+    """
+
+    name = "torchscript"
+
+    def __init__(self, torch, tokenizer, module):
+        self.torch = torch
+        self.tokenizer = tokenizer
+        self.module = module
+        self.past_shape = tuple(int(d) for d in module.past_shape)  # (n_layer, 2, n_head, head_dim)
+
+    def generate_batch(self, messages: list) -> list:
+        torch, tokenizer = self.torch, self.tokenizer
+        tokenizer.padding_side = "left"
+        batch = tokenizer(messages, return_tensors="pt", truncation=True, padding=True)
+        input_ids, attention_mask = batch["input_ids"], batch["attention_mask"]
+        n_layer, n_kv, n_head, head_dim = self.past_shape
+        past = torch.zeros(n_layer, n_kv, input_ids.shape[0], n_head, max(MAX_LENGTH, input_ids.shape[1]), head_dim)
+        # Positions calculées depuis le masque, comme generate() avec un padding à gauche
+        position_ids = (attention_mask.cumsum(-1) - 1).clamp(min=0)
+        sequences = input_ids.tolist()
+        finished = torch.zeros(input_ids.shape[0], dtype=torch.bool)
+
+        with torch.no_grad():
+            while len(sequences[0]) < MAX_LENGTH and not bool(finished.all()):
+                logits = self.module(input_ids, attention_mask, position_ids, past)
+                for row, banned in enumerate(_banned_tokens(sequences, NO_REPEAT_NGRAM_SIZE)):
+                    if banned:
+                        logits[row, list(banned)] = float("-inf")
+                next_tokens = logits.argmax(dim=-1)
+                next_tokens = torch.where(finished, torch.full_like(next_tokens, tokenizer.eos_token_id), next_tokens)
+                finished |= next_tokens == tokenizer.eos_token_id
+                for sequence, token in zip(sequences, next_tokens.tolist()):
+                    sequence.append(token)
+                # Étape suivante : uniquement le nouveau token, le reste est dans le cache
+                input_ids = next_tokens[:, None]
+                position_ids = position_ids[:, -1:] + 1
+                attention_mask = torch.cat([attention_mask, torch.ones_like(input_ids)], dim=-1)
+
+        return [tokenizer.decode(sequence, skip_special_tokens=True).strip() for sequence in sequences]
+
+
+def _banned_tokens(sequences, ngram_size):
+    """Tokens interdits à la prochaine étape pour ne pas répéter un n-gramme déjà vu"""
+    banned = []
+    for tokens in sequences:
+        if len(tokens) < ngram_size:
+            banned.append(set())
+            continue
+        prefix = tuple(tokens[len(tokens) - ngram_size + 1:])
+        seen = set()
+        for i in range(len(tokens) - ngram_size + 1):
+            if tuple(tokens[i:i + ngram_size - 1]) == prefix:
+                seen.add(tokens[i + ngram_size - 1])
+        banned.append(seen)
+    return banned
+
+
+def _conv1d_to_linear(torch, model):
+    """Remplacer les Conv1D de GPT-2 par des nn.Linear équivalents (quantifiables)"""
+    from transformers.pytorch_utils import Conv1D
+
+    for module in list(model.modules()):
+        for child_name, child in list(module.named_children()):
+            if isinstance(child, Conv1D):
+                in_features, out_features = child.weight.shape
+                linear = torch.nn.Linear(in_features, out_features)
+                linear.weight.data = child.weight.data.t().contiguous()
+                linear.bias.data = child.bias.data.clone()
+                setattr(module, child_name, linear)
+    return model
+
+
+def load_float32():
+    import torch
+    from transformers import GPT2LMHeadModel
+
+    model = GPT2LMHeadModel.from_pretrained("gpt2").eval()
+    return EagerGPT2Backend("float32", torch, _load_tokenizer(), model)
+
+
+def load_int8():
+    import torch
+    from transformers import GPT2LMHeadModel
+
+    model = _conv1d_to_linear(torch, GPT2LMHeadModel.from_pretrained("gpt2").eval())
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return EagerGPT2Backend("int8", torch, _load_tokenizer(), model)
+
+
+def load_torchscript(path: str = None):
+    import torch
+
+    path = path or Config.GPT2_TORCHSCRIPT_PATH
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"Graphe TorchScript introuvable : {path}. "
+            "Exportez-le avec : python -m app.services.gpt2_backends export"
+        )
+    module = torch.jit.load(path, map_location="cpu").eval()
+    return TorchScriptGPT2Backend(torch, _load_tokenizer(), module)
+
+
+class StubGPT2Backend:
+    """Remplaçant sans modèle : latence simulée par lot, texte déterministe"""
+
+    name = "stub"
+
+    def __init__(self, latency_ms: float = None):
+        self.latency_ms = Config.GPT2_STUB_LATENCY_MS if latency_ms is None else latency_ms
+
+    def generate_batch(self, messages: list) -> list:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return [f"Réponse générée pour : {message}" for message in messages]
+
+
+def load_stub():
+    return StubGPT2Backend()
+
+
+GPT2_BACKENDS = {
+    "float32": load_float32,
+    "int8": load_int8,
+    "torchscript": load_torchscript,
+    "stub": load_stub,
+}
+
+
+def load_backend(name: str = None):
+    name = name or Config.GPT2_BACKEND
+    if name not in GPT2_BACKENDS:
+        raise ValueError(f"GPT2_BACKEND inconnu : {name} (attendu : {', '.join(GPT2_BACKENDS)})")
+    logger.info(f"Chargement du backend GPT-2 '{name}'...")
+    return GPT2_BACKENDS[name]()
+
+
+def _gpt2_step_module(torch, model):
+    """Module GPT-2 à cache clés/valeurs écrit en opérations torch simples (traçable)
+
+    forward(input_ids, attention_mask, position_ids, past) -> logits du dernier
+    token. past, de forme (n_layer, 2, batch, n_head, capacité, head_dim), est
+    rempli en place : les tokens d'entrée occupent les positions
+    [len(attention_mask) - len(input_ids), len(attention_mask)). Les poids sont
+    ceux de GPT2LMHeadModel ; le masque causal de transformers n'est pas traçable.
+    """
+    from torch.nn import functional as F
+
+    config = model.config
+    transformer = model.transformer
+
+    class GPT2Step(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.wte, self.wpe, self.h, self.ln_f = transformer.wte, transformer.wpe, transformer.h, transformer.ln_f
+            self.n_head = config.n_head
+            self.head_dim = config.n_embd // config.n_head
+            self.register_buffer("past_shape", torch.tensor([config.n_layer, 2, self.n_head, self.head_dim]))
+
+        def _heads(self, x):
+            return x.view(x.shape[0], x.shape[1], self.n_head, self.head_dim).transpose(1, 2)
+
+        def forward(self, input_ids, attention_mask, position_ids, past):
+            hidden = self.wte(input_ids) + self.wpe(position_ids)
+            query_length, key_length = input_ids.shape[1], attention_mask.shape[1]
+            # Causal + padding : la requête i (position absolue past+i) voit les clés j <= past+i non masquées
+            query_index = torch.arange(query_length)[:, None] + (key_length - query_length)
+            allowed = (torch.arange(key_length)[None, :] <= query_index)[None, None] & attention_mask[:, None, None, :].bool()
+            mask = torch.zeros(allowed.shape, dtype=hidden.dtype).masked_fill(~allowed, torch.finfo(hidden.dtype).min)
+
+            start = key_length - query_length
+            for layer, block in enumerate(self.h):
+                q, k, v = block.attn.c_attn(block.ln_1(hidden)).split(config.n_embd, dim=2)
+                past[layer, 0, :, :, start:key_length] = self._heads(k)
+                past[layer, 1, :, :, start:key_length] = self._heads(v)
+                k, v = past[layer, 0, :, :, :key_length], past[layer, 1, :, :, :key_length]
+                attn = F.scaled_dot_product_attention(self._heads(q), k, v, attn_mask=mask)
+                attn = attn.transpose(1, 2).reshape(hidden.shape)
+                hidden = hidden + block.attn.c_proj(attn)
+                hidden = hidden + block.mlp.c_proj(F.gelu(block.mlp.c_fc(block.ln_2(hidden)), approximate="tanh"))
+
+            return F.linear(self.ln_f(hidden[:, -1, :]), self.wte.weight)
+
+    return GPT2Step()
+
+
+def export_torchscript(output: str = None) -> str:
+    """Tracer GPT-2 avec cache (poids en cache local uniquement) et sauvegarder le graphe"""
+    import torch
+    from transformers import GPT2LMHeadModel
+
+    output = output or Config.GPT2_TORCHSCRIPT_PATH
+    model = GPT2LMHeadModel.from_pretrained("gpt2", local_files_only=True).eval()
+    step = _gpt2_step_module(torch, model).eval()
+
+    tokenizer = _load_tokenizer(local_files_only=True)
+    tokenizer.padding_side = "left"
+    example = tokenizer(["Bonjour, comment poser un congé ?", "Merci"], return_tensors="pt", padding=True)
+    position_ids = (example["attention_mask"].cumsum(-1) - 1).clamp(min=0)
+    n_layer, n_kv, n_head, head_dim = step.past_shape.tolist()
+    past = torch.zeros(n_layer, n_kv, 2, n_head, MAX_LENGTH, head_dim)
+
+    with torch.no_grad():
+        # Trace sur une étape après le prompt : le même graphe sert au prompt (start = 0)
+        step(example["input_ids"], example["attention_mask"], position_ids, past)
+        attention_mask = torch.cat([example["attention_mask"], torch.ones(2, 1, dtype=torch.long)], dim=-1)
+        traced = torch.jit.trace(step, (example["input_ids"][:, -1:], attention_mask, position_ids[:, -1:] + 1, past))
+    traced = torch.jit.freeze(traced.eval(), preserved_attrs=["past_shape"])
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    traced.save(output)
+    return output
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Outils des backends GPT-2")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="exporter le graphe TorchScript hors ligne")
+    export_parser.add_argument("--output", default=Config.GPT2_TORCHSCRIPT_PATH)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        path = export_torchscript(args.output)
+        print(f"✅ Graphe TorchScript exporté : {path}")
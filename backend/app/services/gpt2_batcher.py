@@ -0,0 +1,119 @@
+# backend/app/services/gpt2_batcher.py
+
+"""
+Ordonnanceur de micro-lots pour les générations GPT-2.
+
+Les prompts reçus par les requêtes concurrentes sont regroupés pendant une
+courte fenêtre (GPT2_BATCH_WAIT_MS) ou jusqu'à GPT2_BATCH_MAX_SIZE prompts,
+puis générés en un seul appel au worker. Chaque requête récupère ensuite sa
+propre réponse. Un seul lot est en cours à la fois : pendant qu'il tourne, les
+nouveaux prompts s'accumulent pour le lot suivant.
+"""
+
+import asyncio
+import threading
+import time
+from collections import Counter
+
+from app.config import Config
+from app.services.executors import run_cpu
+from app.services.inference_worker import get_inference_worker
+from app.services.metrics import LatencyWindow
+
+
+class GPT2BatchScheduler:
+    def __init__(self, worker=None, max_batch_size: int = Config.GPT2_BATCH_MAX_SIZE, max_wait_ms: float = Config.GPT2_BATCH_WAIT_MS):
+        self._worker = worker
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue = None
+        self._dispatcher = None
+        self._loop = None
+        # Métriques
+        self.batch_sizes = Counter()
+        self.queue_wait = LatencyWindow()
+        self.batch_duration = LatencyWindow()
+        self.errors = 0
+
+    @property
+    def worker(self):
+        return self._worker or get_inference_worker()
+
+    def _ensure_dispatcher(self):
+        loop = asyncio.get_running_loop()
+        if self._dispatcher is None or self._dispatcher.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._dispatcher = loop.create_task(self._dispatch())
+
+    async def generate(self, message: str) -> str:
+        """Soumettre un prompt et attendre sa réponse"""
+        self._ensure_dispatcher()
+        future = self._loop.create_future()
+        await self._queue.put((message, future, time.perf_counter()))
+        return await future
+
+    async def _dispatch(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = self._loop.time() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._run_batch(batch)
+
+    async def _run_batch(self, batch):
+        started = time.perf_counter()
+        for _, _, enqueued_at in batch:
+            self.queue_wait.add((started - enqueued_at) * 1000)
+        self.batch_sizes[len(batch)] += 1
+        try:
+            replies = await run_cpu(self.worker.generate_batch, [message for message, _, _ in batch])
+        except Exception as e:
+            self.errors += 1
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.batch_duration.add((time.perf_counter() - started) * 1000)
+        for (_, future, _), reply in zip(batch, replies):
+            if not future.done():
+                future.set_result(reply)
+
+    def stats(self) -> dict:
+        total_batches = sum(self.batch_sizes.values())
+        total_prompts = sum(size * count for size, count in self.batch_sizes.items())
+        return {
+            "worker_mode": self.worker.mode,
+            "backend": Config.GPT2_BACKEND,
+            "worker_loaded": self.worker.is_loaded,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "batches": total_batches,
+            "prompts": total_prompts,
+            "mean_batch_size": round(total_prompts / total_batches, 2) if total_batches else None,
+            "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+            "queue_wait": self.queue_wait.snapshot(),
+            "batch_duration": self.batch_duration.snapshot(),
+            "errors": self.errors,
+        }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_gpt2_scheduler() -> GPT2BatchScheduler:
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = GPT2BatchScheduler()
+    return _scheduler
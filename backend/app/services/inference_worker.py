@@ -0,0 +1,246 @@
+# backend/app/services/inference_worker.py
+
+"""
+Worker d'inférence GPT-2.
+
+Le modèle n'est plus chargé à l'import de app.main : chaque worker uvicorn,
+chaque test et chaque script démarre sans payer le chargement de torch et des
+poids. Deux modes sont disponibles (variable GPT2_WORKER_MODE) :
+
+- "lazy"    : le modèle est chargé dans le processus API au premier appel ;
+- "process" : le modèle vit dans un processus dédié, l'API lui envoie les
+              prompts par une file multiprocessing locale.
+
+Le backend de calcul (float32, int8, torchscript) est choisi par GPT2_BACKEND,
+voir app/services/gpt2_backends.py.
+"""
+
+import itertools
+import logging
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Future
+
+from app.config import Config
+from app.services.gpt2_backends import load_backend
+
+logger = logging.getLogger(__name__)
+
+
+class LazyGPT2Worker:
+    """Charge GPT-2 dans le processus courant au premier appel de generate()"""
+
+    mode = "lazy"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded is not None
+
+    def start(self):
+        if self._loaded is None:
+            with self._lock:
+                if self._loaded is None:
+                    logger.info("Chargement de GPT-2 dans le processus API...")
+                    self._loaded = load_backend()
+        return self
+
+    def generate(self, message: str) -> str:
+        return self.generate_batch([message])[0]
+
+    def generate_batch(self, messages: list) -> list:
+        return self.start()._loaded.generate_batch(messages)
+
+    def shutdown(self):
+        self._loaded = None
+
+
+def _worker_main(requests_queue, responses_queue):
+    """Boucle du processus worker : un lot de prompts en entrée, un lot de réponses en sortie"""
+    try:
+        backend = load_backend()
+    except Exception as e:
+        responses_queue.put(("ready", None, repr(e)))
+        return
+    responses_queue.put(("ready", None, None))
+    while True:
+        item = requests_queue.get()
+        if item is None:
+            break
+        request_id, messages = item
+        try:
+            responses_queue.put((request_id, backend.generate_batch(messages), None))
+        except Exception as e:
+            responses_queue.put((request_id, None, repr(e)))
+
+
+class ProcessGPT2Worker:
+    """Exécute GPT-2 dans un processus séparé, l'API ne charge jamais torch"""
+
+    mode = "process"
+
+    # Intervalle de vérification que le processus worker est toujours vivant
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, timeout: float = Config.GPT2_TIMEOUT):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._ctx = multiprocessing.get_context("spawn")
+        self._process = None
+        self._requests = None
+        self._responses = None
+        self._reader = None
+        self._ready = threading.Event()
+        self._pending = {}
+        self._ids = itertools.count(1)
+        self._load_error = None  # échec du chargement : pas de relance à chaque requête
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._ready.is_set()
+
+    @property
+    def pid(self):
+        return self._process.pid if self._process else None
+
+    def start(self):
+        with self._lock:
+            if self._load_error is not None:
+                raise RuntimeError(f"Chargement de GPT-2 impossible dans le worker : {self._load_error}")
+            if self._process is not None and self._process.is_alive():
+                return self
+            self._requests = self._ctx.Queue()
+            self._responses = self._ctx.Queue()
+            self._ready.clear()
+            self._pending = {}  # requêtes du nouveau processus : l'ancien lecteur ne peut plus les faire échouer
+            self._process = self._ctx.Process(
+                target=_worker_main,
+                args=(self._requests, self._responses),
+                name="gpt2-worker",
+                daemon=True
+            )
+            self._process.start()
+            self._reader = threading.Thread(
+                target=self._read_responses, args=(self._process, self._responses, self._pending),
+                name="gpt2-worker-reader", daemon=True
+            )
+            self._reader.start()
+            logger.info(f"Processus worker GPT-2 démarré (pid {self._process.pid})")
+        return self
+
+    @staticmethod
+    def _fail_pending(pending: dict, message: str):
+        """Faire échouer toutes les requêtes en attente au lieu de laisser expirer GPT2_TIMEOUT"""
+        while pending:
+            try:
+                _, future = pending.popitem()
+            except KeyError:
+                break
+            if not future.done():
+                future.set_exception(RuntimeError(message))
+
+    def _read_responses(self, process, responses, pending):
+        while True:
+            try:
+                request_id, response, error = responses.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                if process.is_alive():
+                    continue
+                logger.error(f"Processus worker GPT-2 arrêté (pid {process.pid}, code {process.exitcode})")
+                self._fail_pending(pending, f"Processus worker GPT-2 arrêté (code {process.exitcode})")
+                break
+            except (EOFError, OSError):
+                break
+            if request_id == "ready":
+                if error:
+                    logger.error(f"Chargement de GPT-2 impossible dans le worker : {error}")
+                    self._load_error = error
+                    self._fail_pending(pending, f"Chargement de GPT-2 impossible dans le worker : {error}")
+                    break
+                self._ready.set()
+                continue
+            if request_id is None:
+                break
+            future = pending.pop(request_id, None)
+            if future is None:
+                continue
+            if error:
+                future.set_exception(RuntimeError(f"Erreur du worker GPT-2 : {error}"))
+            else:
+                future.set_result(response)
+
+    def _submit(self, messages: list):
+        self.start()
+        request_id = next(self._ids)
+        future = Future()
+        pending = self._pending
+        pending[request_id] = future
+        self._requests.put((request_id, list(messages)))
+        if self._load_error is not None or not self._process.is_alive():
+            # Lecteur déjà arrêté entre start() et l'enregistrement de la requête
+            self._fail_pending(pending, "Processus worker GPT-2 indisponible")
+        return request_id, future, pending
+
+    def submit(self, messages: list) -> Future:
+        return self._submit(messages)[1]
+
+    def generate(self, message: str) -> str:
+        return self.generate_batch([message])[0]
+
+    def generate_batch(self, messages: list) -> list:
+        request_id, future, pending = self._submit(messages)
+        try:
+            return future.result(timeout=self.timeout)
+        finally:
+            # Délai dépassé : l'entrée est retirée, la réponse tardive du worker sera ignorée
+            pending.pop(request_id, None)
+
+    def shutdown(self):
+        with self._lock:
+            if self._process is None:
+                return
+            self._requests.put(None)
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._responses.put((None, None, None))
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+            self._process = None
+            self._ready.clear()
+            self._load_error = None
+
+
+WORKER_MODES = {
+    "lazy": LazyGPT2Worker,
+    "process": ProcessGPT2Worker,
+}
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_inference_worker():
+    """Retourner le worker GPT-2 du processus, créé selon Config.GPT2_WORKER_MODE"""
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                mode = Config.GPT2_WORKER_MODE
+                if mode not in WORKER_MODES:
+                    raise ValueError(f"GPT2_WORKER_MODE inconnu : {mode} (attendu : {', '.join(WORKER_MODES)})")
+                _worker = WORKER_MODES[mode]()
+    return _worker
+
+
+def shutdown_inference_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is not None:
+            _worker.shutdown()
+            _worker = None
@@ -0,0 +1,50 @@
+# backend/app/services/metrics.py
+
+"""
+Petits outils de métriques en mémoire, exposés par l'endpoint /metrics.
+"""
+
+import math
+import threading
+from collections import deque
+
+
+def percentile(sorted_values, pct: float):
+    """Percentile (méthode du rang le plus proche) d'une liste déjà triée"""
+    if not sorted_values:
+        return None
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[min(len(sorted_values), max(rank, 1)) - 1]
+
+
+class LatencyWindow:
+    """Fenêtre glissante des N dernières mesures (en millisecondes)"""
+
+    def __init__(self, size: int = 1000):
+        self._values = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value_ms: float):
+        with self._lock:
+            self._values.append(value_ms)
+            self.count += 1
+            self.total += value_ms
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            values = sorted(self._values)
+            count, total = self.count, self.total
+        return {
+            "count": count,
+            "mean_ms": round(total / count, 3) if count else None,
+            "p50_ms": _round(percentile(values, 50)),
+            "p95_ms": _round(percentile(values, 95)),
+            "p99_ms": _round(percentile(values, 99)),
+            "max_ms": _round(values[-1] if values else None),
+        }
+
+
+def _round(value):
+    return round(value, 3) if value is not None else None
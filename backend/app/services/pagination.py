@@ -0,0 +1,32 @@
+# backend/app/services/pagination.py
+
+"""
+Curseurs opaques pour la pagination par clé (keyset).
+
+Une page se termine sur une ligne ; le curseur encode les valeurs de la clé
+de tri de cette ligne (par exemple created_at et id) et la page suivante
+reprend strictement après elles : WHERE (created_at, id) < (:c, :i). Le coût
+d'une page ne dépend pas de sa position, contrairement à OFFSET.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(*values) -> str:
+    """Curseur base64url des valeurs de la clé de tri (datetime en ISO 8601)"""
+    payload = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Valeurs d'un curseur produit par encode_cursor ; ValueError si le curseur est invalide"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        values = [datetime.fromisoformat(v["dt"]) if isinstance(v, dict) else v for v in payload]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Curseur invalide : {cursor!r}") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError(f"Curseur invalide : {cursor!r}")
+    return values
@@ -0,0 +1,57 @@
+# backend/app/services/pool_metrics.py
+
+"""
+Pool de connexions SQLAlchemy instrumenté.
+
+InstrumentedQueuePool est un QueuePool qui mesure l'attente de chaque
+checkout (temps passé à attendre une connexion libre, ouverture comprise) et
+compte les checkouts abandonnés sur pool_timeout. pool_stats() donne l'état
+courant (connexions utilisées, au repos, débordement) pour /metrics : un pool
+trop petit se voit à l'attente p95 et au nombre de timeouts.
+"""
+
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+from app.services.metrics import LatencyWindow
+
+
+class InstrumentedQueuePool(QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = LatencyWindow()
+        self._timeouts_lock = threading.Lock()
+        self.timeouts = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._timeouts_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            self.checkout_wait.add((time.perf_counter() - started) * 1000)
+
+
+def pool_stats(pool) -> dict:
+    """État du pool : taille, connexions utilisées / au repos, débordement, attente au checkout"""
+    stats = {"pool": type(pool).__name__}
+    if not isinstance(pool, QueuePool):
+        return stats
+    stats.update({
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "timeout_s": pool._timeout,
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    })
+    if isinstance(pool, InstrumentedQueuePool):
+        stats["checkout_wait"] = pool.checkout_wait.snapshot()
+        stats["timeouts"] = pool.timeouts
+    return stats
@@ -0,0 +1,12 @@
+# backend/app/services/report_format.py
+
+"""
+Mise en forme texte des rapports et statistiques RH (sans dépendance lourde).
+"""
+
+
+def create_progress_bar(percentage: float, width: int = 20) -> str:
+    """Barre de progression verte, ex : 🟩🟩🟩⬜⬜ 60.0%"""
+    percentage = max(0.0, min(100.0, float(percentage)))
+    filled = round(width * percentage / 100)
+    return "🟩" * filled + "⬜" * (width - filled) + f" {percentage:.1f}%"
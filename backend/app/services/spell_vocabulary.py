@@ -0,0 +1,30 @@
+# backend/app/services/spell_vocabulary.py
+
+"""
+Alimentation du vocabulaire de correction avec les prénoms et noms des employés.
+
+Les noms sont chargés depuis la table users au démarrage, puis ajoutés au fil
+de l'eau quand un utilisateur est créé ou modifié (événements SQLAlchemy).
+"""
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.nlp.spelling import add_proper_nouns
+
+
+def load_user_names(db: Session) -> int:
+    """Charger tous les prénoms/noms connus ; retourne le nombre de mots ajoutés"""
+    rows = db.query(User.first_name, User.last_name).all()
+    return add_proper_nouns(name for row in rows for name in row)
+
+
+def _on_user_saved(mapper, connection, target):
+    add_proper_nouns([target.first_name, target.last_name])
+
+
+def register_user_listeners():
+    for event_name in ("after_insert", "after_update"):
+        if not event.contains(User, event_name, _on_user_saved):
+            event.listen(User, event_name, _on_user_saved)
@@ -0,0 +1,107 @@
+# backend/app/services/sql_metrics.py
+
+"""
+Nombre de requêtes SQL exécutées par requête HTTP.
+
+Un écouteur "before_cursor_execute" sur l'engine incrémente le compteur de la
+requête HTTP en cours (porté par une ContextVar, donc visible aussi depuis les
+dépendances exécutées dans le pool de threads). Le middleware ajoute l'en-tête
+X-SQL-Queries à chaque réponse et cumule les totaux par route, exposés par
+/metrics : les N+1 et les requêtes répétées se voient sans profiler.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+SQL_QUERIES_HEADER = "X-SQL-Queries"
+
+_current_counter = ContextVar("sql_query_counter", default=None)
+
+
+class QueryCounter:
+    __slots__ = ("count",)
+
+    def __init__(self):
+        self.count = 0
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.count += 1
+
+
+def install_query_counter(engine):
+    """Brancher le comptage sur l'engine (sans effet s'il l'est déjà)"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+@contextmanager
+def count_queries():
+    """Compter les requêtes SQL exécutées dans le bloc (et les tâches qu'il lance)"""
+    counter = QueryCounter()
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+class SQLQueryStats:
+    """Totaux par route : requêtes HTTP, requêtes SQL (total, max), durée cumulée"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route: str, queries: int, elapsed_ms: float):
+        with self._lock:
+            stats = self._routes.setdefault(route, {"requests": 0, "queries": 0, "max_queries": 0, "total_ms": 0.0})
+            stats["requests"] += 1
+            stats["queries"] += queries
+            stats["max_queries"] = max(stats["max_queries"], queries)
+            stats["total_ms"] += elapsed_ms
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            routes = {route: dict(stats) for route, stats in self._routes.items()}
+        return {
+            route: {
+                "requests": stats["requests"],
+                "queries_per_request": round(stats["queries"] / stats["requests"], 2),
+                "max_queries": stats["max_queries"],
+                "mean_ms": round(stats["total_ms"] / stats["requests"], 3),
+            }
+            for route, stats in sorted(routes.items())
+        }
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+SQL_QUERY_STATS = SQLQueryStats()
+
+
+def route_label(request) -> str:
+    """"GET /notifications/{matricule}" plutôt que le chemin réel (cardinalité bornée)"""
+    route = request.scope.get("route")
+    path = getattr(route, "path", None)
+    if path is None:
+        endpoint = request.scope.get("endpoint")
+        path = getattr(endpoint, "__name__", "non routé")
+    return f"{request.method} {path}"
+
+
+async def sql_query_middleware(request, call_next):
+    started = time.perf_counter()
+    with count_queries() as counter:
+        response = await call_next(request)
+    SQL_QUERY_STATS.record(route_label(request), counter.count, (time.perf_counter() - started) * 1000)
+    response.headers[SQL_QUERIES_HEADER] = str(counter.count)
+    return response
@@ -0,0 +1,313 @@
+# backend/app/services/workload.py
+
+"""
+Agrégats de charge de travail maintenus au fil de l'eau.
+
+L'analyse de charge relisait tous les employés et redécoupait leurs
+current_missions à chaque intention « prévision charge » / « explication
+surcharge » et à chaque justificatif déposé. Les compteurs sont désormais
+tenus dans trois tables (app/models/workload.py) :
+
+- user_workloads : contribution de chaque employé (département, actif,
+  missions en cours, missions, surcharge) ;
+- department_workloads : totaux par département ;
+- department_missions : occurrences de chaque mission par département.
+
+Chaque insertion, modification (département, statut, missions, état des
+missions) ou suppression d'un User par l'ORM applique la différence entre
+l'ancienne et la nouvelle contribution, par incréments SQL atomiques dans la
+transaction de l'écriture. La lecture ne parcourt plus que les départements
+et les employés en surcharge.
+
+Les écritures hors ORM (insertions en masse, UPDATE SQL) échappent aux
+événements : verify_workloads() compare les agrégats à un recalcul complet,
+recompute_workloads() les reconstruit depuis users (de préférence hors
+charge) :
+
+    python -m app.services.workload --verify
+    python -m app.services.workload --recompute
+"""
+
+import argparse
+from collections import Counter
+from typing import Optional
+
+from sqlalchemy import delete, event, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.workload import DepartmentMission, DepartmentWorkload, UserWorkload
+
+CHUNK_SIZE = 5000
+SURCHARGE_MISSIONS = 3  # surcharge : plus de 3 missions en cours
+TRACKED_ATTRIBUTES = ("department", "status", "missions_status", "current_missions")
+COUNTERS = ("total", "actifs", "en_cours", "nb_missions", "surcharges")
+
+users_table = User.__table__
+user_workloads = UserWorkload.__table__
+department_workloads = DepartmentWorkload.__table__
+department_missions = DepartmentMission.__table__
+
+_USER_COLUMNS = (users_table.c.id, *(users_table.c[name] for name in TRACKED_ATTRIBUTES))
+
+
+def parse_missions(value) -> list:
+    """Missions d'une chaîne current_missions ("a, b, c")"""
+    return [m.strip() for m in value.split(',') if m.strip()] if value else []
+
+
+def user_workload(user_id, department, status, missions_status, current_missions) -> dict:
+    """Ligne user_workloads d'un employé"""
+    missions = parse_missions(current_missions)
+    en_cours = bool(missions_status) and missions_status.lower() == "en cours"
+    return {
+        "user_id": user_id,
+        "department": department or "Non défini",
+        "actif": bool(status) and status.lower() == "actif",
+        "en_cours": en_cours,
+        "nb_missions": len(missions),
+        "missions": ",".join(missions),
+        "surcharge": en_cours and len(missions) > SURCHARGE_MISSIONS,
+    }
+
+
+def _add(departments: dict, missions: Counter, workload: dict, sign: int = 1):
+    """Ajouter (sign=1) ou retirer (sign=-1) la contribution d'un employé aux compteurs"""
+    counters = departments.setdefault(workload["department"], dict.fromkeys(COUNTERS, 0))
+    counters["total"] += sign
+    counters["actifs"] += sign * workload["actif"]
+    counters["en_cours"] += sign * workload["en_cours"]
+    counters["nb_missions"] += sign * workload["nb_missions"]
+    counters["surcharges"] += sign * workload["surcharge"]
+    for mission in parse_missions(workload["missions"]):
+        missions[(workload["department"], mission)] += sign
+
+
+def _insert(connection, table):
+    return (postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert)(table)
+
+
+def _increment(connection, table, keys: dict, deltas: dict):
+    """INSERT ... ON CONFLICT DO UPDATE col = col + delta : sûr face aux écritures concurrentes"""
+    statement = _insert(connection, table).values(**keys, **deltas)
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=list(keys), set_={name: table.c[name] + statement.excluded[name] for name in deltas}
+    ))
+
+
+def _apply(connection, old: Optional[dict], new: Optional[dict]):
+    departments, missions = {}, Counter()
+    if old:
+        _add(departments, missions, old, -1)
+    if new:
+        _add(departments, missions, new)
+    for department, counters in departments.items():
+        if any(counters.values()):
+            _increment(connection, department_workloads, {"department": department}, counters)
+    for (department, mission), nb in missions.items():
+        if nb:
+            _increment(connection, department_missions, {"department": department, "mission": mission}, {"nb": nb})
+    if old:
+        # Départements et missions retombés à zéro
+        connection.execute(delete(department_workloads).where(
+            department_workloads.c.department.in_(list(departments)), department_workloads.c.total <= 0))
+        connection.execute(delete(department_missions).where(
+            department_missions.c.department.in_(list(departments)), department_missions.c.nb <= 0))
+
+
+def sync_user_workload(connection, user_id: int, deleted: bool = False):
+    """Recalculer la contribution d'un employé depuis users et reporter la différence sur les agrégats"""
+    row = None if deleted else connection.execute(select(*_USER_COLUMNS).where(users_table.c.id == user_id)).first()
+    new = user_workload(*row) if row else None
+    old = connection.execute(select(user_workloads).where(user_workloads.c.user_id == user_id)).mappings().first()
+    old = dict(old) if old else None
+    if old == new:
+        return
+    _apply(connection, old, new)
+    if new is None:
+        connection.execute(delete(user_workloads).where(user_workloads.c.user_id == user_id))
+    else:
+        statement = _insert(connection, user_workloads).values(**new)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=["user_id"], set_={name: statement.excluded[name] for name in new if name != "user_id"}
+        ))
+
+
+def _user_id(target) -> int:
+    # Clé d'identité plutôt que target.id : pas de rechargement d'un objet expiré pendant le flush
+    state = inspect(target)
+    return state.identity[0] if state.identity else target.id
+
+
+def _on_user_inserted(mapper, connection, target):
+    sync_user_workload(connection, _user_id(target))
+
+
+def _on_user_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in TRACKED_ATTRIBUTES):
+        sync_user_workload(connection, _user_id(target))
+
+
+def _on_user_deleted(mapper, connection, target):
+    # Avant le DELETE : la contribution est retirée tant que la ligne user_workloads existe
+    sync_user_workload(connection, _user_id(target), deleted=True)
+
+
+def register_workload_listeners():
+    for event_name, listener in (
+        ("after_insert", _on_user_inserted),
+        ("after_update", _on_user_updated),
+        ("before_delete", _on_user_deleted),
+    ):
+        if not event.contains(User, event_name, listener):
+            event.listen(User, event_name, listener)
+
+
+def _iter_user_workloads(connection, chunk_size: int):
+    """Lignes user_workloads recalculées depuis users, par paquets d'ids croissants"""
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            select(*_USER_COLUMNS).where(users_table.c.id > last_id).order_by(users_table.c.id).limit(chunk_size)
+        ).all()
+        if not rows:
+            return
+        yield [user_workload(*row) for row in rows]
+        last_id = rows[-1].id
+
+
+def recompute_workloads(connection, chunk_size: int = CHUNK_SIZE) -> dict:
+    """Reconstruire les trois tables d'agrégats depuis users ; retourne employés, départements et missions"""
+    for table in (department_missions, department_workloads, user_workloads):
+        connection.execute(delete(table))
+    departments, missions = {}, Counter()
+    users = 0
+    for chunk in _iter_user_workloads(connection, chunk_size):
+        connection.execute(user_workloads.insert(), chunk)
+        for workload in chunk:
+            _add(departments, missions, workload)
+        users += len(chunk)
+    if departments:
+        connection.execute(department_workloads.insert(), [
+            {"department": department, **counters} for department, counters in departments.items()
+        ])
+    if missions:
+        connection.execute(department_missions.insert(), [
+            {"department": department, "mission": mission, "nb": nb} for (department, mission), nb in missions.items()
+        ])
+    return {"users": users, "departments": len(departments), "missions": len(missions)}
+
+
+def verify_workloads(connection, chunk_size: int = CHUNK_SIZE) -> list:
+    """Écarts entre les agrégats stockés et un recalcul complet depuis users (liste vide : agrégats exacts)"""
+    problems = []
+    departments, missions = {}, Counter()
+    for chunk in _iter_user_workloads(connection, chunk_size):
+        stored = {row["user_id"]: dict(row) for row in connection.execute(select(user_workloads).where(
+            user_workloads.c.user_id.between(chunk[0]["user_id"], chunk[-1]["user_id"]))).mappings()}
+        for workload in chunk:
+            _add(departments, missions, workload)
+            if stored.get(workload["user_id"]) != workload:
+                problems.append(f"user_workloads[{workload['user_id']}] : "
+                                f"{stored.get(workload['user_id'])} au lieu de {workload}")
+
+    orphans = connection.execute(select(func.count()).select_from(user_workloads).where(
+        ~select(users_table.c.id).where(users_table.c.id == user_workloads.c.user_id).exists())).scalar()
+    if orphans:
+        problems.append(f"user_workloads : {orphans} ligne(s) sans employé")
+
+    stored_departments = {
+        row["department"]: {name: row[name] for name in COUNTERS}
+        for row in connection.execute(select(department_workloads)).mappings()
+    }
+    for department in sorted(set(stored_departments) | set(departments)):
+        if stored_departments.get(department) != departments.get(department):
+            problems.append(f"department_workloads[{department}] : {stored_departments.get(department)} "
+                            f"au lieu de {departments.get(department)}")
+
+    stored_missions = {
+        (row.department, row.mission): row.nb for row in connection.execute(select(department_missions))
+    }
+    expected_missions = {key: nb for key, nb in missions.items() if nb}
+    for key in sorted(set(stored_missions) | set(expected_missions)):
+        if stored_missions.get(key) != expected_missions.get(key):
+            problems.append(f"department_missions{list(key)} : {stored_missions.get(key)} "
+                            f"au lieu de {expected_missions.get(key)}")
+    return problems
+
+
+def get_users_surcharges(db: Session) -> list:
+    """Employés en surcharge (plus de 3 missions en cours), sans parcourir les autres employés"""
+    rows = (
+        db.query(User.first_name, User.last_name,
+                 UserWorkload.department, UserWorkload.nb_missions, UserWorkload.missions)
+        .join(UserWorkload, UserWorkload.user_id == User.id)
+        .filter(UserWorkload.surcharge == True)
+        .order_by(User.id)
+        .all()
+    )
+    return [{
+        "nom": f"{row.first_name} {row.last_name}",
+        "department": row.department,
+        "nb_missions": row.nb_missions,
+        "missions": parse_missions(row.missions),
+    } for row in rows]
+
+
+def get_workload_analysis(db: Session) -> dict:
+    """Analyse de charge lue dans les agrégats : une ligne par département, missions les plus fréquentes d'abord"""
+    departments = {
+        row.department: {"total": row.total, "actifs": row.actifs, "en_cours": row.en_cours, "missions": []}
+        for row in db.query(DepartmentWorkload).order_by(DepartmentWorkload.department)
+    }
+    missions = (
+        db.query(DepartmentMission.department, DepartmentMission.mission)
+        .filter(DepartmentMission.nb > 0)
+        .order_by(DepartmentMission.department, DepartmentMission.nb.desc(), DepartmentMission.mission)
+    )
+    for department, mission in missions:
+        if department in departments:
+            departments[department]["missions"].append(mission)
+
+    total_users = sum(data["total"] for data in departments.values())
+    users_actifs = sum(data["actifs"] for data in departments.values())
+    return {
+        "stats_globales": {
+            "total_users": total_users,
+            "users_actifs": users_actifs,
+            "users_missions_en_cours": sum(data["en_cours"] for data in departments.values()),
+            "taux_activite": round((users_actifs / total_users * 100) if total_users > 0 else 0, 1)
+        },
+        "departments": departments,
+        "users_surcharges": get_users_surcharges(db),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vérifier ou reconstruire les agrégats de charge de travail")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--verify", action="store_true", help="comparer les agrégats à un recalcul complet")
+    action.add_argument("--recompute", action="store_true", help="reconstruire les agrégats depuis users")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    from app.database import engine
+
+    if args.recompute:
+        with engine.begin() as conn:
+            stats = recompute_workloads(conn, args.chunk_size)
+        print(f"{stats['users']} employés, {stats['departments']} départements, {stats['missions']} missions")
+        return
+
+    with engine.connect() as conn:
+        problems = verify_workloads(conn, args.chunk_size)
+    for problem in problems:
+        print(problem)
+    print("✅ Agrégats cohérents" if not problems else f"❌ {len(problems)} écart(s) : relancer avec --recompute")
+    raise SystemExit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+# backend/app/tests/conftest.py
+
+import pytest
+
+
+@pytest.fixture
+def sqlite_engine():
+    """Base SQLite en mémoire avec tout le schéma, requêtes SQL comptées (count_queries)"""
+    pytest.importorskip("sqlalchemy")
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import StaticPool
+
+    from app.database import Base
+    from app.models import (  # noqa: F401
+        chat_logs, demande_conge, demande_fichier, instruction, notification, procedure_conge, task, task_detail, user,
+        workload,
+    )
+    from app.services.sql_metrics import install_query_counter
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    install_query_counter(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(sqlite_engine):
+    from sqlalchemy.orm import sessionmaker
+
+    db = sessionmaker(autocommit=False, autoflush=False, bind=sqlite_engine)()
+    yield db
+    db.close()
@@ -0,0 +1,92 @@
+# backend/app/tests/test_async_queries.py
+
+import asyncio
+import os
+import tempfile
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiosqlite")
+
+# app.database et app.database_async créent leur moteur à l'import : base SQLite jetable
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'app.db')}")
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import async_queries
+from app.database import Base
+from app.database_async import async_database_url
+from app.models.chat_logs import ChatLog
+from app.models.notification import Notification
+from app.models.user import User
+
+
+def test_async_database_url_maps_drivers():
+    assert async_database_url("postgresql://u:p@h:5432/db") == "postgresql+asyncpg://u:p@h:5432/db"
+    assert async_database_url("postgresql+psycopg2://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert async_database_url("sqlite:////tmp/x.db") == "sqlite+aiosqlite:////tmp/x.db"
+    with pytest.raises(ValueError):
+        async_database_url("mysql://u:p@h/db")
+
+
+def run_with_session(tmp_path, scenario):
+    async def main():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        try:
+            async with session_factory() as db:
+                db.add(User(id=1, matricule="A001", first_name="Sara", last_name="Alaoui", email="a001@entreprise.com"))
+                db.add_all([
+                    ChatLog(user_id=1, message="bonjour", sender="user", timestamp=datetime(2025, 1, 1, 9, 0)),
+                    ChatLog(user_id=1, message="Bonjour !", sender="bot", timestamp=datetime(2025, 1, 1, 9, 0)),
+                    Notification(user_id=1, title="Congé validé", message="ok", type="conge_valide", is_read=False),
+                    Notification(user_id=1, title="Info", message="ok", type="info", is_read=True),
+                    Notification(user_id=1, title="Congé refusé", message="non", type="conge_refuse", is_read=False),
+                ])
+                await db.commit()
+                return await scenario(db)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def test_user_and_last_chat_log(tmp_path):
+    async def scenario(db):
+        user = await async_queries.get_user_by_matricule(db, "A001")
+        missing = await async_queries.get_user_by_matricule(db, "INCONNU")
+        last_log = await async_queries.get_last_chat_log(db, user.id)
+        return user.first_name, missing, last_log.sender
+
+    assert run_with_session(tmp_path, scenario) == ("Sara", None, "bot")
+
+
+def test_notifications_read_flow(tmp_path):
+    async def scenario(db):
+        unread = await async_queries.get_unread_count(db, 1)
+        unread_titles = {n.title for n in await async_queries.get_user_notifications(db, 1, unread_only=True)}
+        first_id = (await async_queries.get_user_notifications(db, 1, unread_only=True))[0].id
+        marked = await async_queries.mark_notification_as_read(db, first_id, 1)
+        wrong_user = await async_queries.mark_notification_as_read(db, first_id, 2)
+        remaining = await async_queries.mark_all_notifications_as_read(db, 1)
+        return unread, unread_titles, marked, wrong_user, remaining, await async_queries.get_unread_count(db, 1)
+
+    unread, titles, marked, wrong_user, remaining, after = run_with_session(tmp_path, scenario)
+    assert (unread, titles) == (2, {"Congé validé", "Congé refusé"})
+    assert (marked, wrong_user, remaining, after) == (True, False, 1, 0)
+
+
+def test_create_demande_conge_returns_persisted_row(tmp_path):
+    async def scenario(db):
+        demande = await async_queries.create_demande_conge(
+            db, 1, "maladie", datetime(2025, 3, 1), datetime(2025, 3, 3), raison="Grippe", preuve="uploads/p.pdf"
+        )
+        return demande.id, demande.preuve
+
+    demande_id, preuve = run_with_session(tmp_path, scenario)
+    assert demande_id is not None and preuve == "uploads/p.pdf"
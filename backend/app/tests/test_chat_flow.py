@@ -0,0 +1,91 @@
+# backend/app/tests/test_chat_flow.py
+
+import asyncio
+import json
+import os
+import tempfile
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("aiosqlite")
+pytest.importorskip("fastapi")
+
+# app.database et app.database_async créent leur moteur à l'import : base SQLite jetable
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'app.db')}")
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.main
+import app.nlp.message as message_module
+from app.database import Base
+from app.models.chat_logs import ChatLog
+from app.models.user import User
+
+
+@pytest.fixture
+def chat(tmp_path, monkeypatch):
+    """Appeler /chat/ pour l'employé A001, avec un classifieur qui voit toujours « horaires_rh »"""
+    url = tmp_path / "chat.db"
+    engine = create_engine(f"sqlite:///{url}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    user = User(matricule="A001", first_name="Sara", last_name="Alaoui", email="a001@entreprise.com")
+    db.add(user)
+    db.commit()
+
+    monkeypatch.setattr(app.main, "correct_spelling", lambda text: text)
+    monkeypatch.setattr(message_module, "classify_intent", lambda text: ("horaires_rh", 0.9) if text else (None, None))
+    monkeypatch.setattr(app.main, "temp_memory", {})
+
+    def send(message):
+        async def main():
+            async_engine = create_async_engine(f"sqlite+aiosqlite:///{url}")
+            try:
+                async with sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)() as adb:
+                    request = app.main.MessageRequest(matricule="A001", message=message)
+                    return json.loads((await app.main.chat(request, db, adb)).body)
+            finally:
+                await async_engine.dispose()
+
+        return asyncio.run(main())
+
+    yield send, user.id, db
+    db.close()
+    engine.dispose()
+
+
+def test_classifier_is_ignored_during_leave_flow(chat):
+    send, user_id, _ = chat
+    app.main.temp_memory[user_id] = {"step": "collect_reason", "data": {"user_id": user_id}}
+
+    # Réponse libre à la question « raison » : enregistrée, pas prise pour une intention RH
+    body = send("rendez-vous chez le dentiste")
+    assert body["requestFile"] is True
+    assert app.main.temp_memory[user_id]["step"] == "upload_proof"
+    assert app.main.temp_memory[user_id]["data"]["raison"] == "rendez-vous chez le dentiste"
+
+
+def test_classifier_answers_outside_leave_flow(chat):
+    send, user_id, _ = chat
+    body = send("rendez-vous chez le dentiste")
+    assert body["response"] == app.main.RH_INFO_RESPONSES["horaires_rh"]
+    assert app.main.temp_memory[user_id]["step"] is None
+
+
+@pytest.mark.parametrize("answer, expected", [
+    ("oui", "Fournissez-moi les détails de la tâche pour : Badge d'accès"),
+    ("non", "D'accord, comment puis-je continuer à vous aider ?"),
+])
+def test_classifier_is_ignored_during_task_confirmation(chat, answer, expected):
+    send, user_id, db = chat
+    # Question posée par le bot, sans flow congé en cours (step None) : seul le dernier message porte l'état
+    db.add(ChatLog(user_id=user_id, sender="bot", message="Badge d'accès\nDemander un badge au service RH."
+                   "\n\nEst-ce que vous voulez que je le fasse pour vous ? Répondez par 'oui' ou 'non'."))
+    db.commit()
+
+    body = send(answer)
+    assert body["response"] == expected
+    assert body["response"] != app.main.RH_INFO_RESPONSES["horaires_rh"]
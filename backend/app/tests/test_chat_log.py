@@ -0,0 +1,59 @@
+# backend/app/tests/test_chat_log.py
+
+import gzip
+
+from app.nlp.batch import read_log_messages
+from app.nlp.chat_log import iter_logged_messages, rotated_log_files
+
+
+def record(time, text):
+    return f"2025-07-02 10:{time},000 - app.main - INFO - {text}\n"
+
+
+def pair(time, original, corrected):
+    return record(time, f"Message original : {original}") + record(time, f"Message corrigé : {corrected}")
+
+
+def test_pairs_multiline_and_orphan(tmp_path):
+    log = tmp_path / "chatbot.log"
+    log.write_text(
+        pair("00:01", "Bonjour", "bonjour")
+        + record("00:02", "Vocabulaire de correction : 3 nom(s) d'employés chargés")
+        + record("00:03", "Message original : ligne 1") + "ligne 2\n"
+        + record("00:03", "Message corrigé : ligne 1") + "ligne 2\n"
+        + record("00:04", "Message original : interrompu")
+        + pair("00:05", "Mes congés", "mes congés"),
+        encoding="utf-8",
+    )
+    messages = list(iter_logged_messages([str(log)]))
+    assert [(m.original, m.corrected) for m in messages] == [
+        ("Bonjour", "bonjour"),
+        ("ligne 1\nligne 2", "ligne 1\nligne 2"),
+        ("interrompu", None),
+        ("Mes congés", "mes congés"),
+    ]
+    assert messages[0].timestamp.minute == 0 and messages[0].timestamp.second == 1
+
+
+def test_rotated_files_oldest_first(tmp_path):
+    log = tmp_path / "chatbot.log"
+    log.write_text(pair("00:30", "récent", "récent"), encoding="utf-8")
+    (tmp_path / "chatbot.log.1").write_text(pair("00:20", "avant", "avant"), encoding="utf-8")
+    with gzip.open(tmp_path / "chatbot.log.2.gz", "wt", encoding="utf-8") as f:
+        f.write(pair("00:10", "ancien", "ancien"))
+
+    files = rotated_log_files(str(log))
+    assert [p.rsplit("/", 1)[1] for p in files] == ["chatbot.log.2.gz", "chatbot.log.1", "chatbot.log"]
+    assert read_log_messages(str(log)) == ["ancien", "avant", "récent"]
+
+
+def test_dedupe_repeated_pairs_within_window(tmp_path):
+    log = tmp_path / "chatbot.log"
+    log.write_text(
+        pair("00:01", "liste des congés", "liste des congés")
+        + pair("00:02", "liste des congés", "liste des congés")
+        + pair("00:09", "liste des congés", "liste des congés"),
+        encoding="utf-8",
+    )
+    assert len(list(iter_logged_messages([str(log)]))) == 3
+    assert len(list(iter_logged_messages([str(log)], dedupe_window=2))) == 2
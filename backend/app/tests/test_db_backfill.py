@@ -0,0 +1,36 @@
+# backend/app/tests/test_db_backfill.py
+
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, text
+
+from app.db_backfill import backfill_table, parse_timestamp
+
+
+def test_parse_timestamp_formats():
+    assert parse_timestamp("03/06/2025 09:15") == datetime(2025, 6, 3, 9, 15)
+    assert parse_timestamp("2025-06-03 09:15:42") == datetime(2025, 6, 3, 9, 15, 42)
+    assert parse_timestamp("2025-06-03T09:15:42.5") == datetime(2025, 6, 3, 9, 15, 42, 500000)
+    assert parse_timestamp("03/06/2025") == datetime(2025, 6, 3)
+    assert parse_timestamp(" ") is None and parse_timestamp(None) is None
+    assert parse_timestamp("hier soir") is None
+
+
+def test_backfill_is_chunked_and_resumable():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE chat_logs (id INTEGER PRIMARY KEY, timestamp VARCHAR, timestamp_ts DATETIME)"))
+        conn.execute(text("INSERT INTO chat_logs (timestamp) VALUES "
+                          "('01/01/2025 10:00'), ('02/01/2025 10:00'), ('illisible'), (NULL), ('03/01/2025 10:00')"))
+        first = backfill_table(conn, "chat_logs", ("timestamp",), chunk_size=2)
+        # Une nouvelle ligne arrive entre deux passages : seule elle (et l'illisible) est relue
+        conn.execute(text("INSERT INTO chat_logs (timestamp) VALUES ('04/01/2025 10:00')"))
+        second = backfill_table(conn, "chat_logs", ("timestamp",), chunk_size=2)
+        filled = conn.execute(text("SELECT count(*) FROM chat_logs WHERE timestamp_ts IS NOT NULL")).scalar()
+    assert first == {"rows": 4, "unparsed": 1}
+    assert second == {"rows": 2, "unparsed": 1}
+    assert filled == 4
@@ -0,0 +1,75 @@
+# backend/app/tests/test_demande_conge_pagination.py
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app.crud.demande_conge import list_demandes_page
+from app.models.demande_conge import DemandeConge
+from app.models.user import User
+from app.services.sql_metrics import count_queries
+
+
+@pytest.fixture
+def demandes(db_session):
+    """30 demandes, créées par groupes de 3 à la même seconde (départage par id)"""
+    it = User(matricule="E0001", first_name="Sara", last_name="Alaoui", department="Informatique", email="it@e.com")
+    rh = User(matricule="E0002", first_name="Omar", last_name="Tazi", department="RH", email="rh@e.com")
+    db_session.add_all([it, rh])
+    db_session.flush()
+    start = datetime(2025, 6, 1, 9, 0)
+    for i in range(30):
+        debut = datetime(2025, 7, 1) + timedelta(days=i)
+        db_session.add(DemandeConge(
+            user_id=(it if i % 2 else rh).id, type_conge="maladie" if i % 3 == 0 else "annuel",
+            date_debut=debut, date_fin=debut + timedelta(days=1), status="validé" if i % 5 == 0 else "en attente",
+            created_at=start + timedelta(minutes=i // 3), updated_at=start,
+        ))
+    db_session.commit()
+    return db_session
+
+
+def walk(db, **filters):
+    ids, cursor, pages = [], None, 0
+    while True:
+        page = list_demandes_page(db, limit=7, cursor=cursor, **filters)
+        ids += [d.id for d in page.demandes]
+        pages += 1
+        if page.next_cursor is None:
+            return ids, pages
+        cursor = page.next_cursor
+
+
+def test_pages_cover_every_row_once_in_order(demandes):
+    ids, pages = walk(demandes)
+    expected = [d.id for d in demandes.query(DemandeConge).order_by(DemandeConge.created_at.desc(), DemandeConge.id.desc())]
+    assert ids == expected and len(ids) == 30 and pages == 5
+
+
+def test_filters_and_total(demandes):
+    page = list_demandes_page(demandes, status="en attente", type_conge="ANNUEL", department="informatique", include_total=True)
+    assert page.total == len(page.demandes) > 0
+    assert all(d.status == "en attente" and d.type_conge == "annuel" and d.user.department == "Informatique"
+               for d in page.demandes)
+    # Période du congé qui chevauche [5 juillet, 7 juillet] : départs du 4 au 7 juillet
+    in_july = list_demandes_page(demandes, date_from=date(2025, 7, 5), date_to=date(2025, 7, 7), include_total=True)
+    assert sorted(d.date_debut.day for d in in_july.demandes) == [4, 5, 6, 7] and in_july.total == 4
+    ids, _ = walk(demandes, type_conge="maladie")
+    assert len(ids) == 10
+
+
+def test_page_query_count_does_not_depend_on_position(demandes):
+    first = list_demandes_page(demandes, limit=7)
+    with count_queries() as counter:
+        list_demandes_page(demandes, limit=7, cursor=first.next_cursor)
+    assert counter.count == 1
+    with count_queries() as counter:
+        list_demandes_page(demandes, limit=7, include_total=True)
+    assert counter.count == 2
+
+
+def test_invalid_cursor_is_rejected(demandes):
+    with pytest.raises(ValueError):
+        list_demandes_page(demandes, cursor="pas-un-curseur")
@@ -0,0 +1,83 @@
+# backend/app/tests/test_demande_conge_queries.py
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app.crud.demande_conge import PAGE_SIZE, get_demandes_with_users
+from app.models.demande_conge import DemandeConge
+from app.models.user import User
+from app.services.sql_metrics import count_queries
+
+RH_MATRICULE = "RH0001"
+
+
+def seed(db, count):
+    db.add(User(matricule=RH_MATRICULE, first_name="Khadija", last_name="Benani", department="RH", email="rh@entreprise.com"))
+    users = [User(matricule=f"E{i:04d}", first_name=f"Prenom{i}", last_name=f"Nom{i}", department="Informatique",
+                  email=f"e{i}@entreprise.com") for i in range(count)]
+    db.add_all(users)
+    db.flush()
+    start = datetime(2025, 6, 1)
+    db.add_all(DemandeConge(user_id=u.id, type_conge="annuel", date_debut=start, date_fin=start + timedelta(days=2),
+                            created_at=start - timedelta(hours=i), updated_at=start) for i, u in enumerate(users))
+    db.commit()
+    db.expunge_all()  # repartir d'une session vide : aucun employé déjà en mémoire
+
+
+def queries_for(db_session, count, call):
+    seed(db_session, count)
+    with count_queries() as counter:
+        result = call(db_session)
+    return counter.count, result
+
+
+@pytest.mark.parametrize("count", [3, 40])
+def test_listing_loads_users_in_the_same_query(db_session, count):
+    queries, demandes = queries_for(db_session, count, get_demandes_with_users)
+    assert queries == 1
+    assert len(demandes) == count and all(d.user.matricule.startswith("E") for d in demandes)
+    assert [d.created_at for d in demandes] == sorted((d.created_at for d in demandes), reverse=True)
+
+
+def test_admin_listing_query_count_is_constant(sqlite_engine):
+    pytest.importorskip("fastapi")
+    from sqlalchemy.orm import sessionmaker
+    from starlette.requests import Request
+
+    from app.routes.demande_conge_admin import get_all_demandes_conge
+
+    def call(db):
+        request = Request({"type": "http", "method": "GET", "path": "/admin/demandes-conge",
+                           "headers": [(b"x-user-matricule", RH_MATRICULE.encode())]})
+        return json.loads(asyncio.run(get_all_demandes_conge(request, db, limit=PAGE_SIZE)).body)
+
+    counts = []
+    for count in (3, 40):
+        session_factory = sessionmaker(bind=sqlite_engine)
+        db = session_factory()
+        try:
+            db.query(DemandeConge).delete()
+            db.query(User).delete()
+            db.commit()
+            queries, body = queries_for(db, count, call)
+        finally:
+            db.close()
+        assert len(body["demandes"]) == count and body["demandes"][0]["user"]["matricule"]
+        counts.append(queries)
+    assert counts[0] == counts[1] == 2  # employé RH + demandes avec leurs demandeurs
+
+
+@pytest.mark.parametrize("count", [3, 40])
+def test_leave_report_query_count_is_constant(db_session, count):
+    pytest.importorskip("fastapi")
+    from app.main import generer_rapport_conges
+
+    queries, rapport = queries_for(db_session, count, generer_rapport_conges)
+    assert queries == 5  # agrégats globaux, par type, département, statut et mois
+    assert rapport["metadata"]["total_demandes"] == count
+    assert rapport["analyse_par_departement"] == {"Informatique": count}
@@ -0,0 +1,88 @@
+# backend/app/tests/test_executors.py
+
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from app.services.executors import InstrumentedExecutor
+
+
+def test_blocking_work_does_not_freeze_the_event_loop():
+    executor = InstrumentedExecutor("io", max_workers=1)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await executor.run(time.sleep, 0.1)
+        task.cancel()
+        return ticks
+
+    try:
+        assert asyncio.run(main()) >= 5
+    finally:
+        executor.shutdown()
+
+
+def test_queue_depth_running_and_errors():
+    executor = InstrumentedExecutor("cpu", max_workers=1)
+    release = threading.Event()
+
+    def fail():
+        raise ValueError("boom")
+
+    async def main():
+        blocked = asyncio.ensure_future(executor.run(release.wait))
+        queued = asyncio.ensure_future(executor.run(lambda: 42))
+        await asyncio.sleep(0.05)
+        during = executor.stats()
+        release.set()
+        results = await asyncio.gather(blocked, queued)
+        with pytest.raises(ValueError):
+            await executor.run(fail)
+        return during, results
+
+    try:
+        during, results = asyncio.run(main())
+    finally:
+        executor.shutdown()
+    assert (during["running"], during["queue_depth"]) == (1, 1)
+    assert results == [True, 42]
+    stats = executor.stats()
+    assert (stats["running"], stats["queue_depth"], stats["completed"], stats["errors"]) == (0, 0, 3, 1)
+    assert stats["queue_wait"]["count"] == 3 and stats["run"]["max_ms"] >= 40
+
+
+def test_run_after_shutdown_is_not_counted_as_queued():
+    executor = InstrumentedExecutor("io", max_workers=1)
+    executor.shutdown()
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await executor.run(print)
+
+    asyncio.run(main())
+    assert executor.stats()["queue_depth"] == 0
+
+
+def test_task_runs_in_caller_context():
+    executor = InstrumentedExecutor("io", max_workers=1)
+    request_id = contextvars.ContextVar("request_id", default=None)
+
+    async def main():
+        request_id.set("req-42")
+        return await executor.run(request_id.get)
+
+    try:
+        assert asyncio.run(main()) == "req-42"
+    finally:
+        executor.shutdown()
@@ -0,0 +1,64 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from app.services.gpt2_backends import _gpt2_step_module
+
+CAPACITY = 16
+
+
+@pytest.fixture(scope="module")
+def model():
+    # Petit GPT-2 aléatoire : mêmes opérations que le vrai modèle, sans poids à télécharger
+    torch.manual_seed(0)
+    config = transformers.GPT2Config(vocab_size=50, n_positions=CAPACITY, n_embd=32, n_layer=2, n_head=4)
+    return transformers.GPT2LMHeadModel(config).eval()
+
+
+def _reference_logits(model, input_ids, attention_mask):
+    position_ids = (attention_mask.cumsum(-1) - 1).clamp(min=0)
+    with torch.no_grad():
+        return model(input_ids=input_ids, attention_mask=attention_mask, position_ids=position_ids).logits[:, -1]
+
+
+def _decode_with_cache(step, input_ids, attention_mask, n_steps):
+    """Prompt puis n_steps tokens un par un via le cache ; compare chaque étape au modèle complet"""
+    n_layer, n_kv, n_head, head_dim = step.past_shape.tolist()
+    past = torch.zeros(n_layer, n_kv, input_ids.shape[0], n_head, CAPACITY, head_dim)
+    position_ids = (attention_mask.cumsum(-1) - 1).clamp(min=0)
+    sequence, new_ids = input_ids, input_ids
+    results = []
+    with torch.no_grad():
+        for _ in range(n_steps + 1):
+            logits = step(new_ids, attention_mask, position_ids, past)
+            results.append((logits, sequence, attention_mask))
+            new_ids = logits.argmax(dim=-1)[:, None]
+            sequence = torch.cat([sequence, new_ids], dim=-1)
+            position_ids = position_ids[:, -1:] + 1
+            attention_mask = torch.cat([attention_mask, torch.ones_like(new_ids)], dim=-1)
+    return results
+
+
+def test_step_module_matches_full_forward_with_left_padding(model):
+    step = _gpt2_step_module(torch, model).eval()
+    input_ids = torch.tensor([[0, 0, 5, 6, 7], [1, 2, 3, 4, 5]])
+    attention_mask = torch.tensor([[0, 0, 1, 1, 1], [1, 1, 1, 1, 1]])
+
+    for logits, sequence, mask in _decode_with_cache(step, input_ids, attention_mask, n_steps=4):
+        assert torch.allclose(logits, _reference_logits(model, sequence, mask), atol=1e-5)
+
+
+def test_traced_step_generalizes_to_other_shapes(model):
+    step = _gpt2_step_module(torch, model).eval()
+    n_layer, n_kv, n_head, head_dim = step.past_shape.tolist()
+    past = torch.zeros(n_layer, n_kv, 2, n_head, CAPACITY, head_dim)
+    with torch.no_grad():
+        traced = torch.jit.trace(step, (torch.tensor([[8], [9]]), torch.ones(2, 4, dtype=torch.long),
+                                        torch.tensor([[3], [3]]), past))
+
+    # Lot, longueur de prompt et position dans le cache différents de ceux de la trace
+    input_ids = torch.tensor([[0, 11, 12], [13, 14, 15], [0, 0, 16]])
+    attention_mask = torch.tensor([[0, 1, 1], [1, 1, 1], [0, 0, 1]])
+    for logits, sequence, mask in _decode_with_cache(traced, input_ids, attention_mask, n_steps=3):
+        assert torch.allclose(logits, _reference_logits(model, sequence, mask), atol=1e-5)
@@ -0,0 +1,61 @@
+# backend/app/tests/test_inference_worker.py
+
+import time
+from concurrent.futures import TimeoutError
+
+import pytest
+
+from app.services.inference_worker import ProcessGPT2Worker
+
+
+@pytest.fixture
+def worker_factory(monkeypatch):
+    """Worker en mode process ; le processus enfant (spawn) lit GPT2_BACKEND dans l'environnement"""
+    workers = []
+
+    def create(backend, latency_ms=0, timeout=30):
+        monkeypatch.setenv("GPT2_BACKEND", backend)
+        monkeypatch.setenv("GPT2_STUB_LATENCY_MS", str(latency_ms))
+        worker = ProcessGPT2Worker(timeout=timeout)
+        workers.append(worker)
+        return worker
+
+    yield create
+    for worker in workers:
+        worker.shutdown()
+
+
+def test_generates_in_child_process(worker_factory):
+    worker = worker_factory("stub")
+    assert worker.generate_batch(["bonjour", "congé"]) == ["Réponse générée pour : bonjour", "Réponse générée pour : congé"]
+    assert worker.is_loaded and worker._pending == {}
+
+
+def test_load_failure_fails_fast_without_respawn(worker_factory):
+    worker = worker_factory("inconnu")
+    started = time.perf_counter()
+    with pytest.raises(RuntimeError, match="GPT2_BACKEND inconnu"):
+        worker.generate("bonjour")
+    assert time.perf_counter() - started < 20 and worker._pending == {}
+    pid = worker.pid
+    with pytest.raises(RuntimeError, match="Chargement de GPT-2 impossible"):
+        worker.generate("bonjour")
+    assert worker.pid == pid  # pas de nouveau processus voué au même échec
+
+
+def test_crashed_process_fails_pending_requests(worker_factory):
+    worker = worker_factory("stub", latency_ms=20000)
+    future = worker.submit(["bonjour"])
+    while not worker.is_loaded:
+        time.sleep(0.05)
+    worker._process.kill()
+    with pytest.raises(RuntimeError, match="arrêté"):
+        future.result(timeout=10)
+    assert worker._pending == {}
+
+
+def test_timeout_removes_pending_entry(worker_factory):
+    worker = worker_factory("stub", latency_ms=2000, timeout=0.2)
+    with pytest.raises(TimeoutError):
+        worker.generate("bonjour")
+    assert worker._pending == {}
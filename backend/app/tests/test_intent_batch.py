@@ -0,0 +1,68 @@
+# backend/app/tests/test_intent_batch.py
+
+import app.nlp.batch as batch
+import app.nlp.message as message_module
+import app.nlp.spelling as spelling
+from app.nlp import NormalizedMessage
+from app.nlp.cache import LRUCache
+
+MESSAGES = [
+    "Bonjour", "horairs du servise rh", "je veux un conjé", "qui est notre chef", "qui est notre chef",
+    "", "zorglub", "mes congés", "rapprt charge travial", "je veux du repos",
+]
+
+
+class FakeModel:
+    def __init__(self):
+        self.calls = []
+
+    def predict_batch_with_confidence(self, texts):
+        self.calls.append(list(texts))
+        return [("responsable_rh", 0.9) if "chef" in t else ("demande_conge", 0.3) for t in texts]
+
+    def predict_with_confidence(self, text):
+        return self.predict_batch_with_confidence([text])[0]
+
+
+def patch_lexicon(monkeypatch):
+    monkeypatch.setattr(spelling, "SPELL_CACHE", LRUCache(100))
+    monkeypatch.setattr(spelling, "is_french_word", lambda word: word in {"je", "veux", "un", "qui", "est", "notre", "du"})
+
+
+def test_batch_correction_matches_per_message(monkeypatch):
+    patch_lexicon(monkeypatch)
+    expected = [spelling.correct_spelling(m.lower()) for m in MESSAGES]
+    assert spelling.correct_spelling_batch([m.lower() for m in MESSAGES]) == expected
+
+
+def test_classify_batch_matches_normalized_message(monkeypatch):
+    patch_lexicon(monkeypatch)
+    model = FakeModel()
+    monkeypatch.setattr(batch, "get_intent_classifier", lambda: model)
+
+    def classify_intent(text):
+        if not text:
+            return None, None
+        intent, confidence = model.predict_with_confidence(text)
+        return (intent if confidence >= 0.5 else None), confidence
+
+    monkeypatch.setattr(message_module, "classify_intent", classify_intent)
+
+    expected = [NormalizedMessage(m, spelling.correct_spelling) for m in MESSAGES]
+    model.calls.clear()
+    results = batch.classify_batch(MESSAGES, threshold=0.5)
+
+    assert [r["intent"] for r in results] == [nm.best_intent for nm in expected]
+    assert [r["source"] for r in results] == [nm.intent_source for nm in expected]
+    assert [r["corrected"] for r in results] == [nm.corrected for nm in expected]
+    # Un seul appel au classifieur, sur les textes distincts sans mot-clé
+    assert model.calls == [["je veux un conge", "qui est notre chef", "zorglub", "mes conges", "je veux du repos"]]
+
+
+def test_iter_classified_streams_chunks_and_summary(monkeypatch):
+    patch_lexicon(monkeypatch)
+    monkeypatch.setattr(batch, "get_intent_classifier", lambda: None)
+    lines = list(batch.iter_classified(MESSAGES * 3, batch_size=4))
+    assert len(lines) == len(MESSAGES) * 3 + 1
+    assert lines[-1]["summary"]["messages"] == len(MESSAGES) * 3
+    assert lines[0]["intent"] == "greeting"
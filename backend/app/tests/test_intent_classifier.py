@@ -0,0 +1,79 @@
+# backend/app/tests/test_intent_classifier.py
+
+import pytest
+
+import app.nlp.classifier as classifier
+from app.config import Config
+from app.nlp.batch import classify_batch
+from app.nlp.classifier import NO_INTENT
+from app.nlp.intents import INTENT_KEYWORDS, normalize
+from app.nlp.train_intent_classifier import load_corpus, train_model, training_examples
+
+
+class FakeModel:
+    def predict_with_confidence(self, text):
+        if "repos" in text:
+            return "demande_conge", 0.8
+        return (NO_INTENT, 0.9) if "zorglub" in text else ("greeting", 0.2)
+
+
+def test_training_examples_cover_corpus_and_keywords():
+    corpus = load_corpus()
+    examples = dict(training_examples())
+
+    assert ("bonjour", "greeting") in corpus
+    assert any(intent is None for _, intent in corpus)
+    assert None not in examples.values()
+    assert examples["blablabla"] == NO_INTENT  # exemples négatifs appris comme une classe
+    assert examples["bonjour"] == "greeting"
+    assert examples["liste des conges"] == "liste_conges_rh"  # normalisé, sans accents
+    assert {intent for intent, _ in INTENT_KEYWORDS} <= set(examples.values())
+
+
+def test_classifier_missing_model_is_disabled(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "INTENT_CLASSIFIER_PATH", str(tmp_path / "absent.joblib"))
+    classifier.reset_intent_classifier()
+    try:
+        assert classifier.classify_intent("je veux du repos") == (None, None)
+    finally:
+        classifier.reset_intent_classifier()
+
+
+def test_classifier_threshold(monkeypatch):
+    monkeypatch.setattr(classifier, "get_intent_classifier", lambda: FakeModel())
+    assert classifier.classify_intent("je veux du repos", threshold=0.5) == ("demande_conge", 0.8)
+    assert classifier.classify_intent("je veux du repos", threshold=0.9) == (None, 0.8)
+    assert classifier.classify_intent("bof", threshold=0.5) == (None, 0.2)
+    assert classifier.classify_intent("zorglub", threshold=0.5) == (None, 0.9)
+    assert classifier.classify_intent("", threshold=0.5) == (None, None)
+
+
+@pytest.fixture
+def trained_classifier(monkeypatch, tmp_path):
+    """Vrai modèle entraîné sur le corpus livré, chargé comme en production"""
+    pytest.importorskip("sklearn")
+    path = tmp_path / "intent_classifier.joblib"
+    train_model().save(str(path))
+    monkeypatch.setattr(Config, "INTENT_CLASSIFIER_PATH", str(path))
+    classifier.reset_intent_classifier()
+    yield classifier.get_intent_classifier()
+    classifier.reset_intent_classifier()
+
+
+def test_trained_classifier_on_shipped_corpus(trained_classifier):
+    assert NO_INTENT in trained_classifier.model.classes_
+
+    # Reformulations sans mot-clé exact, au-dessus du seuil
+    assert classifier.classify_intent(normalize("je veux poser un conge"))[0] == "demande_conge"
+    assert classifier.classify_intent(normalize("merci beaucoup"))[0] == "politeness"
+
+    # Exemples négatifs et réponses libres du flow congé : aucune intention
+    for text in ["blablabla", "abc", "test", "rendez-vous medical", "2025-07-01", "annuel"]:
+        assert classifier.classify_intent(normalize(text))[0] is None, text
+
+
+def test_trained_classifier_batch_matches_single(trained_classifier):
+    messages = ["je veux poser un conge", "blablabla", "merci beaucoup", "rendez-vous medical"]
+    results = classify_batch(messages, correct=False)
+    assert [r["intent"] for r in results] == [classifier.classify_intent(normalize(m))[0] for m in messages]
+    assert [r["intent"] for r in results] == ["demande_conge", None, "politeness", None]
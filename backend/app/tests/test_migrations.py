@@ -0,0 +1,179 @@
+# backend/app/tests/test_migrations.py
+
+import threading
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("alembic")
+
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, text
+
+from app.database import Base
+from app.db_migrations import alembic_config, current_revision, migration_lock, upgrade_database
+from app.models import (  # noqa: F401
+    chat_logs, demande_conge, demande_fichier, instruction, notification, procedure_conge, task, task_detail, user,
+    workload,
+)
+
+
+@pytest.fixture
+def database(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    engine = create_engine(url)
+    yield url, engine
+    engine.dispose()
+
+
+def test_head_matches_models(database):
+    url, engine = database
+    upgrade_database(url)
+    assert current_revision(engine) == ScriptDirectory.from_config(alembic_config()).get_current_head()
+    with engine.connect() as conn:
+        diff = compare_metadata(MigrationContext.configure(conn), Base.metadata)
+    # Tables, colonnes et index (la réflexion SQLite des contraintes sans nom n'est pas comparable)
+    structural = [d for d in diff if isinstance(d, tuple) and d[0] in (
+        "add_table", "remove_table", "add_column", "remove_column", "add_index", "remove_index")]
+    assert structural == []
+
+
+def test_hot_query_indexes_are_added_by_0002(database):
+    url, engine = database
+    upgrade_database(url, "0001")
+    assert "ix_chat_logs_user_id_id" not in {i["name"] for i in inspect(engine).get_indexes("chat_logs")}
+    upgrade_database(url)
+    inspector = inspect(engine)
+    assert {i["name"] for i in inspector.get_indexes("notifications")} >= {"ix_notifications_user_id_is_read_created_at"}
+    assert {i["name"] for i in inspector.get_indexes("demandes_conge")} >= {"ix_demandes_conge_user_id_created_at"}
+    assert {i["name"] for i in inspector.get_indexes("users")} >= {"ix_users_department"}
+
+
+def test_existing_create_all_database_is_adopted(database):
+    url, engine = database
+    # Ancienne base : seule demandes_conge créée par create_all, avec des données
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE demandes_conge (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, "
+                          "type_conge VARCHAR(50) NOT NULL, date_debut DATETIME NOT NULL, date_fin DATETIME NOT NULL, "
+                          "raison TEXT, status VARCHAR(50), created_at DATETIME, updated_at DATETIME, preuve VARCHAR(255))"))
+        conn.execute(text("INSERT INTO demandes_conge (user_id, type_conge, date_debut, date_fin) "
+                          "VALUES (1, 'annuel', '2025-01-01', '2025-01-02')"))
+    upgrade_database(url)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM demandes_conge")).scalar() == 1
+        # Demande sans date de création : datée par 0006 (clé de pagination NOT NULL)
+        assert conn.execute(text("SELECT created_at FROM demandes_conge")).scalar().startswith("2025-01-01")
+    created_at = next(c for c in inspect(engine).get_columns("demandes_conge") if c["name"] == "created_at")
+    assert created_at["nullable"] is False
+    assert inspect(engine).has_table("users")
+
+
+def test_text_dates_are_backfilled_then_swapped(database):
+    url, engine = database
+    upgrade_database(url, "0002")
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, matricule, created_at, updated_at) "
+                          "VALUES (1, 'A001', '2024-05-02 08:30:00', 'pas une date')"))
+        conn.execute(text("INSERT INTO chat_logs (user_id, message, sender, timestamp) VALUES "
+                          "(1, 'bonjour', 'user', '03/06/2025 09:15'), (1, 'merci', 'user', NULL)"))
+        conn.execute(text("INSERT INTO tasks (user_id, task_type, requested_at) VALUES (1, 'congé', '2025-06-03 09:16:00')"))
+    upgrade_database(url, "0003")
+
+    from app.db_backfill import SHADOW_SUFFIX, backfill, pending_rows
+
+    # Pas de backfill implicite : 0004 refuse tant que des dates lisibles restent à convertir
+    with pytest.raises(RuntimeError, match="app.db_backfill"):
+        upgrade_database(url)
+    assert current_revision(engine) == "0003"
+
+    with engine.begin() as conn:
+        backfill(conn)
+        # Date modifiée après son backfill (ancienne API toujours en service) : la colonne fantôme
+        # est invalidée par le trigger au lieu de garder l'ancienne valeur
+        conn.execute(text("UPDATE chat_logs SET timestamp = '04/06/2025 10:00' WHERE message = 'bonjour'"))
+        assert conn.execute(text("SELECT timestamp_ts FROM chat_logs WHERE message = 'bonjour'")).scalar() is None
+        assert pending_rows(conn) == {"chat_logs": 1, "tasks": 0, "users": 0}
+    with pytest.raises(RuntimeError, match="chat_logs : 1"):
+        upgrade_database(url)
+
+    with engine.begin() as conn:
+        backfill(conn)
+        # 'pas une date' reste illisible : il ne bloque pas la bascule
+        assert pending_rows(conn) == {"chat_logs": 0, "tasks": 0, "users": 0}
+    upgrade_database(url)
+
+    columns = {c["name"]: c for c in inspect(engine).get_columns("chat_logs")}
+    assert "timestamp" + SHADOW_SUFFIX not in columns and "DATETIME" in str(columns["timestamp"]["type"]).upper()
+    with engine.connect() as conn:
+        stamps = conn.execute(text("SELECT timestamp FROM chat_logs ORDER BY id")).scalars().all()
+        user_dates = conn.execute(text("SELECT created_at, updated_at FROM users")).one()
+        requested_at = conn.execute(text("SELECT requested_at FROM tasks")).scalar()
+    assert stamps[0].startswith("2025-06-04 10:00") and stamps[1] is None
+    assert user_dates[0].startswith("2024-05-02 08:30") and user_dates[1] is None
+    assert requested_at.startswith("2025-06-03 09:16")
+
+
+def test_downgrade_to_0003_restores_sync_triggers(database):
+    url, engine = database
+    upgrade_database(url)
+    from alembic import command
+
+    command.downgrade(alembic_config(url), "0003")
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO chat_logs (user_id, message, timestamp, timestamp_ts) "
+                          "VALUES (1, 'x', '03/06/2025 09:15', '2025-06-03 09:15:00')"))
+        conn.execute(text("UPDATE chat_logs SET timestamp = '05/06/2025 09:15'"))
+        assert conn.execute(text("SELECT timestamp_ts FROM chat_logs")).scalar() is None
+
+
+def test_concurrent_upgrades_wait_for_the_migration_lock(database):
+    url, engine = database
+    errors = []
+
+    def upgrade():
+        try:
+            upgrade_database(url)
+        except Exception as error:
+            errors.append(error)
+
+    workers = [threading.Thread(target=upgrade) for _ in range(3)]
+    with migration_lock(url):
+        for worker in workers:
+            worker.start()
+        # Les workers attendent le verrou : aucune migration tant qu'il est tenu
+        for worker in workers:
+            worker.join(timeout=0.5)
+        assert all(worker.is_alive() for worker in workers)
+        assert current_revision(engine) is None
+    for worker in workers:
+        worker.join(timeout=60)
+        assert not worker.is_alive()
+    assert errors == []
+    assert current_revision(engine) == ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def test_startup_check_requires_head(database):
+    from app.db_migrations import ensure_database_at_head
+
+    url, engine = database
+    upgrade_database(url, "0003")
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        ensure_database_at_head(engine)
+    upgrade_database(url)
+    ensure_database_at_head(engine)
+
+
+def test_workload_aggregates_are_filled_by_0007(database):
+    url, engine = database
+    upgrade_database(url, "0006")
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (matricule, email, department, status, missions_status, current_missions) "
+                          "VALUES ('E1', 'e1@entreprise.com', 'Informatique', 'actif', 'en cours', 'a, b, c, d'), "
+                          "('E2', 'e2@entreprise.com', NULL, 'inactif', NULL, NULL)"))
+    upgrade_database(url)
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT department, total, actifs, en_cours, nb_missions, surcharges "
+                                 "FROM department_workloads ORDER BY department")).all()
+        assert [tuple(row) for row in rows] == [("Informatique", 1, 1, 1, 4, 1), ("Non défini", 1, 0, 0, 0, 0)]
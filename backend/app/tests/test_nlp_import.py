@@ -0,0 +1,41 @@
+# backend/app/tests/test_nlp_import.py
+
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Budget d'import à froid de app.nlp (interpréteur neuf, hors démarrage de Python)
+IMPORT_BUDGET_S = 0.5
+
+HEAVY_MODULES = [
+    "torch", "transformers", "spellchecker", "sklearn", "numpy",
+    "fastapi", "sqlalchemy", "psycopg2", "app.database", "app.main",
+]
+
+CHILD_CODE = """
+import json, sys, time
+t0 = time.perf_counter()
+from app.nlp import correct_spelling, detect_intent, extract_first_and_last_name, INTENT_KEYWORDS
+elapsed = time.perf_counter() - t0
+detect_intent("bonjour")
+extract_first_and_last_name("info user Khadija Benani")
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def run_child():
+    proc = subprocess.run([sys.executable, "-c", CHILD_CODE], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def test_nlp_import_has_no_heavy_dependencies():
+    loaded = set(run_child()["modules"])
+    assert [name for name in HEAVY_MODULES if name in loaded] == []
+
+
+def test_nlp_import_time_budget():
+    elapsed = min(run_child()["elapsed"] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_S, f"import app.nlp : {elapsed:.3f}s (budget {IMPORT_BUDGET_S}s)"
@@ -0,0 +1,84 @@
+# backend/app/tests/test_normalized_message.py
+
+from collections import Counter
+
+import app.nlp.message as message_module
+from app.nlp import NormalizedMessage, detect_intent
+
+
+def count_stages(monkeypatch, counts):
+    """Compter les appels à chaque étape du pipeline de normalisation"""
+    real_normalize = message_module.normalize
+    real_match = message_module.INTENT_MATCHER.match_normalized
+
+    def normalize(text):
+        counts["normalize"] += 1
+        return real_normalize(text)
+
+    def match_normalized(text):
+        counts["intent"] += 1
+        return real_match(text)
+
+    def classify_intent(text):
+        counts["classifier"] += 1
+        return ("responsable_rh", 0.9) if "chef" in text else (None, 0.1)
+
+    monkeypatch.setattr(message_module, "normalize", normalize)
+    monkeypatch.setattr(message_module.INTENT_MATCHER, "match_normalized", match_normalized)
+    monkeypatch.setattr(message_module, "classify_intent", classify_intent)
+
+
+def test_each_stage_runs_once(monkeypatch):
+    counts = Counter()
+    count_stages(monkeypatch, counts)
+
+    def correct_spelling(text):
+        counts["spelling"] += 1
+        return text.replace("vacanse", "vacances")
+
+    nm = NormalizedMessage("Je pars en  Vacanse à Noël", correct_spelling)
+
+    # Lectures répétées, comme dans les différentes branches de /chat/
+    for _ in range(5):
+        assert nm.intent == "demande_conge"
+        assert nm.normalized == "je pars en vacances a noel"
+        assert nm.corrected == "je pars en  vacances à noël"
+        assert nm.tokens == ["je", "pars", "en", "vacances", "à", "noël"]
+
+    # Le classifieur n'est pas consulté quand un mot-clé correspond
+    assert counts == Counter({"spelling": 1, "normalize": 1, "intent": 1})
+    assert nm.intent_source == "keywords"
+
+
+def test_classifier_runs_once_on_keyword_miss(monkeypatch):
+    counts = Counter()
+    count_stages(monkeypatch, counts)
+
+    nm = NormalizedMessage("qui est notre chef des ressources humaines", lambda text: text)
+    for _ in range(3):
+        assert nm.best_intent == "responsable_rh"
+    # La prédiction reste séparée de l'intention des mots-clés
+    assert (nm.intent, nm.predicted_intent) == (None, "responsable_rh")
+    assert (nm.intent_source, nm.intent_confidence) == ("classifier", 0.9)
+
+    nm = NormalizedMessage("zorglub", lambda text: text)
+    assert (nm.best_intent, nm.intent_source, nm.intent_confidence) == (None, None, 0.1)
+    assert counts == Counter({"normalize": 2, "intent": 2, "classifier": 2})
+
+
+def test_matches_detect_intent_on_corrected_text(monkeypatch):
+    monkeypatch.setattr(message_module, "classify_intent", lambda text: (None, None))
+    messages = ["Bonjour", "quelle est la procedure pour poser un congé ?", "mes congés", "rapport charge travail", "", "xyz"]
+    for raw in messages:
+        nm = NormalizedMessage(raw, lambda text: text)
+        assert nm.raw == raw
+        assert nm.lowered == raw.lower()
+        assert nm.intent == detect_intent(nm.corrected)
+
+
+def test_missing_message_is_empty(monkeypatch):
+    monkeypatch.setattr(message_module, "classify_intent", lambda text: (None, None))
+    nm = NormalizedMessage(None, lambda text: text)
+    assert nm.corrected == ""
+    assert nm.tokens == []
+    assert nm.intent is None
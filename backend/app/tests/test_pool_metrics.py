@@ -0,0 +1,43 @@
+# backend/app/tests/test_pool_metrics.py
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, exc
+
+from app.services.pool_metrics import InstrumentedQueuePool, pool_stats
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=1, pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_stats_track_in_use_idle_and_overflow(engine):
+    first = engine.connect()
+    second = engine.connect()
+    stats = pool_stats(engine.pool)
+    assert (stats["size"], stats["max_overflow"], stats["in_use"], stats["overflow"]) == (1, 1, 2, 1)
+
+    second.close()
+    first.close()
+    stats = pool_stats(engine.pool)
+    assert stats["in_use"] == 0 and stats["idle"] == 1
+    assert stats["checkout_wait"]["count"] == 2
+
+
+def test_checkout_timeout_is_counted(engine):
+    held = [engine.connect(), engine.connect()]
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    stats = pool_stats(engine.pool)
+    assert stats["timeouts"] == 1
+    assert stats["checkout_wait"]["max_ms"] >= 50
+    for conn in held:
+        conn.close()
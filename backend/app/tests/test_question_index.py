@@ -0,0 +1,76 @@
+# backend/app/tests/test_question_index.py
+
+import pytest
+
+pytest.importorskip("sklearn")
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from nlp_model import NLPModel, QuestionIndex
+
+QUESTIONS = [
+    "comment poser un conge", "quel est mon solde de conges", "horaires du service rh",
+    "qui est le responsable rh", "comment contacter le service rh", "prevision de charge de travail",
+]
+
+
+@pytest.fixture
+def model():
+    model = NLPModel()
+    model.train(QUESTIONS, list(range(len(QUESTIONS))))
+    return model
+
+
+def test_index_matches_full_cosine_similarity(model):
+    index = QuestionIndex(model.vectorizer, QUESTIONS)
+    for message in ["poser un conge", "contacter rh", "charge travail equipe", "mot inconnu"]:
+        expected = cosine_similarity(model.vectorizer.transform([message]), model.vectorizer.transform(QUESTIONS)).ravel()
+        assert np.allclose(index.scores(message), expected)
+        assert index.most_similar(message) == QUESTIONS[int(np.argmax(expected))]
+        assert model.find_most_similar(QUESTIONS, message) == QUESTIONS[int(np.argmax(expected))]
+
+
+def test_incremental_add_and_top_k(model):
+    index = QuestionIndex(model.vectorizer, QUESTIONS[:3])
+    index.add(QUESTIONS[3:])
+    assert len(index) == len(QUESTIONS)
+    assert index.matrix.shape[0] == len(QUESTIONS)
+
+    top = index.top_k("service rh", k=3)
+    assert [q for q, _ in top][:1] == ["horaires du service rh"]
+    assert [s for _, s in top] == sorted((s for _, s in top), reverse=True)
+    assert len(index.top_k("service rh", k=50)) == len(QUESTIONS)
+
+
+def test_find_most_similar_extends_index_on_append(model, monkeypatch):
+    questions = QUESTIONS[:3]
+    model.find_most_similar(questions, "poser un conge")
+    index = model.question_index
+
+    rebuilds = []
+    original_build = model.build_question_index
+    monkeypatch.setattr(model, "build_question_index", lambda qs: rebuilds.append(qs) or original_build(qs))
+
+    # Ajouts en fin (même liste puis nouvelle liste prolongeant la première) : index étendu, pas reconstruit
+    questions.append(QUESTIONS[3])
+    assert model.find_most_similar(questions, "responsable rh") == "qui est le responsable rh"
+    assert model.find_most_similar(QUESTIONS, "contacter le service rh") == "comment contacter le service rh"
+    assert rebuilds == []
+    assert model.question_index is index and index.questions == QUESTIONS
+    assert index.matrix.shape[0] == len(QUESTIONS)
+
+    # Liste réellement différente : reconstruction
+    assert model.find_most_similar(QUESTIONS[::-1], "poser un conge") == "comment poser un conge"
+    assert len(rebuilds) == 1 and model.question_index is not index
+
+
+def test_find_most_similar_rebuilds_after_in_place_edit(model):
+    questions = QUESTIONS[:3]
+    assert model.find_most_similar(questions, "prevision de charge de travail") != "prevision de charge de travail"
+    index = model.question_index
+
+    # Même objet liste modifié en place : l'index ne doit pas servir l'ancienne question
+    questions[1] = "prevision de charge de travail"
+    assert model.find_most_similar(questions, "prevision de charge de travail") == "prevision de charge de travail"
+    assert model.question_index is not index and model.question_index.questions == questions
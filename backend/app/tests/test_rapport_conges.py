@@ -0,0 +1,114 @@
+# backend/app/tests/test_rapport_conges.py
+
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app.crud.demande_conge import get_demandes_report_stats, iter_demandes_detaillees
+from app.models.demande_conge import DemandeConge
+from app.models.user import User
+
+TYPES = ["annuel", "maladie", "maternité", ""]
+STATUTS = ["approuvé", "en attente", "refusé"]
+DEPARTEMENTS = ["Informatique", "RH", None]
+
+
+@pytest.fixture
+def demandes(db_session):
+    users = [User(matricule=f"E{i:03d}", first_name=f"Prenom{i}", last_name=f"Nom{i}", department=DEPARTEMENTS[i % 3],
+                  email=f"e{i}@entreprise.com") for i in range(6)]
+    db_session.add_all(users)
+    db_session.flush()
+    rows = []
+    for i in range(25):
+        debut = datetime(2025, 1 + i % 4, 1 + i % 20)
+        rows.append(DemandeConge(
+            user_id=users[i % 6].id, type_conge=TYPES[i % 4], status=STATUTS[i % 3],
+            date_debut=debut, date_fin=debut + timedelta(days=i % 5, hours=9),
+            preuve="uploads/p.pdf" if i % 4 == 0 else ("" if i % 4 == 1 else None),
+            created_at=datetime(2025, 1 + i % 6, 10, 8) + timedelta(minutes=i),
+        ))
+    db_session.add_all(rows)
+    db_session.commit()
+    return rows, {u.id: u for u in users}
+
+
+def test_stats_match_rows(db_session, demandes):
+    rows, users = demandes
+    stats = get_demandes_report_stats(db_session)
+
+    assert stats["total"] == len(rows)
+    assert stats["somme_durees"] == sum((d.date_fin.date() - d.date_debut.date()).days + 1 for d in rows)
+    assert stats["avec_justificatif"] == sum(1 for d in rows if d.preuve)
+    assert stats["par_type"] == Counter(d.type_conge or "Non spécifié" for d in rows)
+    assert stats["par_statut"] == Counter(d.status for d in rows)
+    assert stats["par_departement"] == Counter(users[d.user_id].department or "Non défini" for d in rows)
+    assert stats["par_mois"] == Counter(d.created_at.strftime("%Y-%m") for d in rows)
+
+
+def test_empty_table_stats(db_session):
+    stats = get_demandes_report_stats(db_session)
+    assert (stats["total"], stats["somme_durees"], stats["par_type"], stats["par_mois"]) == (0, 0, {}, {})
+
+
+def test_detailed_rows_are_streamed_newest_first(db_session, demandes):
+    rows, _ = demandes
+    details = iter_demandes_detaillees(db_session, batch_size=4)
+    assert not isinstance(details, list)
+    details = list(details)
+    assert [d["id"] for d in details] == [d.id for d in sorted(rows, key=lambda d: d.created_at, reverse=True)]
+    assert {d["preuve_fournie"] for d in details} == {"Oui", "Non"}
+    assert all(d["employe"].startswith("Prenom") and d["duree_jours"] >= 1 for d in details)
+
+
+def test_report_file_contains_details(db_session, demandes, tmp_path, monkeypatch):
+    pytest.importorskip("fastapi")
+    from app.main import generer_rapport_conges, sauvegarder_rapport
+
+    rapport = generer_rapport_conges(db_session)
+    assert "demandes_detaillees" not in rapport
+    assert rapport["statistiques_globales"]["avec_justificatif"] == 7
+
+    monkeypatch.chdir(tmp_path)
+    filename, file_path = sauvegarder_rapport(rapport, "conges", 1, iter_demandes_detaillees(db_session))
+    contenu = open(file_path, encoding="utf-8").read()
+    assert filename and "DEMANDES DÉTAILLÉES" in contenu
+    assert sum(1 for line in contenu.splitlines() if line.startswith("• #")) == len(demandes[0])
+    assert contenu.rstrip().endswith("=" * 80)
+
+
+def test_report_runs_in_io_pool_with_its_own_session(sqlite_engine, db_session, demandes, tmp_path, monkeypatch):
+    pytest.importorskip("fastapi")
+    import asyncio
+
+    from sqlalchemy.orm import sessionmaker
+
+    import app.main
+    from app.services.executors import InstrumentedExecutor
+    from app.services.sql_metrics import count_queries
+
+    opened = []
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=sqlite_engine)
+    monkeypatch.setattr(app.main, "SessionLocal", lambda: opened.append(factory()) or opened[-1])
+    monkeypatch.chdir(tmp_path)
+    executor = InstrumentedExecutor("io", max_workers=1)
+
+    async def main():
+        with count_queries() as counter:
+            result = await executor.run(app.main.produire_rapport_conges, 1)
+        return counter.count, result
+
+    try:
+        queries, (rapport, filename, file_path) = asyncio.run(main())
+    finally:
+        executor.shutdown()
+
+    assert len(opened) == 1 and opened[0] is not db_session
+    # Statistiques (5 requêtes) + détail, comptés dans le contexte de l'appelant
+    assert queries == 6
+    assert rapport["metadata"]["total_demandes"] == len(demandes[0])
+    contenu = open(file_path, encoding="utf-8").read()
+    assert filename and sum(1 for line in contenu.splitlines() if line.startswith("• #")) == len(demandes[0])
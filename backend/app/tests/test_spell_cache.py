@@ -0,0 +1,71 @@
+# backend/app/tests/test_spell_cache.py
+
+import threading
+
+import app.nlp.spelling as spelling
+from app.nlp.cache import LRUCache
+
+
+def test_lru_eviction_and_counters():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "a" devient le plus récent
+    cache.put("c", 3)  # évince "b"
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+
+
+def test_none_corrections_are_cached():
+    cache = LRUCache(10)
+    calls = []
+
+    def compute(word):
+        calls.append(word)
+        return None
+
+    assert cache.get_or_compute("zzz", compute) is None
+    assert cache.get_or_compute("zzz", compute) is None
+    assert calls == ["zzz"]
+
+
+def test_concurrent_access_stays_bounded():
+    cache = LRUCache(50)
+
+    def worker(offset):
+        for i in range(2000):
+            key = (i + offset) % 120
+            cache.get_or_compute(key, lambda k: k * 2)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert stats["size"] == 50
+    assert stats["hits"] + stats["misses"] == 8 * 2000
+
+
+def test_correct_spelling_checks_each_word_once(monkeypatch):
+    calls = []
+    real_correct_word = spelling._correct_word
+
+    def counting_correct_word(word):
+        calls.append(word)
+        return real_correct_word(word)
+
+    monkeypatch.setattr(spelling, "SPELL_CACHE", LRUCache(100))
+    monkeypatch.setattr(spelling, "_correct_word", counting_correct_word)
+    monkeypatch.setattr(spelling, "is_french_word", lambda word: word in {"je", "veux", "un"})
+
+    for _ in range(3):
+        assert spelling.correct_spelling("je veux un conjé xqz") == "je veux un congé xqz"
+
+    assert sorted(calls) == ["conjé", "je", "un", "veux", "xqz"]
+    assert spelling.spell_cache_stats()["hits"] == 10
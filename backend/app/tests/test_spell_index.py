@@ -0,0 +1,94 @@
+# backend/app/tests/test_spell_index.py
+
+import random
+
+import pytest
+
+import app.nlp.spelling as spelling
+from app.nlp.cache import LRUCache
+from app.nlp.spell_index import FORMAT_VERSION, MAGIC, MmapSpellIndex, SpellIndexError, vocabulary_fingerprint, write_spell_index
+
+LEXICON = ["je", "veux", "un", "quoi", "mon", "c'est", "pour", "de", "le", "la", "des", "poser", "été", "congé"]
+
+
+def typo_variants(words, seed=7):
+    """Suppressions, insertions, substitutions et transpositions autour des mots métier"""
+    rng = random.Random(seed)
+    letters = "abcdeéèfghijklmnopqrstuvwxyz"
+    variants = set(words)
+    for word in words:
+        for i in range(len(word)):
+            variants.add(word[:i] + word[i + 1:])
+            variants.add(word[:i] + rng.choice(letters) + word[i + 1:])
+            variants.add(word[:i] + rng.choice(letters) + word[i:])
+            if i + 1 < len(word):
+                variants.add(word[:i] + word[i + 1] + word[i] + word[i + 2:])
+    return sorted(variants)
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    path = str(tmp_path / "spell_index.bin")
+    write_spell_index(path, spelling.domain_vocabulary(), LEXICON, spelling.DOMAIN_MAX_DISTANCE)
+    return path
+
+
+def test_mmap_lookups_match_in_memory_index(index_path):
+    in_memory = spelling.build_domain_index()
+    mmapped = MmapSpellIndex(index_path)
+
+    assert len(mmapped) == len(in_memory)
+    for word in typo_variants(sorted(set(spelling.domain_vocabulary()))):
+        assert (word in mmapped) == (word in in_memory), word
+        assert mmapped.best_match(word) == in_memory.best_match(word), word
+
+    assert mmapped.has_lexicon
+    assert all(mmapped.is_lexicon_word(word) for word in LEXICON)
+    assert not mmapped.is_lexicon_word("zorglub")
+
+
+def test_corrections_match_in_memory_checker(index_path, monkeypatch):
+    messages = [
+        "c'est quoi mon nom ?", "horairs du servise rh", "je veux un conjé", "contactr rh?",
+        "rapprt charge travial", "procedur pour poser un cong", "télécharjer le rapport", "bonjur zorglub",
+    ] + [" ".join(typo_variants(["congé", "rapport", "service"])[i:i + 4]) for i in range(0, 40, 4)]
+
+    monkeypatch.setattr(spelling, "DOMAIN_INDEX", spelling.build_domain_index())
+    monkeypatch.setattr(spelling, "SPELL_CACHE", LRUCache(0))
+    monkeypatch.setattr(spelling, "is_french_word", lambda word: word in LEXICON)
+    expected = [spelling.correct_spelling(message) for message in messages]
+
+    monkeypatch.setattr(spelling, "DOMAIN_INDEX", MmapSpellIndex(index_path))
+    monkeypatch.setattr(spelling, "is_french_word", spelling.DOMAIN_INDEX.is_lexicon_word)
+    assert [spelling.correct_spelling(message) for message in messages] == expected
+
+
+def test_rejects_stale_or_foreign_files(index_path, tmp_path):
+    fingerprint = vocabulary_fingerprint(spelling.domain_vocabulary(), spelling.DOMAIN_MAX_DISTANCE)
+    assert MmapSpellIndex(index_path, fingerprint).fingerprint == fingerprint
+
+    with pytest.raises(SpellIndexError):
+        MmapSpellIndex(index_path, vocabulary_fingerprint(["autre"], 2))
+
+    with open(index_path, "rb") as f:
+        data = bytearray(f.read())
+    data[len(MAGIC):len(MAGIC) + 4] = (FORMAT_VERSION + 1).to_bytes(4, "little")
+    bad_version = tmp_path / "bad_version.bin"
+    bad_version.write_bytes(bytes(data))
+    with pytest.raises(SpellIndexError):
+        MmapSpellIndex(str(bad_version))
+
+    with pytest.raises(SpellIndexError):
+        MmapSpellIndex(str(tmp_path / "absent.bin"))
+
+
+def test_lexicon_matches_pyspellchecker(tmp_path):
+    pytest.importorskip("spellchecker")
+    from app.nlp.build_spell_index import build_spell_index
+
+    path = str(tmp_path / "spell_index.bin")
+    build_spell_index(path)
+    mmapped = MmapSpellIndex(path)
+    checker = spelling.get_spell_checker()
+    for word in ["bonjour", "congé", "maison", "travail", "c'est", "zorglub", "xqzw", "rh"]:
+        assert mmapped.is_lexicon_word(word) == (word in checker), word
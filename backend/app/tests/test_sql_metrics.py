@@ -0,0 +1,52 @@
+# backend/app/tests/test_sql_metrics.py
+
+import contextvars
+import threading
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine, text
+
+from app.services.sql_metrics import SQLQueryStats, count_queries, install_query_counter
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    install_query_counter(engine)
+    install_query_counter(engine)  # idempotent
+    return engine
+
+
+def test_counts_queries_inside_block_only(engine):
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+        with count_queries() as counter:
+            conn.execute(text("select 1"))
+            conn.execute(text("select 2"))
+        conn.execute(text("select 3"))
+    assert counter.count == 2
+
+
+def test_counts_queries_from_worker_thread(engine):
+    # Les dépendances FastAPI synchrones tournent dans le pool de threads avec une copie du contexte
+    def query():
+        with engine.connect() as conn:
+            conn.execute(text("select 1"))
+
+    with count_queries() as counter:
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(query,))
+        thread.start()
+        thread.join()
+    assert counter.count == 1
+
+
+def test_stats_per_route():
+    stats = SQLQueryStats()
+    stats.record("GET /notifications/{matricule}", 2, 4.0)
+    stats.record("GET /notifications/{matricule}", 4, 6.0)
+    assert stats.snapshot() == {
+        "GET /notifications/{matricule}": {"requests": 2, "queries_per_request": 3.0, "max_queries": 4, "mean_ms": 5.0}
+    }
@@ -0,0 +1,47 @@
+# backend/app/tests/test_symspell.py
+
+import app.nlp.spelling as spelling
+from app.nlp.cache import LRUCache
+from app.nlp.symspell import SymSpellIndex, edit_distance, max_distance_for
+
+
+def test_edit_distance_counts_transpositions_once():
+    assert edit_distance("conge", "conge", 2) == 0
+    assert edit_distance("cogne", "conge", 2) == 1
+    assert edit_distance("horairs", "horaires", 2) == 1
+    assert edit_distance("abc", "xyzabc", 2) == 3  # au-delà du seuil
+
+
+def test_max_distance_scales_with_length():
+    assert [max_distance_for(w) for w in ("rh", "cong", "bonjr", "horairs")] == [0, 1, 1, 2]
+
+
+def test_lookup_prefers_closest_then_most_frequent():
+    index = SymSpellIndex()
+    index.add_words(["service", "servir", "horaires", "rapport", "rapport"])
+    assert index.lookup("servise") == "service"
+    assert index.lookup("rapprt") == "rapport"
+    assert index.lookup("horaires") == "horaires"
+    assert index.lookup("xyzxyzxyz") is None
+    assert index.lookup("srv") is None  # mots courts : pas de correction
+
+
+def test_domain_words_fast_path_and_unknown_words_kept(monkeypatch):
+    monkeypatch.setattr(spelling, "SPELL_CACHE", LRUCache(100))
+    monkeypatch.setattr(spelling, "is_french_word", lambda word: word in {"c'est", "quoi", "mon"})
+    # "nom" reste corrigé par COMMON_MISTAKES ; "c'est" n'est plus réécrit
+    assert spelling.correct_spelling("c'est quoi mon nom ?") == "c'est quoi mon last name ?"
+    assert spelling.correct_spelling("horairs du servise rh") == "horaires du service rh"
+    assert spelling.correct_spelling("contactr rh?") == "contacter rh?"
+    assert spelling.correct_spelling("zorglub") == "zorglub"
+
+
+def test_user_names_are_added_incrementally(monkeypatch):
+    monkeypatch.setattr(spelling, "NAMES_INDEX", SymSpellIndex())
+    monkeypatch.setattr(spelling, "SPELL_CACHE", LRUCache(100))
+    monkeypatch.setattr(spelling, "is_french_word", lambda word: False)
+
+    assert spelling.correct_spelling("kadija") == "kadija"
+    assert spelling.add_proper_nouns(["Khadija", None, "El Amrani"]) == 3
+    assert spelling.add_proper_nouns(["khadija"]) == 0
+    assert spelling.correct_spelling("kadija") == "khadija"
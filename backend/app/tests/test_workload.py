@@ -0,0 +1,105 @@
+# backend/app/tests/test_workload.py
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import update
+
+from app.models.user import User
+from app.services.sql_metrics import count_queries
+from app.services.workload import (
+    get_workload_analysis, parse_missions, recompute_workloads, register_workload_listeners, verify_workloads,
+)
+
+
+@pytest.fixture
+def db(db_session):
+    register_workload_listeners()
+    return db_session
+
+
+def employe(i, department="Informatique", status="actif", missions_status="en cours", current_missions="a, b"):
+    return User(matricule=f"E{i:03d}", first_name=f"Prenom{i}", last_name=f"Nom{i}", email=f"e{i}@entreprise.com",
+                department=department, status=status, missions_status=missions_status, current_missions=current_missions)
+
+
+def full_scan(db):
+    """Analyse de référence : parcours complet des employés"""
+    departments, surcharges = {}, []
+    for user in db.query(User).order_by(User.id):
+        dept = user.department or "Non défini"
+        data = departments.setdefault(dept, {"total": 0, "actifs": 0, "en_cours": 0, "missions": set()})
+        missions = parse_missions(user.current_missions)
+        en_cours = bool(user.missions_status) and user.missions_status.lower() == "en cours"
+        data["total"] += 1
+        data["actifs"] += bool(user.status) and user.status.lower() == "actif"
+        data["en_cours"] += en_cours
+        data["missions"].update(missions)
+        if en_cours and len(missions) > 3:
+            surcharges.append((f"{user.first_name} {user.last_name}", dept, len(missions)))
+    return departments, surcharges
+
+
+def assert_consistent(db):
+    assert verify_workloads(db.connection()) == []
+    analyse = get_workload_analysis(db)
+    departments, surcharges = full_scan(db)
+    assert {dept: {**data, "missions": set(data["missions"])} for dept, data in analyse["departments"].items()} == departments
+    assert [(u["nom"], u["department"], u["nb_missions"]) for u in analyse["users_surcharges"]] == surcharges
+    return analyse
+
+
+def test_aggregates_follow_orm_writes(db):
+    users = [employe(0), employe(1, current_missions="a, b, c, d"), employe(2, department=None, status="inactif")]
+    db.add_all(users)
+    db.commit()
+    analyse = assert_consistent(db)
+    assert analyse["stats_globales"] == {"total_users": 3, "users_actifs": 2, "users_missions_en_cours": 3, "taux_activite": 66.7}
+    assert [u["nom"] for u in analyse["users_surcharges"]] == ["Prenom1 Nom1"]
+
+    # Objets expirés par le commit : modification sans relecture préalable
+    users[0].current_missions = "a, b, c, e, f"
+    users[1].missions_status = "en pause"
+    users[2].department = "RH"
+    db.commit()
+    analyse = assert_consistent(db)
+    assert [u["nom"] for u in analyse["users_surcharges"]] == ["Prenom0 Nom0"]
+    assert "Non défini" not in analyse["departments"]
+
+    db.delete(users[0])
+    db.commit()
+    analyse = assert_consistent(db)
+    assert analyse["users_surcharges"] == [] and analyse["departments"]["Informatique"]["total"] == 1
+
+
+def test_untracked_update_skips_aggregates(db):
+    db.add(employe(0))
+    db.commit()
+    user = db.query(User).one()
+    with count_queries() as counter:
+        user.telephone = "0600000000"
+        db.commit()
+    assert counter.count == 1  # UPDATE users seul
+
+
+def test_bulk_writes_are_detected_and_recomputed(db):
+    db.add_all([employe(i) for i in range(5)])
+    db.commit()
+    db.execute(update(User).values(missions_status="en pause"))  # hors événements ORM
+    db.commit()
+    assert verify_workloads(db.connection())
+    assert recompute_workloads(db.connection(), chunk_size=2) == {"users": 5, "departments": 1, "missions": 2}
+    db.commit()
+    assert assert_consistent(db)["stats_globales"]["users_missions_en_cours"] == 0
+
+
+def test_analysis_reads_do_not_grow_with_users(db):
+    counts = []
+    for start, size in ((0, 3), (3, 60)):
+        db.add_all([employe(i, department=f"D{i % 4}", current_missions="a, b, c, d") for i in range(start, start + size)])
+        db.commit()
+        with count_queries() as counter:
+            get_workload_analysis(db)
+        counts.append(counter.count)
+    assert counts == [3, 3]  # départements, missions, employés en surcharge
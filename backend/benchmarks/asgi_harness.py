@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Application FastAPI en processus pour les bancs d'essai de bout en bout.
+
+- base SQLite locale (DATABASE_URL positionnée avant l'import de app.main),
+  tables créées à partir de tous les modèles, employé de test inséré ;
+- GPT-2 remplacé par le backend "stub" (sauf GPT2_BACKEND déjà positionnée) ;
+- journalisation de app.main détournée : rien n'est écrit dans
+  backend/chatbot.log, les "Message corrigé" sont capturés en mémoire ;
+- client httpx sur ASGITransport : pas de serveur ni de réseau, les erreurs
+  de l'application reviennent en réponses 500 au lieu d'interrompre le rejeu.
+
+Usage :
+    harness = ChatHarness.create("/tmp/replay.db")
+    async with harness.client() as client:
+        response = await client.post("/chat/", json={"matricule": harness.matricule, "message": "Bonjour"})
+"""
+
+import logging
+import os
+import sys
+from collections import deque
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+CORRECTED_MARKER = "Message corrigé : "
+
+DEFAULT_USER = {
+    "matricule": "BENCH001",
+    "first_name": "Sara",
+    "last_name": "Alaoui",
+    "email": "sara.alaoui@entreprise.com",
+    "role": "employe",
+    "department": "Informatique",
+    "solde_conges": 18,
+    "solde_rtt": 5,
+    "statut_employe": "CDI",
+}
+
+
+class CorrectedMessageCapture(logging.Handler):
+    """Garde les textes "Message corrigé" émis par app.main"""
+
+    def __init__(self):
+        super().__init__(logging.INFO)
+        self.corrected = deque(maxlen=100)
+
+    def emit(self, record):
+        message = record.getMessage()
+        if message.startswith(CORRECTED_MARKER):
+            self.corrected.append(message[len(CORRECTED_MARKER):])
+
+
+class ChatHarness:
+    def __init__(self, main, capture, matricule):
+        self.main = main
+        self.capture = capture
+        self.matricule = matricule
+
+    @classmethod
+    def create(cls, db_path: str, user: dict = None, database_url: str = None):
+        """Importer app.main sur une base dédiée (SQLite db_path par défaut) et y créer l'employé de test"""
+        if "app.main" in sys.modules or "app.database" in sys.modules:
+            raise RuntimeError("ChatHarness.create doit être appelé avant tout import de app.main / app.database")
+        os.environ["DATABASE_URL"] = database_url or f"sqlite:///{os.path.abspath(db_path)}"
+        os.environ.setdefault("GPT2_BACKEND", "stub")
+
+        # Configurer la journalisation avant app.main : son basicConfig (fichier chatbot.log) devient sans effet
+        logging.basicConfig(level=logging.WARNING, handlers=[logging.StreamHandler()])
+        capture = CorrectedMessageCapture()
+        main_logger = logging.getLogger("app.main")
+        main_logger.setLevel(logging.INFO)
+        main_logger.addHandler(capture)
+        main_logger.propagate = False
+
+        import app.main as main
+        from app.database import Base, engine
+
+        Base.metadata.create_all(bind=engine)
+        user = {**DEFAULT_USER, **(user or {})}
+        harness = cls(main, capture, user["matricule"])
+        harness.add_users([user])
+
+        # Les événements de démarrage ne sont pas déclenchés par ASGITransport
+        main.load_spell_vocabulary()
+        return harness
+
+    def add_users(self, users):
+        """Insérer les employés absents (par matricule)"""
+        from app.database import SessionLocal
+        from app.models.user import User
+
+        db = SessionLocal()
+        try:
+            existing = {m for (m,) in db.query(User.matricule).filter(User.matricule.in_([u["matricule"] for u in users]))}
+            db.add_all(User(**user) for user in users if user["matricule"] not in existing)
+            db.commit()
+        finally:
+            db.close()
+
+    def client(self):
+        import httpx
+
+        transport = httpx.ASGITransport(app=self.main.app, raise_app_exceptions=False)
+        return httpx.AsyncClient(transport=transport, base_url="http://harness", timeout=None)
+
+    def reset_conversation(self):
+        """Oublier les étapes de conversation en cours (demande de congé, etc.)"""
+        self.main.temp_memory.clear()
+
+    def last_corrected(self):
+        return self.capture.corrected[-1] if self.capture.corrected else None
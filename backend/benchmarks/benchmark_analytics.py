@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Passage à l'échelle des analyses RH sur des organisations synthétiques.
+
+Pour chaque taille (--sizes, en nombre d'employés), une base SQLite neuve est
+remplie par benchmarks/synthetic_data.py, puis on mesure :
+  - analyser_charge_travail, generer_rapport_conges,
+    generer_rapport_charge_travail (appel direct, session dédiée) ;
+  - les endpoints correspondants : GET /admin/demandes-conge (première page,
+    page filtrée avec total, page 20 par curseur), la liste des congés et le
+    rapport de charge demandés par le chat d'un RH (client ASGI
+    en processus ; le rapport de congés n'a pas de mot-clé joignable, il ne
+    passe que par le classifieur de secours).
+Pour chaque mesure : durée (meilleur de --repeat) et nombre de requêtes SQL ;
+pour le rapport de congés complet (fichier détaillé compris), le pic mémoire.
+
+Avec --database-url, les mesures portent une seule fois sur la base indiquée,
+remplie au préalable (python benchmarks/synthetic_data.py --database-url ...).
+
+Usage (depuis backend/) :
+    python benchmarks/benchmark_analytics.py [--sizes 1000,10000,50000] [--repeat 3] [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from asgi_harness import ChatHarness
+from synthetic_data import create_engine_for, generate
+
+RH_MATRICULE = "BENCHRH01"
+RH_HEADERS = {"X-User-Matricule": RH_MATRICULE}
+DEEP_PAGE = 20
+ENDPOINTS = [
+    ("GET /admin/demandes-conge", "get", "/admin/demandes-conge", {"headers": RH_HEADERS}),
+    ("GET /admin/demandes-conge filtré+total", "get", "/admin/demandes-conge", {"headers": RH_HEADERS, "params": {
+        "status": "en attente", "department": "Informatique", "include_total": "true"}}),
+    ("chat : liste des congés", "post", "/chat/", {"json": {"matricule": RH_MATRICULE, "message": "liste des congés"}}),
+    ("chat : rapport charge", "post", "/chat/", {"json": {"matricule": RH_MATRICULE, "message": "rapport charge travail"}}),
+]
+
+
+def timed(func, repeat):
+    """(meilleure durée en ms, requêtes SQL du dernier appel)"""
+    from app.services.sql_metrics import count_queries
+
+    best = None
+    for _ in range(repeat):
+        with count_queries() as counter:
+            started = time.perf_counter()
+            func()
+            elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 1), counter.count
+
+
+def bench_functions(harness, session_factory, repeat):
+    main = harness.main
+    results = {}
+    for name in ("analyser_charge_travail", "generer_rapport_conges", "generer_rapport_charge_travail"):
+        function = getattr(main, name)
+
+        def call():
+            db = session_factory()
+            try:
+                function(db)
+            finally:
+                db.close()
+
+        results[name] = timed(call, repeat)
+    return results
+
+
+def report_memory(harness, session_factory):
+    """Pic mémoire Python (Ko, tracemalloc) du rapport de congés complet : agrégats + fichier détaillé écrit en flux"""
+    from app.crud.demande_conge import iter_demandes_detaillees
+
+    db = session_factory()
+    tracemalloc.start()
+    try:
+        rapport = harness.main.generer_rapport_conges(db)
+        harness.main.sauvegarder_rapport(rapport, "conges", 0, iter_demandes_detaillees(db))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        db.close()
+    return round(peak / 1024, 1)
+
+
+def bench_endpoints(harness, repeat):
+    results = {}
+
+    async def deep_page_endpoint(client):
+        """Requête de la page DEEP_PAGE de la liste RH (curseurs suivis une fois, hors mesure)"""
+        params = {}
+        for _ in range(DEEP_PAGE - 1):
+            cursor = (await client.get("/admin/demandes-conge", headers=RH_HEADERS, params=params)).json().get("next_cursor")
+            if not cursor:
+                break
+            params = {"cursor": cursor}
+        return (f"GET /admin/demandes-conge page {DEEP_PAGE}", "get", "/admin/demandes-conge", {"headers": RH_HEADERS, "params": params})
+
+    async def run():
+        async with harness.client() as client:
+            for label, method, path, kwargs in ENDPOINTS + [await deep_page_endpoint(client)]:
+                best, queries = None, None
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    response = await getattr(client, method)(path, **kwargs)
+                    elapsed = (time.perf_counter() - started) * 1000
+                    if response.status_code >= 400:
+                        raise RuntimeError(f"{label} : HTTP {response.status_code} {response.text[:200]}")
+                    best = elapsed if best is None else min(best, elapsed)
+                    queries = int(response.headers.get("X-SQL-Queries", 0))
+                results[label] = (round(best, 1), queries)
+
+    asyncio.run(run())
+    return results
+
+
+def use_database(harness, engine):
+    """Faire pointer get_db et get_async_db de l'application sur la base de engine"""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.database import get_db
+    from app.database_async import async_database_url, get_async_db
+    from app.services.sql_metrics import install_query_counter
+
+    install_query_counter(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async_engine = create_async_engine(async_database_url(engine.url.render_as_string(hide_password=False)))
+    install_query_counter(async_engine.sync_engine)
+    async_session_factory = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with async_session_factory() as db:
+            yield db
+
+    harness.main.app.dependency_overrides[get_db] = override_get_db
+    harness.main.app.dependency_overrides[get_async_db] = override_get_async_db
+    return session_factory
+
+
+def bench_size(harness, engine, users, repeat):
+    from app.models.user import User
+
+    row = {"users": users}
+    if users is not None:
+        row["generation"] = generate(engine, users)
+    session_factory = use_database(harness, engine)
+    db = session_factory()
+    try:
+        if not db.query(User).filter(User.matricule == RH_MATRICULE).first():
+            db.add(User(matricule=RH_MATRICULE, first_name="Khadija", last_name="Benani", department="RH", role="rh"))
+            db.commit()
+        row["users"] = db.query(User).count()
+    finally:
+        db.close()
+    row["functions"] = bench_functions(harness, session_factory, repeat)
+    row["report_peak_kb"] = report_memory(harness, session_factory)
+    row["endpoints"] = bench_endpoints(harness, repeat)
+    return row
+
+
+def print_report(rows):
+    print("📈 PASSAGE À L'ÉCHELLE DES ANALYSES RH")
+    print("=" * 78)
+    for row in rows:
+        print(f"\n👥 {row['users']} employés")
+        for name, stats in row.get("generation", {}).items():
+            print(f"   chargement {name:<16} {stats['rows']:>10} lignes en {stats['seconds']} s")
+        print(f"   {'Mesure':<36} {'durée (ms)':>14} {'requêtes SQL':>14}")
+        print("   " + "-" * 66)
+        for name, (elapsed, queries) in {**row["functions"], **row["endpoints"]}.items():
+            print(f"   {name:<36} {elapsed:>14} {queries:>14}")
+        print(f"   Rapport de congés avec détail : pic mémoire {row['report_peak_kb']} Ko (tracemalloc)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Durée des analyses RH selon la taille de l'organisation")
+    parser.add_argument("--sizes", default="1000,10000", help="nombres d'employés, séparés par des virgules")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--database-url", help="mesurer une base déjà remplie au lieu de bases SQLite neuves")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--output", help="écrire les résultats JSON dans ce fichier")
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        harness = ChatHarness.create(os.path.join(tmp, "harness.db"))
+        cwd = os.getcwd()
+        os.chdir(tmp)  # rapports écrits par sauvegarder_rapport (chemin relatif)
+        try:
+            if args.database_url:
+                rows.append(bench_size(harness, create_engine_for(args.database_url), None, args.repeat))
+            else:
+                for size in (int(s) for s in args.sizes.split(",")):
+                    engine = create_engine_for(f"sqlite:///{os.path.join(tmp, f'synth_{size}.db')}")
+                    rows.append(bench_size(harness, engine, size, args.repeat))
+                    engine.dispose()
+        finally:
+            os.chdir(cwd)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+    if args.json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+    else:
+        print_report(rows)
+
+
+if __name__ == "__main__":
+    main()
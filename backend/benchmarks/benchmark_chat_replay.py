@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rejeu du trafic réel de chatbot.log contre /chat/, en processus.
+
+Les paires "Message original" / "Message corrigé" du journal (rotations et
+.gz compris, voir app/nlp/chat_log.py) sont renvoyées une par une à
+l'application via un client ASGI, sur une base SQLite locale avec un employé
+de test (benchmarks/asgi_harness.py). Pour chaque message :
+  - latence de bout en bout de /chat/ et code HTTP ;
+  - texte corrigé produit aujourd'hui (capturé dans les logs de app.main),
+    comparé à l'entrée (taux de changement) et au texte corrigé journalisé.
+
+L'état de conversation (temp_memory) est remis à zéro entre deux messages,
+sauf avec --keep-state, pour que chaque message soit rejoué isolément.
+
+Usage (depuis backend/) :
+    python benchmarks/benchmark_chat_replay.py [--log backend/chatbot.log] [--dedupe 2] [--limit 200]
+    python benchmarks/benchmark_chat_replay.py --json --output replay.json
+"""
+
+import argparse
+import asyncio
+import difflib
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from asgi_harness import ChatHarness
+from app.nlp.chat_log import iter_logged_messages, rotated_log_files
+from app.services.metrics import percentile
+
+
+def word_diff(logged: str, replayed: str) -> str:
+    """Différence mot à mot : "-ancien +nouveau" pour chaque écart"""
+    logged_words, replayed_words = logged.split(), replayed.split()
+    parts = []
+    matcher = difflib.SequenceMatcher(a=logged_words, b=replayed_words, autojunk=False)
+    for op, a0, a1, b0, b1 in matcher.get_opcodes():
+        if op == "equal":
+            continue
+        removed, added = " ".join(logged_words[a0:a1]), " ".join(replayed_words[b0:b1])
+        parts.append(" ".join(p for p in (f"-{removed}" if removed else "", f"+{added}" if added else "") if p))
+    return ", ".join(parts)
+
+
+async def replay(harness, messages, keep_state):
+    results = []
+    async with harness.client() as client:
+        for logged in messages:
+            if not keep_state:
+                harness.reset_conversation()
+            harness.capture.corrected.clear()
+            start = time.perf_counter()
+            response = await client.post("/chat/", json={"matricule": harness.matricule, "message": logged.original})
+            latency_ms = (time.perf_counter() - start) * 1000
+            results.append({
+                "original": logged.original,
+                "logged": logged.corrected,
+                "replayed": harness.last_corrected(),
+                "status": response.status_code,
+                "latency_ms": latency_ms,
+            })
+    return results
+
+
+def summarize(results, elapsed):
+    latencies = sorted(r["latency_ms"] for r in results)
+    compared = [r for r in results if r["logged"] is not None and r["replayed"] is not None]
+    changed = [r for r in results if r["replayed"] is not None and r["replayed"] != r["original"].lower()]
+    logged_changed = [r for r in compared if r["logged"] != r["original"].lower()]
+    differences = Counter(
+        (r["original"], r["logged"], r["replayed"]) for r in compared if r["logged"] != r["replayed"]
+    )
+    return {
+        "messages": len(results),
+        "messages_per_s": round(len(results) / elapsed, 1) if elapsed else None,
+        "status": dict(sorted(Counter(r["status"] for r in results).items())),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(latencies[-1], 2),
+        } if latencies else None,
+        "correction": {
+            "change_rate": round(len(changed) / len(results), 3) if results else None,
+            "logged_change_rate": round(len(logged_changed) / len(compared), 3) if compared else None,
+            "compared": len(compared),
+            "same_as_logged": sum(1 for r in compared if r["logged"] == r["replayed"]),
+            "different_from_logged": sum(differences.values()),
+        },
+        "differences": [
+            {"original": original, "logged": logged, "replayed": replayed, "diff": word_diff(logged, replayed), "count": count}
+            for (original, logged, replayed), count in differences.most_common()
+        ],
+    }
+
+
+def print_report(summary, show):
+    print("🔁 REJEU DU TRAFIC RÉEL (/chat/)")
+    print("=" * 72)
+    print(f"   {summary['messages']} messages, {summary['messages_per_s']} msg/s, codes HTTP : {summary['status']}")
+    latency = summary["latency_ms"]
+    if latency:
+        print(f"   Latence (ms) : p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  max {latency['max']}")
+    correction = summary["correction"]
+    rate = lambda value: "-" if value is None else f"{value:.1%}"
+    print(f"   Messages modifiés par la correction : {rate(correction['change_rate'])} (journal : {rate(correction['logged_change_rate'])})")
+    print(f"   Sortie identique au journal : {correction['same_as_logged']}/{correction['compared']}")
+
+    if summary["differences"]:
+        print(f"\n{'Écarts avec le texte corrigé journalisé':<50} {'n':>5}")
+        print("-" * 72)
+        for item in summary["differences"][:show]:
+            print(f"   {item['original'][:46]:<46} {item['count']:>5}")
+            print(f"      {item['diff']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejeu de chatbot.log contre /chat/")
+    parser.add_argument("--log", default=os.path.join(BACKEND_DIR, "backend", "chatbot.log"))
+    parser.add_argument("--dedupe", type=float, default=None, help="ignorer les paires répétées à moins de N secondes")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--keep-state", action="store_true", help="conserver temp_memory entre les messages")
+    parser.add_argument("--db", help="fichier SQLite (temporaire par défaut)")
+    parser.add_argument("--show", type=int, default=20, help="écarts affichés")
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--output", help="écrire le résumé JSON dans ce fichier")
+    args = parser.parse_args()
+
+    messages = list(iter_logged_messages(rotated_log_files(args.log), dedupe_window=args.dedupe))[:args.limit]
+    with tempfile.TemporaryDirectory() as tmp:
+        harness = ChatHarness.create(args.db or os.path.join(tmp, "replay.db"))
+        start = time.perf_counter()
+        results = asyncio.run(replay(harness, messages, args.keep_state))
+        summary = summarize(results, time.perf_counter() - start)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    if args.json:
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+    else:
+        print_report(summary, args.show)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark des backends d'inférence GPT-2 (float32, int8, torchscript).
+
+Chaque backend est mesuré dans un interpréteur neuf pour isoler la mémoire :
+temps de chargement, RSS après chargement, latence par prompt (p50/p95),
+débit en tokens générés par seconde, et latence d'un lot complet.
+
+Le backend torchscript nécessite un export préalable :
+    python -m app.services.gpt2_backends export
+
+Usage (depuis backend/) :
+    python benchmarks/benchmark_gpt2_backends.py [--backends float32 int8 torchscript] [--runs 3] [--json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+PROMPTS = [
+    "Bonjour, comment puis-je poser un congé ?",
+    "Quelle est la procédure pour un congé maladie ?",
+    "Le service RH est-il ouvert le vendredi ?",
+    "Comment obtenir une attestation de travail ?",
+]
+
+CHILD_CODE = r"""
+import json, os, sys, time
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    import resource
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+from app.services.gpt2_backends import load_backend
+from app.services.metrics import percentile
+
+name = os.environ["BENCH_BACKEND"]
+prompts = json.loads(os.environ["BENCH_PROMPTS"])
+runs = int(os.environ["BENCH_RUNS"])
+
+t0 = time.perf_counter()
+backend = load_backend(name)
+result = {"backend": name, "load_s": round(time.perf_counter() - t0, 3), "rss_after_load_mb": rss_mb()}
+
+backend.generate_batch([prompts[0]])  # échauffement
+
+latencies, generated_tokens, total_time = [], 0, 0.0
+for _ in range(runs):
+    for prompt in prompts:
+        t0 = time.perf_counter()
+        reply = backend.generate_batch([prompt])[0]
+        elapsed = time.perf_counter() - t0
+        latencies.append(elapsed * 1000)
+        total_time += elapsed
+        generated_tokens += max(0, len(backend.tokenizer.encode(reply)) - len(backend.tokenizer.encode(prompt)))
+
+latencies.sort()
+result["latency_p50_ms"] = round(percentile(latencies, 50), 1)
+result["latency_p95_ms"] = round(percentile(latencies, 95), 1)
+result["tokens_per_s"] = round(generated_tokens / total_time, 1) if total_time else None
+
+t0 = time.perf_counter()
+backend.generate_batch(prompts)
+result["batch_latency_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+result["batch_size"] = len(prompts)
+result["peak_rss_mb"] = rss_mb()
+
+print("BENCH_RESULT " + json.dumps(result))
+"""
+
+
+def run_backend(name, runs):
+    env = dict(os.environ, BENCH_BACKEND=name, BENCH_PROMPTS=json.dumps(PROMPTS), BENCH_RUNS=str(runs))
+    proc = subprocess.run([sys.executable, "-c", CHILD_CODE], cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    for line in proc.stdout.splitlines():
+        if line.startswith("BENCH_RESULT "):
+            return json.loads(line[len("BENCH_RESULT "):])
+    return {"backend": name, "error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "aucune sortie"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Débit, latence et mémoire par backend GPT-2")
+    parser.add_argument("--backends", nargs="+", default=["float32", "int8", "torchscript"])
+    parser.add_argument("--runs", type=int, default=3, help="passages sur la liste de prompts")
+    parser.add_argument("--json", action="store_true", help="sortie JSON brute")
+    args = parser.parse_args()
+
+    results = [run_backend(name, args.runs) for name in args.backends]
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+
+    print("🧠 BENCHMARK DES BACKENDS GPT-2 (CPU)")
+    print("=" * 90)
+    print(f"{'Backend':<12} {'Chargement':>11} {'RSS (Mo)':>9} {'p50 (ms)':>9} {'p95 (ms)':>9} {'Tokens/s':>9} {'Lot (ms)':>9} {'Pic (Mo)':>9}")
+    print("-" * 90)
+    for r in results:
+        if "error" in r:
+            print(f"{r['backend']:<12} ❌ {r['error']}")
+            continue
+        print(f"{r['backend']:<12} {r['load_s']:>10.2f}s {r['rss_after_load_mb']:>9} {r['latency_p50_ms']:>9} "
+              f"{r['latency_p95_ms']:>9} {r['tokens_per_s']:>9} {r['batch_latency_ms']:>9} {r['peak_rss_mb']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Précision et latence du classifieur TF-IDF de secours, à côté du détecteur
+par mots-clés.
+
+Deux jeux d'évaluation :
+- TEST_DATA (corpus d'entraînement, donc mesure "en échantillon") ;
+- HELD_OUT : reformulations absentes du corpus et des mots-clés.
+
+Le modèle est entraîné sur le corpus courant, sauvegardé avec joblib puis
+rechargé par mmap, comme dans l'application.
+
+Usage (depuis backend/) :
+    python benchmarks/benchmark_intent_classifier.py [--threshold 0.5] [--repeat 200]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.nlp.intents import INTENT_MATCHER, normalize
+from app.nlp.train_intent_classifier import load_corpus, train_model
+from app.services.metrics import percentile
+from nlp_model import NLPModel
+
+HELD_OUT = [
+    ("je voudrais prendre quelques jours de repos", "demande_conge"),
+    ("je serai absent la semaine prochaine", "demande_conge"),
+    ("ou en est ma requete de conges", "suivi_mes_conges"),
+    ("statut de mes demandes de conges", "suivi_mes_conges"),
+    ("affiche l'historique de mes conversations", "chat_history"),
+    ("quels documents faut il fournir pour un conge", "procedure_conge"),
+    ("combien de temps a l'avance pour poser un conge", "procedure_conge"),
+    ("quelle est la charge de mon equipe ce mois", "workload_forecast"),
+    ("est ce que mon equipe est surchargee", "overload_alert"),
+    ("qui dirige les ressources humaines", "responsable_rh"),
+    ("a quelle heure ouvre le service rh", "horaires_rh"),
+    ("comment puis je joindre les ressources humaines", "contacter_rh_basic"),
+    ("pourquoi ce taux d'acceptation", "explain_percentage"),
+    ("genere moi un rapport des conges", "generate_leave_report"),
+    ("un grand merci", "politeness"),
+    ("bonsoir", "greeting"),
+    ("comment tu vas aujourd'hui", "status_query"),
+    ("c'est quoi ta mission exactement", "role_query"),
+    ("le ciel est bleu", None),
+    ("azerty", None),
+]
+
+
+def evaluate(dataset, predict):
+    correct = sum(1 for text, expected in dataset if predict(text) == expected)
+    return correct / len(dataset) * 100
+
+
+def latency_us(func, texts, repeat):
+    samples = []
+    for _ in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            func(text)
+            samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return percentile(samples, 50), percentile(samples, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mots-clés vs mots-clés + classifieur TF-IDF")
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "intent_classifier.joblib")
+        train_model().save(path)
+        model = NLPModel.load(path)
+
+        def keywords_only(text):
+            return INTENT_MATCHER.match_normalized(normalize(text))
+
+        def with_fallback(text):
+            normalized = normalize(text)
+            intent = INTENT_MATCHER.match_normalized(normalized)
+            if intent is None and normalized:
+                predicted, confidence = model.predict_with_confidence(normalized)
+                if confidence >= args.threshold:
+                    intent = predicted
+            return intent
+
+        test_data = load_corpus()
+        print("🎯 CLASSIFIEUR D'INTENTION TF-IDF DE SECOURS")
+        print("=" * 64)
+        print(f"   Seuil de confiance : {args.threshold}")
+        print(f"\n{'Jeu':<24} {'Mots-clés':>12} {'+ classifieur':>15}")
+        print("-" * 64)
+        for name, dataset in (("TEST_DATA (échantillon)", test_data), ("Reformulations", HELD_OUT)):
+            print(f"{name:<24} {evaluate(dataset, keywords_only):>11.1f}% {evaluate(dataset, with_fallback):>14.1f}%")
+
+        texts = [normalize(text) for text, _ in HELD_OUT]
+        kw_p50, kw_p95 = latency_us(INTENT_MATCHER.match_normalized, texts, args.repeat)
+        clf_p50, clf_p95 = latency_us(model.predict_with_confidence, texts, args.repeat)
+        print(f"\n{'Latence par message':<24} {'p50 (µs)':>12} {'p95 (µs)':>15}")
+        print("-" * 64)
+        print(f"{'Mots-clés':<24} {kw_p50:>12.1f} {kw_p95:>15.1f}")
+        print(f"{'Classifieur (mmap)':<24} {clf_p50:>12.1f} {clf_p95:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark du détecteur d'intention compilé (Aho-Corasick) contre l'ancienne
+détection séquentielle, sur le corpus TEST_DATA de test_model_accuracy.py.
+
+La référence reproduit le coût de l'ancien detect_intent : double
+normalisation, listes de mots-clés recréées à chaque appel et un any() par
+intention dans l'ordre de priorité. Les deux implémentations doivent renvoyer
+exactement la même intention pour chaque message.
+
+Usage (depuis backend/) :
+    python benchmarks/benchmark_intent_matcher.py [--repeat 2000]
+"""
+
+import argparse
+import ast
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.nlp.intents import INTENT_KEYWORDS, detect_intent, normalize
+
+
+def load_test_data():
+    """Lire TEST_DATA depuis test_model_accuracy.py sans importer app.main"""
+    path = os.path.join(BACKEND_DIR, "test_model_accuracy.py")
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "TEST_DATA" for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise RuntimeError("TEST_DATA introuvable dans test_model_accuracy.py")
+
+
+def detect_intent_sequential(message: str):
+    """Référence : l'ancien parcours intention par intention"""
+    message = normalize(normalize(message))
+    for intent, keywords in INTENT_KEYWORDS:
+        if any(kw in message for kw in list(keywords)):
+            return intent
+    return None
+
+
+def time_function(func, messages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            func(message)
+    elapsed = time.perf_counter() - start
+    return elapsed / (repeat * len(messages)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aho-Corasick vs détection séquentielle")
+    parser.add_argument("--repeat", type=int, default=2000, help="passages sur le corpus")
+    args = parser.parse_args()
+
+    test_data = load_test_data()
+    messages = [text for text, _ in test_data]
+
+    mismatches = [(m, detect_intent_sequential(m), detect_intent(m)) for m in messages if detect_intent_sequential(m) != detect_intent(m)]
+
+    print("⚡ BENCHMARK DU DÉTECTEUR D'INTENTION")
+    print("=" * 60)
+    print(f"   Corpus : {len(messages)} messages (TEST_DATA) x {args.repeat} passages")
+    print(f"   Mots-clés compilés : {sum(len(k) for _, k in INTENT_KEYWORDS)} pour {len(INTENT_KEYWORDS)} intentions")
+
+    sequential_us = time_function(detect_intent_sequential, messages, args.repeat)
+    compiled_us = time_function(detect_intent, messages, args.repeat)
+
+    print(f"\n   Séquentiel (ancien) : {sequential_us:8.2f} µs / message")
+    print(f"   Aho-Corasick        : {compiled_us:8.2f} µs / message")
+    print(f"   Gain                : x{sequential_us / compiled_us:.1f}")
+
+    if mismatches:
+        print(f"\n❌ {len(mismatches)} divergence(s) de résultat :")
+        for message, expected, got in mismatches:
+            print(f"   '{message}' : attendu {expected}, obtenu {got}")
+        sys.exit(1)
+    print("\n✅ Résultats identiques sur tout le corpus")
+
+
+if __name__ == "__main__":
+    main()
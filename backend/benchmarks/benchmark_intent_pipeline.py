@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark du pipeline d'intention du chat (correction orthographique +
+détection d'intention), étape par étape, comme NormalizedMessage :
+
+    minuscules -> correct_spelling -> normalize -> mots-clés -> classifieur (si aucun mot-clé)
+
+Rapporte le débit (messages/s, premier passage à cache vide puis régime
+établi), la latence p50/p95/p99 par étape et par intention, et la mémoire
+(pic tracemalloc, RSS). Corpus : TEST_DATA + messages réels de chatbot.log.
+
+Sortie JSON (--json / --output) et comparaison à une référence enregistrée :
+le script sort en erreur (code 1) si le débit en régime établi baisse de plus
+de --max-regression par rapport à la référence.
+
+Usage (depuis backend/) :
+    python benchmarks/benchmark_intent_pipeline.py [--passes 20] [--json] [--output resultats.json]
+    python benchmarks/benchmark_intent_pipeline.py --save-baseline     # enregistrer la référence de cette machine
+    python benchmarks/benchmark_intent_pipeline.py --max-regression 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+import app.nlp.spelling as spelling
+from app.nlp.batch import read_log_messages
+from app.nlp.classifier import classify_intent, get_intent_classifier
+from app.nlp.intents import INTENT_MATCHER, normalize
+from app.nlp.train_intent_classifier import load_corpus
+from app.services.metrics import percentile
+
+DEFAULT_LOG = os.path.join(BACKEND_DIR, "backend", "chatbot.log")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "intent_pipeline.json")
+STAGES = ["lower", "correct_spelling", "normalize", "keywords", "classifier"]
+
+
+def load_messages(log_path):
+    messages = [text for text, _ in load_corpus()]
+    if log_path:
+        messages += read_log_messages(log_path)
+    return messages
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    import resource
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def run_message(message, stage_samples):
+    """Une exécution du pipeline, chronométrée par étape ; retourne l'intention"""
+    clock = time.perf_counter
+    t0 = clock()
+    lowered = message.lower()
+    t1 = clock()
+    corrected = spelling.correct_spelling(lowered)
+    t2 = clock()
+    normalized = normalize(corrected)
+    t3 = clock()
+    intent = INTENT_MATCHER.match_normalized(normalized)
+    t4 = clock()
+    stage_samples["lower"].append((t1 - t0) * 1e6)
+    stage_samples["correct_spelling"].append((t2 - t1) * 1e6)
+    stage_samples["normalize"].append((t3 - t2) * 1e6)
+    stage_samples["keywords"].append((t4 - t3) * 1e6)
+    if intent is None:
+        intent, _ = classify_intent(normalized)
+        stage_samples["classifier"].append((clock() - t4) * 1e6)
+    return intent, (clock() - t0) * 1e6
+
+
+def summarize(samples):
+    if not samples:
+        return None
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "mean_us": round(sum(samples) / len(samples), 2),
+        "p50_us": round(percentile(samples, 50), 2),
+        "p95_us": round(percentile(samples, 95), 2),
+        "p99_us": round(percentile(samples, 99), 2),
+    }
+
+
+def run_benchmark(messages, passes):
+    get_intent_classifier()  # chargement hors mesure
+    spelling.SPELL_CACHE.clear()
+
+    # Premier passage : cache de correction vide
+    stage_samples = defaultdict(list)
+    tracemalloc.start()
+    start = time.perf_counter()
+    for message in messages:
+        run_message(message, stage_samples)
+    cold_elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Régime établi
+    stage_samples = defaultdict(list)
+    intent_samples = defaultdict(list)
+    start = time.perf_counter()
+    for _ in range(passes):
+        for message in messages:
+            intent, total_us = run_message(message, stage_samples)
+            intent_samples[intent or "none"].append(total_us)
+    warm_elapsed = time.perf_counter() - start
+
+    all_samples = [s for samples in intent_samples.values() for s in samples]
+    return {
+        "messages": len(messages),
+        "passes": passes,
+        "throughput": {
+            "cold_messages_per_s": round(len(messages) / cold_elapsed, 1),
+            "warm_messages_per_s": round(len(messages) * passes / warm_elapsed, 1),
+        },
+        "latency": summarize(all_samples),
+        "stages": {stage: summarize(stage_samples[stage]) for stage in STAGES},
+        "intents": {intent: summarize(samples) for intent, samples in sorted(intent_samples.items())},
+        "memory": {
+            "tracemalloc_peak_kb": round(peak / 1024, 1),
+            "rss_mb": rss_mb(),
+            "spell_cache": spelling.spell_cache_stats(),
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "domain_index": spelling.spell_cache_stats()["domain_index"],
+            "classifier": get_intent_classifier() is not None,
+        },
+    }
+
+
+def compare_to_baseline(result, baseline, max_regression):
+    """(régression détectée, message) sur le débit en régime établi"""
+    current = result["throughput"]["warm_messages_per_s"]
+    reference = baseline["throughput"]["warm_messages_per_s"]
+    change = (current - reference) / reference
+    message = f"Débit {current} msg/s vs référence {reference} msg/s ({change:+.1%}, tolérance -{max_regression:.0%})"
+    return change < -max_regression, message
+
+
+def print_report(result):
+    print("⚡ BENCHMARK DU PIPELINE D'INTENTION")
+    print("=" * 72)
+    print(f"   {result['messages']} messages x {result['passes']} passages")
+    print(f"   Débit : {result['throughput']['cold_messages_per_s']} msg/s (cache vide), "
+          f"{result['throughput']['warm_messages_per_s']} msg/s (régime établi)")
+    print(f"   Mémoire : pic {result['memory']['tracemalloc_peak_kb']} Ko (tracemalloc), RSS {result['memory']['rss_mb']} Mo")
+
+    print(f"\n{'Étape / intention':<28} {'n':>8} {'p50 (µs)':>10} {'p95 (µs)':>10} {'p99 (µs)':>10}")
+    print("-" * 72)
+    for name, stats in list(result["stages"].items()) + [("—", None)] + list(result["intents"].items()):
+        if name == "—":
+            print("-" * 72)
+            continue
+        if stats is None:
+            print(f"{name:<28} {'-':>8}")
+            continue
+        print(f"{name:<28} {stats['count']:>8} {stats['p50_us']:>10} {stats['p95_us']:>10} {stats['p99_us']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Débit et latence du pipeline d'intention")
+    parser.add_argument("--log", default=DEFAULT_LOG, help="chatbot.log à ajouter au corpus")
+    parser.add_argument("--passes", type=int, default=20, help="passages en régime établi")
+    parser.add_argument("--json", action="store_true", help="sortie JSON brute")
+    parser.add_argument("--output", help="écrire le résultat JSON dans ce fichier")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="référence à comparer")
+    parser.add_argument("--save-baseline", action="store_true", help="enregistrer ce résultat comme référence")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="baisse de débit tolérée (0.2 = 20 %%)")
+    args = parser.parse_args()
+
+    result = run_benchmark(load_messages(args.log), args.passes)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print_report(result)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Référence enregistrée : {args.baseline}", file=sys.stderr)
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nℹ️ Pas de référence ({args.baseline}) : lancez avec --save-baseline", file=sys.stderr)
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        regressed, message = compare_to_baseline(result, json.load(f), args.max_regression)
+    print(f"\n{'❌' if regressed else '✅'} {message}", file=sys.stderr)
+    if regressed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de NLPModel.find_most_similar : recalcul complet (ancienne version,
+transform de toutes les questions + cosine_similarity à chaque appel) contre
+l'index CSR précalculé (QuestionIndex, un seul produit scalaire creux).
+
+Les questions sont générées à partir du vocabulaire du corpus d'intentions
+pour 100 à 100 000 questions stockées.
+
+Usage (depuis backend/) :
+    python benchmarks/benchmark_question_index.py [--sizes 100 1000 10000 100000] [--queries 50]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from app.nlp.train_intent_classifier import training_examples
+from app.services.metrics import percentile
+from nlp_model import NLPModel, QuestionIndex
+
+
+def full_recompute(vectorizer, questions, user_message):
+    """Ancienne implémentation de find_most_similar"""
+    question_vectors = vectorizer.transform(questions)
+    user_vector = vectorizer.transform([user_message])
+    return questions[int(np.argmax(cosine_similarity(user_vector, question_vectors)))]
+
+
+def synthetic_questions(vocabulary, count, rng):
+    return [" ".join(rng.choices(vocabulary, k=rng.randint(3, 10))) for _ in range(count)]
+
+
+def latency_ms(func, queries):
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        func(query)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return percentile(samples, 50), percentile(samples, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="find_most_similar : recalcul complet vs index CSR")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100, 1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    examples = training_examples()
+    model = NLPModel()
+    model.train([text for text, _ in examples], [intent for _, intent in examples])
+    vocabulary = sorted({word for text, _ in examples for word in text.split()})
+    queries = synthetic_questions(vocabulary, args.queries, rng)
+
+    print("🔎 BENCHMARK DE L'INDEX DE SIMILARITÉ DES QUESTIONS")
+    print("=" * 92)
+    print(f"{'Questions':>10} {'Construction':>13} {'Ajout +1%':>10} {'Ancien p50':>11} {'Ancien p95':>11} "
+          f"{'Index p50':>10} {'Index p95':>10} {'Top-{} p50'.format(args.k):>10}")
+    print(f"{'':>10} {'(ms)':>13} {'(ms)':>10} {'(ms)':>11} {'(ms)':>11} {'(ms)':>10} {'(ms)':>10} {'(ms)':>10}")
+    print("-" * 92)
+    for size in args.sizes:
+        questions = synthetic_questions(vocabulary, size, rng)
+
+        start = time.perf_counter()
+        index = QuestionIndex(model.vectorizer, questions)
+        index.matrix
+        build_ms = (time.perf_counter() - start) * 1000
+
+        extra = synthetic_questions(vocabulary, max(1, size // 100), rng)
+        start = time.perf_counter()
+        index.add(extra)
+        index.matrix
+        add_ms = (time.perf_counter() - start) * 1000
+        questions = questions + extra
+
+        # L'ancienne version est coûteuse : moins de requêtes sur les grandes tailles
+        old_queries = queries[:max(3, args.queries * 1000 // max(size, 1000))]
+        mismatches = sum(1 for q in old_queries if full_recompute(model.vectorizer, questions, q) != index.most_similar(q))
+        old_p50, old_p95 = latency_ms(lambda q: full_recompute(model.vectorizer, questions, q), old_queries)
+        new_p50, new_p95 = latency_ms(index.most_similar, queries)
+        topk_p50, _ = latency_ms(lambda q: index.top_k(q, args.k), queries)
+
+        print(f"{len(questions):>10} {build_ms:>13.1f} {add_ms:>10.1f} {old_p50:>11.2f} {old_p95:>11.2f} "
+              f"{new_p50:>10.3f} {new_p95:>10.3f} {topk_p50:>10.3f}" + (f"  ❌ {mismatches} divergence(s)" if mismatches else ""))
+
+
+if __name__ == "__main__":
+    main()
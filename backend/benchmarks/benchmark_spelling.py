@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de la correction orthographique : index métier "symmetric delete"
+contre spell.correction (pyspellchecker), sur les mots réels de chatbot.log.
+
+Mesure le coût d'une recherche (cache désactivé) pour chaque moteur, puis
+rejoue tout le trafic à travers correct_spelling pour obtenir le taux de
+hits du cache LRU.
+
+Usage (depuis backend/) :
+    python benchmarks/benchmark_spelling.py [--log backend/chatbot.log] [--limit 300]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BACKEND_DIR)
+
+import app.nlp.spelling as spelling
+from app.nlp.cache import LRUCache
+
+ORIGINAL_MARKER = "Message original : "
+
+
+def read_messages(path):
+    messages = []
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if ORIGINAL_MARKER in line:
+                messages.append(line.split(ORIGINAL_MARKER, 1)[1].rstrip("\n"))
+    return messages
+
+
+def time_per_call(func, words):
+    start = time.perf_counter()
+    for word in words:
+        func(word)
+    return (time.perf_counter() - start) / len(words) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index métier vs pyspellchecker")
+    parser.add_argument("--log", default=os.path.join(BACKEND_DIR, "backend", "chatbot.log"))
+    parser.add_argument("--limit", type=int, default=300, help="mots distincts mesurés pour pyspellchecker")
+    args = parser.parse_args()
+
+    messages = read_messages(args.log)
+    words = sorted({word for message in messages for word in message.lower().split()})
+    words = [w for w in words if w not in spelling.COMMON_MISTAKES][:args.limit]
+
+    print("🔤 BENCHMARK DE LA CORRECTION ORTHOGRAPHIQUE")
+    print("=" * 60)
+    print(f"   {len(messages)} messages, {len(words)} mots distincts mesurés")
+    print(f"   Vocabulaire métier : {len(spelling.DOMAIN_INDEX)} mots")
+
+    checker = spelling.get_spell_checker()
+    for word in words:  # charger le lexique et chauffer les structures
+        spelling.is_french_word(word)
+
+    symspell_us = time_per_call(spelling._correct_word, words)
+    pyspell_us = time_per_call(checker.correction, words)
+    print(f"\n   Index métier (sans cache)   : {symspell_us:10.1f} µs / mot")
+    print(f"   spell.correction            : {pyspell_us:10.1f} µs / mot")
+    print(f"   Gain                        : x{pyspell_us / symspell_us:.0f}")
+
+    spelling.SPELL_CACHE = LRUCache(spelling.Config.SPELL_CACHE_SIZE)
+    start = time.perf_counter()
+    for message in messages:
+        spelling.correct_spelling(message.lower())
+    replay_ms = (time.perf_counter() - start) * 1000
+    stats = spelling.spell_cache_stats()
+    print(f"\n   Rejeu du trafic             : {replay_ms:.1f} ms pour {len(messages)} messages")
+    print(f"   Cache LRU                   : {stats['hits']} hits / {stats['misses']} misses (taux {stats['hit_rate']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark du démarrage de l'API et du worker GPT-2.
+
+Pour chaque mode de worker (lazy, process), un interpréteur neuf :
+  1. importe app.main et mesure le temps d'import + la RSS du processus API ;
+  2. déclenche la première génération GPT-2 (chargement du modèle) ;
+  3. mesure une seconde génération à chaud et la RSS de l'API et du worker.
+
+Usage (depuis backend/) :
+    python benchmarks/benchmark_startup.py [--modes lazy process] [--skip-generation] [--json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+CHILD_CODE = r"""
+import json, os, sys, time
+
+def rss_mb(pid="self"):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    import resource
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+result = {"mode": os.environ["GPT2_WORKER_MODE"], "rss_interpreter_mb": rss_mb()}
+t0 = time.perf_counter()
+try:
+    import app.main
+except Exception as e:
+    result["import_error"] = repr(e)
+    from app.services import inference_worker  # mesure sans la base de données
+result["import_s"] = round(time.perf_counter() - t0, 3)
+result["rss_after_import_mb"] = rss_mb()
+result["torch_loaded_at_import"] = "torch" in sys.modules
+
+if os.environ.get("SKIP_GENERATION") != "1":
+    from app.services.inference_worker import get_inference_worker
+    worker = get_inference_worker()
+    t0 = time.perf_counter()
+    worker.generate("Bonjour, comment puis-je poser un congé ?")
+    result["first_generation_s"] = round(time.perf_counter() - t0, 3)
+    t0 = time.perf_counter()
+    worker.generate("Quelle est la procédure pour les congés ?")
+    result["warm_generation_s"] = round(time.perf_counter() - t0, 3)
+    result["rss_api_after_generation_mb"] = rss_mb()
+    if getattr(worker, "pid", None):
+        result["rss_worker_mb"] = rss_mb(worker.pid)
+    worker.shutdown()
+
+print("BENCH_RESULT " + json.dumps(result))
+"""
+
+
+def run_mode(mode, skip_generation):
+    env = dict(os.environ, GPT2_WORKER_MODE=mode, SKIP_GENERATION="1" if skip_generation else "0")
+    proc = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith("BENCH_RESULT "):
+            return json.loads(line[len("BENCH_RESULT "):])
+    return {"mode": mode, "error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "aucune sortie"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temps de démarrage et mémoire de l'API selon le mode du worker GPT-2")
+    parser.add_argument("--modes", nargs="+", default=["lazy", "process"])
+    parser.add_argument("--skip-generation", action="store_true", help="mesurer uniquement l'import de l'API")
+    parser.add_argument("--json", action="store_true", help="sortie JSON brute")
+    args = parser.parse_args()
+
+    results = [run_mode(mode, args.skip_generation) for mode in args.modes]
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+
+    print("🚀 BENCHMARK DU DÉMARRAGE DE L'API")
+    print("=" * 60)
+    for r in results:
+        print(f"\n⚙️  Mode : {r['mode']}")
+        if "error" in r:
+            print(f"   ❌ Erreur : {r['error']}")
+            continue
+        if "import_error" in r:
+            print(f"   ⚠️  app.main non importable ({r['import_error']}), mesure sur le worker seul")
+        print(f"   Import de l'API          : {r['import_s']:.3f} s")
+        print(f"   torch chargé à l'import  : {'oui' if r['torch_loaded_at_import'] else 'non'}")
+        print(f"   RSS après import         : {r['rss_after_import_mb']} Mo")
+        if "first_generation_s" in r:
+            print(f"   1ère génération (froid)  : {r['first_generation_s']:.3f} s")
+            print(f"   Génération à chaud       : {r['warm_generation_s']:.3f} s")
+            print(f"   RSS API après génération : {r['rss_api_after_generation_mb']} Mo")
+            if "rss_worker_mb" in r:
+                print(f"   RSS processus worker     : {r['rss_worker_mb']} Mo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# backend/migrations/env.py
+
+"""Environnement Alembic : métadonnées des modèles de app.models, URL de Config.DATABASE_URL"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app.config import Config
+from app.database import Base
+from app.models import (  # noqa: F401  (enregistre les tables dans Base.metadata)
+    chat_logs, demande_conge, demande_fichier, instruction, notification, procedure_conge, task, task_detail, user,
+    workload,
+)
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def database_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or Config.DATABASE_URL
+
+
+def run_migrations_offline():
+    """Générer le SQL sans connexion (alembic upgrade head --sql)"""
+    context.configure(url=database_url(), target_metadata=target_metadata, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    engine = create_engine(database_url(), poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        # SQLite : ALTER TABLE limité, les modifications de colonnes passent par batch_alter_table
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
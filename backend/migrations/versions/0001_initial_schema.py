@@ -0,0 +1,154 @@
+"""Schéma initial (état des modèles avant les migrations)
+
+Les bases existantes ont été créées par create_all, parfois partiellement
+(seule demandes_conge était créée à l'import de app.database) : seules les
+tables absentes sont créées.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-06-02
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _missing(table_name: str) -> bool:
+    return not sa.inspect(op.get_bind()).has_table(table_name)
+
+
+def upgrade():
+    if _missing("users"):
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("matricule", sa.String()),
+            sa.Column("first_name", sa.String()),
+            sa.Column("last_name", sa.String()),
+            sa.Column("email", sa.String(), unique=True),
+            sa.Column("role", sa.String()),
+            sa.Column("department", sa.String()),
+            sa.Column("created_at", sa.String()),
+            sa.Column("updated_at", sa.String()),
+            sa.Column("status", sa.String()),
+            sa.Column("current_missions", sa.String()),
+            sa.Column("missions_status", sa.String()),
+            sa.Column("solde_conges", sa.DECIMAL()),
+            sa.Column("solde_rtt", sa.DECIMAL()),
+            sa.Column("statut_employe", sa.String()),
+            sa.Column("telephone", sa.String()),
+            sa.Column("adresse", sa.String()),
+            sa.Column("date_dernier_conge", sa.Date()),
+            sa.Column("date_maj_solde", sa.Date()),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_matricule", "users", ["matricule"], unique=True)
+
+    if _missing("chat_logs"):
+        op.create_table(
+            "chat_logs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("message", sa.String()),
+            sa.Column("sender", sa.String()),
+            sa.Column("timestamp", sa.String()),
+        )
+        op.create_index("ix_chat_logs_id", "chat_logs", ["id"])
+
+    if _missing("notifications"):
+        op.create_table(
+            "notifications",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("title", sa.String(255), nullable=False),
+            sa.Column("message", sa.Text(), nullable=False),
+            sa.Column("type", sa.String(50), nullable=False),
+            sa.Column("is_read", sa.Boolean()),
+            sa.Column("related_id", sa.Integer()),
+            sa.Column("created_at", sa.DateTime()),
+        )
+        op.create_index("ix_notifications_id", "notifications", ["id"])
+
+    if _missing("demandes_conge"):
+        op.create_table(
+            "demandes_conge",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("type_conge", sa.String(50), nullable=False),
+            sa.Column("date_debut", sa.DateTime(), nullable=False),
+            sa.Column("date_fin", sa.DateTime(), nullable=False),
+            sa.Column("raison", sa.Text()),
+            sa.Column("status", sa.String(50)),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("updated_at", sa.DateTime()),
+            sa.Column("preuve", sa.String(255)),
+        )
+        op.create_index("ix_demandes_conge_id", "demandes_conge", ["id"])
+
+    if _missing("demande_fichier"):
+        op.create_table(
+            "demande_fichier",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("fichier_csv", sa.String(), nullable=False),
+        )
+        op.create_index("ix_demande_fichier_id", "demande_fichier", ["id"])
+
+    if _missing("instructions"):
+        op.create_table(
+            "instructions",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("description", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.String()),
+            sa.Column("updated_at", sa.String()),
+        )
+        op.create_index("ix_instructions_id", "instructions", ["id"])
+
+    if _missing("procedure_conge"):
+        op.create_table(
+            "procedure_conge",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("titre", sa.String(), nullable=False, unique=True),
+            sa.Column("description", sa.Text(), nullable=False),
+            sa.Column("delai", sa.String()),
+        )
+        op.create_index("ix_procedure_conge_id", "procedure_conge", ["id"])
+
+    if _missing("tasks"):
+        op.create_table(
+            "tasks",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id")),
+            sa.Column("task_type", sa.String()),
+            sa.Column("status", sa.String()),
+            sa.Column("task_description", sa.String()),
+            sa.Column("requested_at", sa.String()),
+            sa.Column("completed_at", sa.String()),
+            sa.Column("created_at", sa.String()),
+            sa.Column("updated_at", sa.String()),
+        )
+        op.create_index("ix_tasks_id", "tasks", ["id"])
+
+    if _missing("task_details"):
+        op.create_table(
+            "task_details",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("task_id", sa.Integer(), sa.ForeignKey("tasks.id")),
+            sa.Column("field_name", sa.String()),
+            sa.Column("field_value", sa.String()),
+            sa.Column("created_at", sa.String()),
+            sa.Column("updated_at", sa.String()),
+        )
+        op.create_index("ix_task_details_id", "task_details", ["id"])
+
+
+def downgrade():
+    for table_name in ("task_details", "tasks", "procedure_conge", "instructions", "demande_fichier",
+                       "demandes_conge", "notifications", "chat_logs", "users"):
+        op.drop_table(table_name)
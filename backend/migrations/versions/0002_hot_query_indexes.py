@@ -0,0 +1,43 @@
+"""Index composites des requêtes chaudes
+
+- chat_logs (user_id, id)                   : dernier message d'un employé (ORDER BY id DESC LIMIT 1)
+- notifications (user_id, is_read, created_at) : notifications (non lues) d'un employé, triées, et compteur
+- demandes_conge (user_id, created_at)      : demandes d'un employé, les plus récentes d'abord
+- users (department)                        : destinataires RH des notifications
+
+Postgres : CREATE INDEX CONCURRENTLY, sans bloquer les écritures sur des
+tables déjà volumineuses.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-06-02
+"""
+
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_chat_logs_user_id_id", "chat_logs", ["user_id", "id"]),
+    ("ix_notifications_user_id_is_read_created_at", "notifications", ["user_id", "is_read", "created_at"]),
+    ("ix_demandes_conge_user_id_created_at", "demandes_conge", ["user_id", "created_at"]),
+    ("ix_users_department", "users", ["department"]),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, table_name, columns in INDEXES:
+                op.create_index(name, table_name, columns, postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table_name, columns in INDEXES:
+            op.create_index(name, table_name, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table_name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table_name)
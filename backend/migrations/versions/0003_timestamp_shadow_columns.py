@@ -0,0 +1,36 @@
+"""Colonnes DateTime fantômes pour les dates stockées en texte
+
+Ajoute <colonne>_ts (NULL) à côté de chat_logs.timestamp, des dates de tasks
+et de users, et les triggers qui remettent la colonne fantôme à NULL quand la
+colonne texte est modifiée. Remplissage : python -m app.db_backfill (voir
+app/db_backfill.py), bascule : révision 0004.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-06-09
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db_backfill import SHADOW_SUFFIX, TYPED_TIMESTAMPS, create_sync_triggers, drop_sync_triggers
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table_name, columns in TYPED_TIMESTAMPS.items():
+        for name in columns:
+            op.add_column(table_name, sa.Column(name + SHADOW_SUFFIX, sa.DateTime(), nullable=True))
+    create_sync_triggers(op.get_bind())
+
+
+def downgrade():
+    drop_sync_triggers(op.get_bind())
+    for table_name, columns in TYPED_TIMESTAMPS.items():
+        with op.batch_alter_table(table_name) as batch:
+            for name in columns:
+                batch.drop_column(name + SHADOW_SUFFIX)
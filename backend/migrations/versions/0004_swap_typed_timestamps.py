@@ -0,0 +1,62 @@
+"""Bascule vers les colonnes DateTime
+
+Le backfill n'est pas lancé ici (python -m app.db_backfill, hors ligne, à la
+révision 0003) : la migration bloque les écritures sur les trois tables
+(Postgres), refuse de continuer si des dates lisibles restent à convertir,
+puis supprime les triggers de synchronisation et les colonnes texte, et
+renomme les colonnes fantômes. La bascule ne touche que le catalogue. Index
+(user_id, timestamp) pour les historiques de chat sur une période.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-06-09
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db_backfill import SHADOW_SUFFIX, TYPED_TIMESTAMPS, create_sync_triggers, drop_sync_triggers, pending_rows
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+    if conn.dialect.name == "postgresql":
+        # Lectures permises, écritures en attente jusqu'à la fin de la bascule : rien ne peut
+        # redevenir « à convertir » entre la vérification et la suppression des colonnes texte
+        op.execute(f"LOCK TABLE {', '.join(TYPED_TIMESTAMPS)} IN SHARE ROW EXCLUSIVE MODE")
+    pending = {table_name: count for table_name, count in pending_rows(conn).items() if count}
+    if pending:
+        raise RuntimeError(
+            f"Dates encore à convertir ({', '.join(f'{t} : {n}' for t, n in pending.items())}). "
+            "Lancez `python -m app.db_backfill` puis relancez la migration."
+        )
+
+    drop_sync_triggers(conn)
+    for table_name, columns in TYPED_TIMESTAMPS.items():
+        with op.batch_alter_table(table_name) as batch:
+            for name in columns:
+                batch.drop_column(name)
+                batch.alter_column(name + SHADOW_SUFFIX, new_column_name=name, existing_type=sa.DateTime())
+    op.create_index("ix_chat_logs_user_id_timestamp", "chat_logs", ["user_id", "timestamp"])
+
+
+def downgrade():
+    op.drop_index("ix_chat_logs_user_id_timestamp", table_name="chat_logs")
+    for table_name, columns in TYPED_TIMESTAMPS.items():
+        with op.batch_alter_table(table_name) as batch:
+            for name in columns:
+                batch.alter_column(name, new_column_name=name + SHADOW_SUFFIX, existing_type=sa.DateTime())
+        with op.batch_alter_table(table_name) as batch:
+            for name in columns:
+                batch.add_column(sa.Column(name, sa.String(), nullable=True))
+        table = sa.table(table_name, *(sa.column(name) for name in columns),
+                         *(sa.column(name + SHADOW_SUFFIX) for name in columns))
+        op.execute(table.update().values({
+            name: sa.cast(table.c[name + SHADOW_SUFFIX], sa.String()) for name in columns
+        }))
+    create_sync_triggers(op.get_bind())
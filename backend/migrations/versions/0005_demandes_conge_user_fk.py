@@ -0,0 +1,48 @@
+"""Clé étrangère demandes_conge.user_id -> users.id
+
+Postgres : contrainte ajoutée NOT VALID (contrôle des nouvelles lignes sans
+parcourir la table sous verrou), puis validée si aucune demande ne référence
+un employé supprimé. Sinon elle reste NOT VALID et les demandes orphelines
+sont signalées ; VALIDATE CONSTRAINT à relancer après nettoyage.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-06-16
+"""
+
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+FK_NAME = "fk_demandes_conge_user_id_users"
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def upgrade():
+    conn = op.get_bind()
+    if conn.dialect.name != "postgresql":
+        with op.batch_alter_table("demandes_conge") as batch:
+            batch.create_foreign_key(FK_NAME, "users", ["user_id"], ["id"])
+        return
+
+    op.execute(f"ALTER TABLE demandes_conge ADD CONSTRAINT {FK_NAME} "
+               "FOREIGN KEY (user_id) REFERENCES users (id) NOT VALID")
+    orphans = conn.execute(sa.text(
+        "SELECT count(*) FROM demandes_conge d WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.id = d.user_id)"
+    )).scalar()
+    if orphans:
+        logger.warning(f"{orphans} demande(s) de congé sans employé : {FK_NAME} laissée NOT VALID")
+    else:
+        op.execute(f"ALTER TABLE demandes_conge VALIDATE CONSTRAINT {FK_NAME}")
+
+
+def downgrade():
+    with op.batch_alter_table("demandes_conge") as batch:
+        batch.drop_constraint(FK_NAME, type_="foreignkey")
@@ -0,0 +1,37 @@
+"""Index (created_at, id) pour la pagination par clé de la liste RH des demandes
+
+created_at devient NOT NULL : une date NULL casserait la clé (triée en tête sous
+DESC par PostgreSQL, comparaison de tuple à NULL). Les anciennes demandes sans
+date reçoivent leur date de modification, à défaut leur date de début.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-06-23
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("UPDATE demandes_conge SET created_at = COALESCE(updated_at, date_debut) WHERE created_at IS NULL")
+    with op.batch_alter_table("demandes_conge") as batch:
+        batch.alter_column("created_at", existing_type=sa.DateTime(), nullable=False)
+
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index("ix_demandes_conge_created_at_id", "demandes_conge", ["created_at", "id"],
+                            postgresql_concurrently=True, if_not_exists=True)
+    else:
+        op.create_index("ix_demandes_conge_created_at_id", "demandes_conge", ["created_at", "id"], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index("ix_demandes_conge_created_at_id", table_name="demandes_conge")
+    with op.batch_alter_table("demandes_conge") as batch:
+        batch.alter_column("created_at", existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,64 @@
+"""Agrégats de charge de travail (user_workloads, department_workloads, department_missions)
+
+Tables créées si absentes (create_all des jeux synthétiques), puis remplies
+par un recalcul complet depuis users. Elles sont ensuite tenues à jour par les
+événements ORM de User (voir app/services/workload.py).
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-06-30
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.workload import COUNTERS, recompute_workloads
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def _missing(table_name: str) -> bool:
+    return not sa.inspect(op.get_bind()).has_table(table_name)
+
+
+def upgrade():
+    if _missing("user_workloads"):
+        op.create_table(
+            "user_workloads",
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE",
+                                                             name="fk_user_workloads_user_id_users"), primary_key=True),
+            sa.Column("department", sa.String(), nullable=False),
+            sa.Column("actif", sa.Boolean(), nullable=False),
+            sa.Column("en_cours", sa.Boolean(), nullable=False),
+            sa.Column("nb_missions", sa.Integer(), nullable=False),
+            sa.Column("missions", sa.Text(), nullable=False),
+            sa.Column("surcharge", sa.Boolean(), nullable=False),
+        )
+        op.create_index("ix_user_workloads_surcharge", "user_workloads", ["surcharge"])
+
+    if _missing("department_workloads"):
+        op.create_table(
+            "department_workloads",
+            sa.Column("department", sa.String(), primary_key=True),
+            *(sa.Column(name, sa.Integer(), nullable=False) for name in COUNTERS),
+        )
+
+    if _missing("department_missions"):
+        op.create_table(
+            "department_missions",
+            sa.Column("department", sa.String(), primary_key=True),
+            sa.Column("mission", sa.String(), primary_key=True),
+            sa.Column("nb", sa.Integer(), nullable=False),
+        )
+
+    recompute_workloads(op.get_bind())
+
+
+def downgrade():
+    op.drop_table("department_missions")
+    op.drop_table("department_workloads")
+    op.drop_index("ix_user_workloads_surcharge", table_name="user_workloads")
+    op.drop_table("user_workloads")
@@ -1,13 +1,77 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.pipeline import Pipeline
 from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import normalize
+from scipy import sparse
+import joblib
 import numpy as np
 
+
+class QuestionIndex:
+    """Index de similarité cosinus sur une liste de questions.
+
+    Les questions sont vectorisées une seule fois (vectoriseur déjà entraîné) et
+    gardées en matrice CSR aux lignes normalisées L2 : la similarité cosinus avec
+    un message se réduit à un seul produit scalaire creux. Les ajouts sont
+    incrémentaux, sans réentraîner le vectoriseur (les mots inconnus de son
+    vocabulaire sont ignorés, comme pour tout message).
+    """
+
+    def __init__(self, vectorizer, questions=()):
+        self.vectorizer = vectorizer
+        self.questions = []
+        self._blocks = []
+        self._matrix = None
+        self.add(questions)
+
+    def __len__(self):
+        return len(self.questions)
+
+    def add(self, questions):
+        """Ajoute des questions à l'index."""
+        questions = list(questions)
+        if not questions:
+            return
+        self._blocks.append(normalize(self.vectorizer.transform(questions), norm="l2", copy=False).tocsr())
+        self.questions.extend(questions)
+        self._matrix = None
+
+    @property
+    def matrix(self):
+        """Matrice CSR (questions x vocabulaire), empilée une seule fois après des ajouts."""
+        if self._matrix is None:
+            self._matrix = sparse.vstack(self._blocks, format="csr") if len(self._blocks) > 1 else self._blocks[0]
+            self._blocks = [self._matrix]
+        return self._matrix
+
+    def scores(self, user_message):
+        """Similarité cosinus du message avec chaque question."""
+        query = normalize(self.vectorizer.transform([user_message]), norm="l2", copy=False)
+        return (self.matrix @ query.T).toarray().ravel()
+
+    def top_k(self, user_message, k=5):
+        """Les k questions les plus proches : [(question, score), ...] par score décroissant."""
+        if not self.questions:
+            return []
+        scores = self.scores(user_message)
+        k = min(k, len(scores))
+        candidates = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        # Tri par score décroissant, puis par ordre d'insertion à score égal
+        ordered = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [(self.questions[i], float(scores[i])) for i in ordered]
+
+    def most_similar(self, user_message):
+        """La question la plus proche (la première ajoutée à score égal)."""
+        if not self.questions:
+            return None
+        return self.questions[int(np.argmax(self.scores(user_message)))]
+
+
 class NLPModel:
-    def __init__(self):
+    def __init__(self, C=1.0):
+        """C : inverse de la régularisation de la régression logistique."""
         self.vectorizer = TfidfVectorizer()
-        self.model = LogisticRegression()
+        self.model = LogisticRegression(C=C, max_iter=1000)
 
     def train(self, questions, answers):
         """Entraîne le modèle NLP sur les questions et réponses."""
@@ -19,10 +83,57 @@ class NLPModel:
         question_vector = self.vectorizer.transform([question])
         return self.model.predict(question_vector)[0]
 
+    def predict_with_confidence(self, question):
+        """Prédit une réponse et renvoie la probabilité associée."""
+        probabilities = self.model.predict_proba(self.vectorizer.transform([question]))[0]
+        best = int(np.argmax(probabilities))
+        return self.model.classes_[best], float(probabilities[best])
+
+    def predict_batch_with_confidence(self, questions):
+        """Prédit les réponses d'une liste de questions (une seule transformation TF-IDF)."""
+        probabilities = self.model.predict_proba(self.vectorizer.transform(questions))
+        best = probabilities.argmax(axis=1)
+        confidences = probabilities[np.arange(len(best)), best]
+        return [(self.model.classes_[i], float(c)) for i, c in zip(best, confidences)]
+
+    def save(self, path):
+        """Sauvegarde le modèle (sans compression, pour permettre le chargement par mmap)."""
+        joblib.dump({"vectorizer": self.vectorizer, "model": self.model}, path)
+
+    @classmethod
+    def load(cls, path, mmap_mode="r"):
+        """Charge un modèle sauvegardé ; les tableaux numpy sont projetés en mémoire (lecture seule)."""
+        data = joblib.load(path, mmap_mode=mmap_mode)
+        instance = cls.__new__(cls)
+        instance.vectorizer = data["vectorizer"]
+        instance.model = data["model"]
+        return instance
+
+    def build_question_index(self, questions):
+        """Précalcule l'index de similarité des questions (vectoriseur déjà entraîné)."""
+        self.question_index = QuestionIndex(self.vectorizer, questions)
+        self._indexed_fingerprint = _fingerprint(self.question_index.questions)
+        return self.question_index
+
     def find_most_similar(self, questions, user_message):
         """Trouve la question la plus similaire à celle de l'utilisateur."""
-        question_vectors = self.vectorizer.transform(questions)
-        user_vector = self.vectorizer.transform([user_message])
-        similarities = cosine_similarity(user_vector, question_vectors)
-        most_similar_index = np.argmax(similarities)
-        return questions[most_similar_index]
\ No newline at end of file
+        index = getattr(self, "question_index", None)
+        if index is None:
+            return self.build_question_index(questions).most_similar(user_message)
+
+        # Questions déjà indexées inchangées (empreinte : longueur + hash, les hash des chaînes sont
+        # mis en cache) : seuls les ajouts en fin sont indexés ; toute autre modification, même en
+        # place dans la même liste, reconstruit l'index
+        questions = questions if isinstance(questions, list) else list(questions)
+        indexed = len(index.questions)
+        if len(questions) < indexed or _fingerprint(questions[:indexed]) != self._indexed_fingerprint:
+            return self.build_question_index(questions).most_similar(user_message)
+        if len(questions) > indexed:
+            index.add(questions[indexed:])
+            self._indexed_fingerprint = _fingerprint(index.questions)
+        return index.most_similar(user_message)
+
+
+def _fingerprint(questions):
+    """Empreinte d'une liste de questions : (longueur, hash du contenu)."""
+    return len(questions), hash(tuple(questions))
@@ -8,7 +8,7 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
 
-from app.main import create_progress_bar
+from app.services.report_format import create_progress_bar
 
 def test_barres_vertes():
     """Teste l'affichage des barres vertes avec différents pourcentages"""
@@ -9,7 +9,8 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
 
-from app.main import detect_intent, create_progress_bar
+from app.nlp import detect_intent
+from app.services.report_format import create_progress_bar
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 import pandas as pd
 
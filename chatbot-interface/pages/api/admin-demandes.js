@@ -4,17 +4,21 @@ export default async function handler(req, res) {
   const backendUrl = process.env.BACKEND_URL || 'http://localhost:8000';
 
   if (method === 'GET') {
-    // Récupérer toutes les demandes de congé (RH)
+    // Récupérer une page de demandes de congé (RH) : pagination et filtres transmis au backend
     const userMatricule = headers['x-user-matricule'] || (body && body.matricule) || (query && query.matricule);
     if (!userMatricule) {
       return res.status(401).json({ error: 'Matricule RH requis' });
     }
-    const response = await fetch(`${backendUrl}/admin/demandes-conge`, {
+    const params = new URLSearchParams();
+    ['limit', 'cursor', 'status', 'type_conge', 'department', 'date_from', 'date_to', 'include_total'].forEach((key) => {
+      if (query && query[key]) params.append(key, query[key]);
+    });
+    const response = await fetch(`${backendUrl}/admin/demandes-conge?${params.toString()}`, {
       method: 'GET',
       headers: { 'X-User-Matricule': userMatricule }
     });
     const data = await response.json();
-    return res.status(200).json(data);
+    return res.status(response.ok ? 200 : response.status).json(data);
   }
 
   if (method === 'POST') {
@@ -294,7 +294,13 @@ export default function Home() {
         setChatHistory((prev) => [
           ...prev,
           { sender: 'user', text: message },
-          { sender: 'bot', text: 'demandes_conges_structurees', demandes: data.demandes_conges_structurees }
+          {
+            sender: 'bot',
+            text: 'demandes_conges_structurees',
+            demandes: data.demandes_conges_structurees,
+            nextCursor: data.next_cursor || null,
+            total: data.total
+          }
         ]);
         setMessage('');
         setLoading(false);
@@ -531,13 +537,44 @@ export default function Home() {
                   });
                   const data = await res.json();
                   setChatHistory((prev) => prev.map((c, idx) =>
-                    idx === index ? { ...c, demandes: data.demandes_conges_structurees || data.demandes || [] } : c
+                    idx === index ? {
+                      ...c,
+                      demandes: data.demandes_conges_structurees || data.demandes || [],
+                      nextCursor: data.next_cursor || null,
+                      total: data.total
+                    } : c
                   ));
                 } catch (e) {
                   alert('Erreur lors de la mise à jour du statut.');
                 }
                 setLoading(false);
               };
+              // Page suivante de la liste RH (pagination par curseur du backend)
+              const handleLoadMoreDemandes = async () => {
+                setLoading(true);
+                try {
+                  const params = new URLSearchParams({ matricule, cursor: chat.nextCursor });
+                  const res = await fetch(`/api/admin-demandes?${params.toString()}`);
+                  const data = await res.json();
+                  const suite = (data.demandes || []).map((d) => ({
+                    id: d.id,
+                    first_name: d.user ? d.user.first_name : '',
+                    last_name: d.user ? d.user.last_name : '',
+                    type_conge: d.type_conge,
+                    date_debut: d.date_debut,
+                    date_fin: d.date_fin,
+                    raison: d.raison,
+                    statut: d.status,
+                    preuve: d.preuve
+                  }));
+                  setChatHistory((prev) => prev.map((c, idx) =>
+                    idx === index ? { ...c, demandes: [...c.demandes, ...suite], nextCursor: data.next_cursor || null } : c
+                  ));
+                } catch (e) {
+                  alert('Erreur lors du chargement des demandes suivantes.');
+                }
+                setLoading(false);
+              };
               return (
                 <div key={index} style={{ ...styles.messageContainer, justifyContent: 'flex-start' }}>
                   <div style={{ ...styles.messageBubble, backgroundColor: '#f3f4f6', color: '#000', borderRadius: '12px 12px 12px 0', maxWidth: '100%' }}>
@@ -621,6 +658,22 @@ export default function Home() {
                         </tbody>
                       </table>
                     </div>
+                    {/* Pagination : nombre affiché / total et chargement de la page suivante */}
+                    <div style={{ display: 'flex', alignItems: 'center', gap: 12, fontSize: '0.85rem', color: '#4b5563' }}>
+                      <span>
+                        {chat.demandes.length}{typeof chat.total === 'number' ? ` / ${chat.total}` : ''} demande(s) affichée(s)
+                      </span>
+                      {chat.nextCursor && (
+                        <button
+                          disabled={loading}
+                          style={{
+                            background: '#6366f1', color: '#fff', border: 'none', borderRadius: 6, padding: '4px 12px',
+                            cursor: loading ? 'not-allowed' : 'pointer', fontWeight: 500, outline: 'none',
+                          }}
+                          onClick={handleLoadMoreDemandes}
+                        >Charger plus</button>
+                      )}
+                    </div>
                     {/* Modale d’aperçu de preuve */}
                     {selectedProof && (
                       <div style={{